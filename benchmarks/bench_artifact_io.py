@@ -0,0 +1,65 @@
+"""Stage I/O of the cleaned data as CSV and as a typed Parquet artifact.
+
+Cleans data/raw/swiggy.csv replicated `--copies` times once, then times writing the
+result and reading it back (all columns, and only the two columns a stage projects)
+as CSV and as Parquet with each compression, and reports the file sizes.
+
+    python benchmarks/bench_artifact_io.py --copies 5
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir / "src"))
+
+from bench_cleaning_memory import replicate_csv
+from bench_cleaning_scaling import best_of
+from data_cleaning.artifacts import read_artifact, save_artifact
+from data_cleaning.pipeline import perform_data_cleaning
+
+PROJECTION = ["distance", "time_taken"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=str(root_dir / "data" / "raw" / "swiggy.csv"))
+    parser.add_argument("--copies", type=int, default=5)
+    parser.add_argument("--compression", nargs="+", default=["snappy", "zstd"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        raw_path = tmp / "raw.csv"
+        replicate_csv(Path(args.data), raw_path, args.copies)
+        cleaned = perform_data_cleaning(pd.read_csv(raw_path), training=True)
+        print(f"{len(cleaned)} cleaned rows")
+        print(f"{'format':>16}  {'write':>8}  {'read':>8}  {'read 2 cols':>11}  {'size':>9}")
+
+        path = tmp / "cleaned.csv"
+        write, _ = best_of(lambda: cleaned.to_csv(path, index=False), args.repeat)
+        read, from_csv = best_of(lambda: pd.read_csv(path), args.repeat)
+        project, _ = best_of(lambda: pd.read_csv(path, usecols=PROJECTION), args.repeat)
+        print(f"{'csv':>16}  {write:7.3f}s  {read:7.3f}s  {project:10.3f}s  "
+              f"{path.stat().st_size / 2**20:6.2f} MB")
+
+        for compression in args.compression:
+            path = tmp / f"cleaned.{compression}.parquet"
+            write, _ = best_of(lambda: save_artifact(cleaned, path, compression), args.repeat)
+            read, loaded = best_of(lambda: read_artifact(path), args.repeat)
+            project, _ = best_of(lambda: read_artifact(path, PROJECTION), args.repeat)
+            # the artifact loads like the CSV, with label columns as categoricals
+            pd.testing.assert_frame_equal(
+                loaded.astype({col: object for col in loaded.select_dtypes("category")}),
+                from_csv)
+            print(f"{f'parquet {compression}':>16}  {write:7.3f}s  {read:7.3f}s  "
+                  f"{project:10.3f}s  {path.stat().st_size / 2**20:6.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
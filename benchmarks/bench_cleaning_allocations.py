@@ -0,0 +1,73 @@
+"""Per-step allocations of `perform_data_cleaning`, measured with tracemalloc.
+
+Replicates data/raw/swiggy.csv `--copies` times, loads it like the stage and runs
+the steps of the cleaning chain one after the other, reporting for each the peak
+allocation above what was allocated when it started and the memory it leaves
+allocated (negative when it frees an earlier frame). numpy and pandas report their buffers to tracemalloc;
+Arrow-backed strings do not. Runs with copy-on-write off and on.
+
+    python benchmarks/bench_cleaning_allocations.py --copies 5
+"""
+
+import argparse
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir / "src"))
+
+from bench_cleaning_memory import replicate_csv
+from data_cleaning.pipeline import (add_distance, change_column_name, data_cleaning,
+                                    drop_columns, load_data)
+
+# the steps of perform_data_cleaning
+STEPS = [
+    ("change_column_name", change_column_name),
+    ("data_cleaning", lambda df: data_cleaning(df, training=True)),
+    ("add_distance", add_distance),
+    ("drop_columns", lambda df: drop_columns(df, training=True)),
+]
+
+
+def run_steps(raw: pd.DataFrame, input_mb: float):
+    data = raw
+    tracemalloc.start()
+    for name, step in STEPS:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        data = step(data)
+        current, peak = tracemalloc.get_traced_memory()
+        print(f"{name:>30}: peak {(peak - before) / 2**20:7.1f} MB  "
+              f"({(peak - before) / 2**20 / input_mb:4.1f}x input)  "
+              f"retained {(current - before) / 2**20:7.1f} MB")
+    tracemalloc.stop()
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=str(root_dir / "data" / "raw" / "swiggy.csv"))
+    parser.add_argument("--copies", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_path = Path(tmp) / "raw.csv"
+        replicate_csv(Path(args.data), raw_path, args.copies)
+        raw = load_data(raw_path)
+    input_mb = raw.memory_usage(deep=True).sum() / 2**20
+    print(f"{len(raw)} raw rows, {input_mb:.1f} MB")
+
+    results = {}
+    for copy_on_write in (False, True):
+        print(f"copy-on-write {'on' if copy_on_write else 'off'}")
+        with pd.option_context("mode.copy_on_write", copy_on_write):
+            results[copy_on_write] = run_steps(raw, input_mb)
+    pd.testing.assert_frame_equal(results[True], results[False])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Peak memory of the data_cleaning stage, in memory vs in row chunks.
+
+Replicates data/raw/swiggy.csv `--copies` times into a temporary raw file, then cleans
+it in a fresh interpreter per mode and reports the peak RSS (ru_maxrss) and wall time,
+and checks that every chunked output is byte-identical to the in-memory one.
+
+    python benchmarks/bench_cleaning_memory.py --copies 20 --chunk-sizes 5000 20000 100000
+"""
+
+import argparse
+import filecmp
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+
+CLEAN = """
+import json, resource, sys, time
+sys.path.insert(0, {src!r})
+from data_cleaning.pipeline import clean_csv_in_chunks, load_data, perform_data_cleaning
+started = time.perf_counter()
+if {chunk_size!r}:
+    clean_csv_in_chunks({raw!r}, {out!r}, {chunk_size!r})
+else:
+    perform_data_cleaning(load_data({raw!r}), training=True).to_csv({out!r}, index=False)
+print(json.dumps({{"seconds": time.perf_counter() - started,
+                  "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}}))
+"""
+
+
+def replicate_csv(source: Path, target: Path, copies: int) -> int:
+    """Write the rows of `source` `copies` times under a single header, returns the size in bytes."""
+    with open(source, newline='') as f:
+        header = f.readline()
+        body = f.read()
+    if not body.endswith("\n"):
+        body += "\n"
+    with open(target, "w", newline='') as f:
+        f.write(header)
+        for _ in range(copies):
+            f.write(body)
+    return target.stat().st_size
+
+
+def run_mode(raw: Path, out: Path, chunk_size) -> dict:
+    code = CLEAN.format(src=str(root_dir / "src"), raw=str(raw), out=str(out),
+                        chunk_size=chunk_size)
+    result = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True,
+                            text=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=str(root_dir / "data" / "raw" / "swiggy.csv"))
+    parser.add_argument("--copies", type=int, default=20)
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[5000, 20000, 100000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        raw = tmp / "raw.csv"
+        size = replicate_csv(Path(args.data), raw, args.copies)
+        print(f"raw file: {size / 2**20:.0f} MB ({args.copies} copies of {args.data})")
+
+        reference = tmp / "in_memory.csv"
+        stats = run_mode(raw, reference, None)
+        print(f"{'in memory':>16}: peak RSS {stats['peak_rss_mb']:7.0f} MB  "
+              f"{stats['seconds']:6.1f} s")
+        for chunk_size in args.chunk_sizes:
+            out = tmp / f"chunked_{chunk_size}.csv"
+            stats = run_mode(raw, out, chunk_size)
+            same = filecmp.cmp(reference, out, shallow=False)
+            print(f"{f'chunks of {chunk_size}':>16}: peak RSS {stats['peak_rss_mb']:7.0f} MB  "
+                  f"{stats['seconds']:6.1f} s  identical output: {same}")
+            out.unlink()
+
+
+if __name__ == "__main__":
+    main()
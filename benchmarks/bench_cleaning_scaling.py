@@ -0,0 +1,62 @@
+"""Scaling of the parallel data_cleaning mode over 1 to N cores.
+
+Replicates data/raw/swiggy.csv `--copies` times, reads it once and cleans it with
+`perform_data_cleaning` and then with `perform_data_cleaning_parallel` for every worker
+count, checking each result against the single-process one.
+
+    python benchmarks/bench_cleaning_scaling.py --copies 10 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir / "src"))
+
+from bench_cleaning_memory import replicate_csv
+from data_cleaning.pipeline import perform_data_cleaning, perform_data_cleaning_parallel
+
+
+def best_of(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=str(root_dir / "data" / "raw" / "swiggy.csv"))
+    parser.add_argument("--copies", type=int, default=10)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1))))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_path = Path(tmp) / "raw.csv"
+        replicate_csv(Path(args.data), raw_path, args.copies)
+        raw = pd.read_csv(raw_path)
+    print(f"{len(raw)} raw rows, {cores} cores")
+
+    serial, expected = best_of(lambda: perform_data_cleaning(raw, training=True), args.repeat)
+    print(f"{'single process':>16}: {serial:6.2f} s")
+    for workers in args.workers:
+        seconds, cleaned = best_of(
+            lambda: perform_data_cleaning_parallel(raw, workers, training=True), args.repeat)
+        pd.testing.assert_frame_equal(cleaned, expected)
+        print(f"{f'{workers} worker(s)':>16}: {seconds:6.2f} s  speedup {serial / seconds:4.2f}x  "
+              f"efficiency {serial / seconds / workers:4.0%}")
+
+
+if __name__ == "__main__":
+    main()
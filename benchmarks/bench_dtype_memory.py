@@ -0,0 +1,61 @@
+"""Memory of the raw and cleaned data with default dtypes and with the dtype plan.
+
+Replicates data/raw/swiggy.csv `--copies` times, loads it with default dtypes and
+with `RAW_DTYPES`, cleans both (checking they give the same values) and reports the
+deep memory usage and load time of each, then of the cleaned data before and after
+`to_cleaned_dtypes`.
+
+    python benchmarks/bench_dtype_memory.py --copies 5
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir / "src"))
+
+from bench_cleaning_memory import replicate_csv
+from bench_cleaning_scaling import best_of
+from data_cleaning.dtypes import RAW_DTYPES, memory_mb, to_cleaned_dtypes
+from data_cleaning.pipeline import perform_data_cleaning
+
+
+def report(name: str, before: pd.DataFrame, after: pd.DataFrame, extra: str = ""):
+    before_mb, after_mb = memory_mb(before), memory_mb(after)
+    print(f"{name:>8}: {before_mb:7.1f} MB -> {after_mb:6.1f} MB  "
+          f"{before_mb / after_mb:4.1f}x smaller{extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=str(root_dir / "data" / "raw" / "swiggy.csv"))
+    parser.add_argument("--copies", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_path = Path(tmp) / "raw.csv"
+        replicate_csv(Path(args.data), raw_path, args.copies)
+        default_load, raw = best_of(lambda: pd.read_csv(raw_path), args.repeat)
+        planned_load, planned_raw = best_of(
+            lambda: pd.read_csv(raw_path, dtype=RAW_DTYPES), args.repeat)
+    print(f"{len(raw)} raw rows")
+    report("raw", raw, planned_raw,
+           f"  load {default_load:.2f} s -> {planned_load:.2f} s")
+
+    default_clean, cleaned = best_of(
+        lambda: perform_data_cleaning(raw, training=True), args.repeat)
+    planned_clean, planned_cleaned = best_of(
+        lambda: perform_data_cleaning(planned_raw, training=True), args.repeat)
+    compact = to_cleaned_dtypes(cleaned)
+    pd.testing.assert_frame_equal(to_cleaned_dtypes(planned_cleaned), compact)
+    print(f"{'':>8}  cleaning {default_clean:.2f} s -> {planned_clean:.2f} s")
+    report("cleaned", cleaned, compact)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Load time and memory of the training matrices: pickled DataFrames vs memory-mapped .npy.
+
+Writes a transformed-feature-shaped DataFrame (`--rows` x `--features`, float64 as
+the ColumnTransformer returns it) and its target the former way, pickled, and with
+`save_feature_matrix`. Each format is then loaded in a fresh process, which reports
+the load time and its resident memory split into private (RssAnon) and page cache
+(RssFile) pages, right after loading and after reading every value as a training
+does. File pages are shared by every process that maps the same file.
+
+    python benchmarks/bench_feature_matrix.py --rows 1000000
+"""
+
+import argparse
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir / "src"))
+
+from feature_engineering.feature_matrix import load_feature_matrix, save_feature_matrix
+
+
+def rss_mb() -> dict:
+    fields = {}
+    with open("/proc/self/status") as status:
+        for line in status:
+            name, _, value = line.partition(":")
+            if name in ("RssAnon", "RssFile"):
+                fields[name] = int(value.split()[0]) / 1024
+    return fields
+
+
+def load(fmt: str, directory: Path):
+    before = rss_mb()
+    started = time.perf_counter()
+    if fmt == "pickle":
+        with open(directory / "x_train_trans.csv", "rb") as f:
+            x = pickle.load(f)
+        with open(directory / "y_train.csv", "rb") as f:
+            y = pickle.load(f)
+    else:
+        x, y = load_feature_matrix(directory)
+    elapsed = time.perf_counter() - started
+    loaded = rss_mb()
+    total = float(np.asarray(x).sum(dtype=np.float64)) + float(np.asarray(y).sum())
+    touched = rss_mb()
+
+    def delta(after):
+        return "  ".join(f"{name} {after[name] - before[name]:7.1f} MB" for name in after)
+
+    print(f"{fmt:>7}: load {elapsed * 1e3:8.1f} ms  loaded: {delta(loaded)}  "
+          f"read: {delta(touched)}  (sum {total:.6g})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--features", type=int, default=49)
+    parser.add_argument("--load", choices=["pickle", "mmap"], help=argparse.SUPPRESS)
+    parser.add_argument("--dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.load:
+        load(args.load, Path(args.dir))
+        return
+
+    rng = np.random.default_rng(0)
+    x = pd.DataFrame(rng.random((args.rows, args.features)),
+                     columns=[f"feature_{j}" for j in range(args.features)])
+    y = pd.DataFrame({"time_taken": rng.integers(10, 55, args.rows, dtype=np.int8)})
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        with open(directory / "x_train_trans.csv", "wb") as f:
+            pickle.dump(x, f)
+        with open(directory / "y_train.csv", "wb") as f:
+            pickle.dump(y, f)
+        save_feature_matrix(directory, x, y)
+        for name in ("x_train_trans.csv", "x_train.npy"):
+            print(f"{name:>17}: {(directory / name).stat().st_size / 2**20:7.1f} MB")
+        for fmt in ("pickle", "mmap"):
+            subprocess.run([sys.executable, __file__, "--load", fmt, "--dir", tmp], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Accuracy and throughput of the geospatial kernel against the former pandas steps.
+
+Takes the coordinates of data/raw/swiggy.csv, replicated `--copies` times, and times
+the former column steps (abs, threshold, haversine and `distance_type_column`, each
+allocating its own arrays) against `GeoKernel` in float64 and float32, reporting the
+float32 error and the rows whose distance type changes. Then times the serving path:
+one scalar `haversine_distance` per record against one `record_distances` call per
+batch.
+
+    python benchmarks/bench_geospatial.py --copies 10
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir / "src"))
+
+from bench_cleaning_scaling import best_of
+from data_cleaning.binning import distance_type_column
+from data_cleaning.dtypes import RAW_DTYPES
+from data_cleaning.geospatial import RECORD_COORDINATES, GeoKernel, record_distances
+from data_cleaning.record_cleaning import _coordinate, haversine_distance
+
+
+def former_steps(columns):
+    """The pandas pipeline's clean_lat_long, haversine and binning steps."""
+    cleaned = [np.abs(column) for column in columns]
+    lat1, lon1, lat2, lon2 = (np.radians(np.where(column < 1, np.nan, column))
+                              for column in cleaned)
+    a = np.sin((lat2 - lat1) / 2.0)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2.0)**2
+    distance = 6371 * (2 * np.arcsin(np.sqrt(a)))
+    return distance, distance_type_column(pd.Series(distance)).cat.codes.to_numpy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=str(root_dir / "data" / "raw" / "swiggy.csv"))
+    parser.add_argument("--copies", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 64, 512])
+    args = parser.parse_args()
+
+    raw = pd.read_csv(args.data, usecols=RECORD_COORDINATES, dtype=RAW_DTYPES)
+    block = np.tile(raw[RECORD_COORDINATES].to_numpy(dtype=float), (args.copies, 1))
+    columns = [np.ascontiguousarray(column) for column in block.T]
+    print(f"{len(block)} rows")
+
+    former_time, (expected, expected_codes) = best_of(lambda: former_steps(columns), args.repeat)
+    print(f"{'former steps':>16}: {former_time * 1e3:7.1f} ms")
+    for dtype in (np.float64, np.float32):
+        kernel = GeoKernel(dtype)
+        out = np.empty(len(block), dtype=dtype)
+        codes = np.empty(len(block), dtype=np.int8)
+        elapsed, (distance, codes) = best_of(lambda: kernel(columns, out, codes), args.repeat)
+        error = np.nanmax(np.abs(distance - expected))
+        flips = int((codes != expected_codes).sum())
+        print(f"{np.dtype(dtype).name + ' kernel':>16}: {elapsed * 1e3:7.1f} ms  "
+              f"{former_time / elapsed:4.1f}x  max error {error * 1e3:.3f} m  "
+              f"{flips} distance type changes")
+        if dtype is np.float64:
+            np.testing.assert_array_equal(distance, expected)
+
+    records = raw.to_dict("records")
+    for size in args.batch_sizes:
+        batches = [records[start:start + size] for start in range(0, len(records), size)]
+        scalar_time, scalar = best_of(lambda: [
+            haversine_distance(*(_coordinate(record[key]) for key in RECORD_COORDINATES))
+            for batch in batches for record in batch], args.repeat)
+        kernel_time, batched = best_of(lambda: np.concatenate(
+            [record_distances(batch) for batch in batches]), args.repeat)
+        np.testing.assert_allclose(batched, scalar, rtol=1e-12)
+        print(f"{'batch ' + str(size):>16}: scalar {scalar_time / len(records) * 1e6:5.2f} us"
+              f"  kernel {kernel_time / len(records) * 1e6:5.2f} us per record")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Import time of the cleaning code, old modules vs the data_cleaning package.
+
+The old modules are taken from the last revision that still had
+src/data_cleaning/data_cleaning_utils_py.py, which read and cleaned
+data/raw/swiggy_sample.csv at import. Every statement runs in a fresh interpreter, with
+the repository root as working directory, and the median wall time is reported.
+
+    python benchmarks/bench_import_time.py --runs 7
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+OLD_UTILS = "src/data_cleaning/data_cleaning_utils_py.py"
+
+# (label, statement, module that has to exist for the statement to run)
+STATEMENTS = [
+    ("interpreter only", "pass", None),
+    ("record-level cleaner", "import data_cleaning.record_cleaning", "record_cleaning"),
+    ("pandas pipeline", "from data_cleaning.pipeline import perform_data_cleaning", "pipeline"),
+    ("Colab utils module", "import data_cleaning.data_cleaning_utils_py",
+     "data_cleaning_utils_py"),
+]
+
+
+def git(*args) -> str:
+    return subprocess.run(["git", *args], cwd=root_dir, check=True, capture_output=True,
+                          text=True).stdout
+
+
+def export_old_package(target: Path) -> str:
+    """Write src/data_cleaning of the last revision with the utils module to `target`."""
+    removed_in = git("log", "-1", "--format=%H", "--diff-filter=D", "--", OLD_UTILS).strip()
+    revision = f"{removed_in}^" if removed_in else "HEAD"
+    package_dir = target / "data_cleaning"
+    package_dir.mkdir(parents=True)
+    for path in git("ls-tree", "--name-only", revision, "src/data_cleaning/").split():
+        if path.endswith(".py"):
+            (package_dir / Path(path).name).write_text(git("show", f"{revision}:{path}"))
+    return revision
+
+
+def median_import_seconds(statement: str, python_path: Path, runs: int) -> float:
+    env = {**os.environ, "PYTHONPATH": str(python_path)}
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], cwd=root_dir, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_src = Path(tmp)
+        revision = export_old_package(old_src)
+        print(f"old modules from {revision[:12]}")
+        for label, statement, module in STATEMENTS:
+            timings = []
+            for src in (old_src, root_dir / "src"):
+                if module is None or (src / "data_cleaning" / f"{module}.py").exists():
+                    seconds = median_import_seconds(statement, src, args.runs)
+                    timings.append(f"{seconds * 1000:7.0f} ms")
+                else:
+                    timings.append(f"{'-':>10}")
+            print(f"{label:>22}: old {timings[0]}   new {timings[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Memory and throughput of serve.py with several uvicorn workers.
+
+For every worker count, starts `python serve.py` with SERVING_WORKERS=N, waits for /ping
+to report ready, records RSS / PSS / USS of every worker process with psutil, then drives
+/invocations with concurrent single-record clients for a fixed duration.
+
+    python benchmarks/bench_serving_workers.py --workers 1 2 4 8 --duration 20
+
+PSS splits shared pages between the processes mapping them, so with the shared compiled
+model it stays flat per worker while RSS counts the mapped trees in every worker.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import psutil
+import requests
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir / "src"))
+
+from serving.warmup import load_warmup_records
+
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"serve.py exited with code {process.returncode}")
+        try:
+            if requests.get(f"{url}/ping", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError("serve.py did not become ready")
+
+
+def worker_memory(process: subprocess.Popen):
+    """Memory of the processes serving requests (the workers, or the server itself)."""
+    parent = psutil.Process(process.pid)
+    workers = [child for child in parent.children(recursive=True)
+               if "spawn_main" in " ".join(child.cmdline())]
+    memory = []
+    for proc in workers or [parent]:
+        info = proc.memory_full_info()
+        memory.append({"pid": proc.pid, "rss_mb": info.rss / 2**20,
+                       "pss_mb": getattr(info, "pss", float("nan")) / 2**20,
+                       "uss_mb": info.uss / 2**20})
+    return memory
+
+
+def drive_load(url: str, records, clients: int, duration: float):
+    deadline = time.monotonic() + duration
+
+    def client(offset):
+        session = requests.Session()
+        done, errors = 0, 0
+        i = offset
+        while time.monotonic() < deadline:
+            try:
+                response = session.post(f"{url}/invocations", json=records[i % len(records)])
+                ok = response.status_code == 200
+            except requests.RequestException:
+                ok = False
+                session = requests.Session()
+            done, errors = (done + 1, errors) if ok else (done, errors + 1)
+            i += clients
+        return done, errors
+
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(client, range(clients)))
+    return sum(r[0] for r in results) / duration, sum(r[1] for r in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8085)
+    parser.add_argument("--startup-timeout", type=float, default=600.0)
+    parser.add_argument("--sample", type=Path,
+                        default=root_dir / "data" / "raw" / "swiggy_sample.csv")
+    args = parser.parse_args()
+
+    records = load_warmup_records(args.sample, 500)
+    url = f"http://127.0.0.1:{args.port}"
+    rows = []
+    for n_workers in args.workers:
+        env = {**os.environ, "SERVING_WORKERS": str(n_workers), "SERVING_PORT": str(args.port)}
+        process = subprocess.Popen([sys.executable, "serve.py"], cwd=root_dir, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_until_ready(url, process, args.startup_timeout)
+            # /ping is answered by one worker, give the others time to finish their warmup
+            time.sleep(2 * n_workers)
+            memory = worker_memory(process)
+            throughput, errors = drive_load(url, records, args.clients, args.duration)
+        finally:
+            process.terminate()
+            process.wait(30)
+
+        rows.append((n_workers, len(memory), sum(m["rss_mb"] for m in memory) / len(memory),
+                     sum(m["pss_mb"] for m in memory) / len(memory),
+                     sum(m["pss_mb"] for m in memory), throughput, errors))
+
+    print(f"{'workers':>7} {'procs':>5} {'RSS/worker MB':>14} {'PSS/worker MB':>14} "
+          f"{'PSS total MB':>13} {'req/s':>9} {'errors':>7}")
+    for row in rows:
+        print(f"{row[0]:>7} {row[1]:>5} {row[2]:>14.1f} {row[3]:>14.1f} {row[4]:>13.1f} "
+              f"{row[5]:>9.1f} {row[6]:>7}")
+
+
+if __name__ == "__main__":
+    main()
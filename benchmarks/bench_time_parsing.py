@@ -0,0 +1,89 @@
+"""Order date and time parsing of the cleaning stage, pandas inference vs memoized fast paths.
+
+before: `pd.to_datetime(format="mixed")` for both time columns, `dayfirst=True` for the
+        date, then Timedelta / `.dt` accessors and strftime, as data_cleaning() did.
+after:  data_cleaning.time_parsing, every distinct string parsed once and the derived
+        columns computed on integer seconds.
+
+Both paths are checked to produce the same columns before timing.
+
+    python benchmarks/bench_time_parsing.py --data data/raw/swiggy.csv
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir / "src"))
+
+from data_cleaning.time_parsing import (format_time_column, parse_date_column,
+                                        parse_day_first_date, parse_time_column,
+                                        parse_time_of_day, pickup_minutes)
+
+MISSING_TOKENS = ['NaN ', ' nan', '', 'NaN', 'None', ' null']
+
+
+def before(data: pd.DataFrame) -> pd.DataFrame:
+    order_date = pd.to_datetime(data['Order_Date'], dayfirst=True)
+    order_time = pd.to_datetime(data['Time_Orderd'], format="mixed")
+    picked_time = pd.to_datetime(data['Time_Order_picked'], format="mixed")
+    return pd.DataFrame({
+        'order_date': order_date,
+        'pickup_time_in_minutes': (picked_time - order_time).dt.seconds / 60,
+        'order_time_hr': order_time.dt.hour,
+        'order_time': order_time.dt.strftime('%H:%M:%S'),
+        'order_picked_time': picked_time.dt.strftime('%H:%M:%S'),
+    })
+
+
+def after(data: pd.DataFrame) -> pd.DataFrame:
+    order_seconds = parse_time_column(data['Time_Orderd'])
+    picked_seconds = parse_time_column(data['Time_Order_picked'])
+    return pd.DataFrame({
+        'order_date': parse_date_column(data['Order_Date']),
+        'pickup_time_in_minutes': pickup_minutes(order_seconds, picked_seconds),
+        'order_time_hr': order_seconds // 3600,
+        'order_time': format_time_column(order_seconds),
+        'order_picked_time': format_time_column(picked_seconds),
+    }, index=data.index)
+
+
+def best_of(fn, data, repeat: int, clear_cache: bool = False) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        if clear_cache:
+            parse_day_first_date.cache_clear()
+            parse_time_of_day.cache_clear()
+        started = time.perf_counter()
+        fn(data)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=str(root_dir / "data" / "raw" / "swiggy.csv"))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = pd.read_csv(args.data, usecols=['Order_Date', 'Time_Orderd', 'Time_Order_picked'])
+    data = data.replace(MISSING_TOKENS, np.nan)
+    pd.testing.assert_frame_equal(after(data), before(data), check_dtype=False)
+
+    print(f"{len(data)} rows, {data['Time_Orderd'].nunique()} distinct order times, "
+          f"{data['Order_Date'].nunique()} distinct dates")
+    slow = best_of(before, data, args.repeat)
+    cold = best_of(after, data, args.repeat, clear_cache=True)
+    warm = best_of(after, data, args.repeat)
+    print(f"pandas inference: {slow * 1000:8.1f} ms")
+    print(f"fast path, cold:  {cold * 1000:8.1f} ms  ({slow / cold:.1f}x)")
+    print(f"fast path, warm:  {warm * 1000:8.1f} ms  ({slow / warm:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Request decoding, validation and cleaning cost of the online path, before and after.
+
+before: json.loads, the former all-str pydantic `Data` model, `clean_record` on the raw strings
+        and json.dumps of the response.
+after:  serving.codec (orjson when installed), `validate_batch` into typed, pre-coerced
+        records and `clean_record` on those.
+
+Model scoring is left out, both paths build the same feature rows.
+
+    python benchmarks/bench_validation.py --data data/raw/swiggy_sample.csv --batch-size 256
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir / "src"))
+
+from pydantic import create_model
+
+from data_cleaning.record_cleaning import clean_record
+from serving import codec
+from serving.schema import RAW_COLUMNS, validate_batch
+from serving.warmup import load_warmup_records
+
+# the former inference input model: text fields but the coordinates and the vehicle condition
+LegacyData = create_model("LegacyData", **{
+    name: (float if name.endswith(("latitude", "longitude")) else
+           int if name == "Vehicle_condition" else str, ...)
+    for name in RAW_COLUMNS})
+
+
+def before(body: bytes) -> bytes:
+    payload = json.loads(body)
+    records = [payload] if isinstance(payload, dict) else payload
+    rows = [clean_record(LegacyData(**record).dict()) for record in records]
+    return json.dumps({"predictions": [{"rows": row is not None} for row in rows]}).encode()
+
+
+def after(body: bytes) -> bytes:
+    payload = codec.loads(body)
+    records = [payload] if isinstance(payload, dict) else payload
+    rows = [clean_record(order) for order in validate_batch(records)]
+    return codec.dumps({"predictions": [{"rows": row is not None} for row in rows]})
+
+
+def per_request_us(fn, bodies, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for body in bodies:
+            fn(body)
+        best = min(best, (time.perf_counter() - started) / len(bodies))
+    return best * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=str(root_dir / "data" / "raw" / "swiggy_sample.csv"))
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    records = load_warmup_records(Path(args.data), args.records)
+    singles = [json.dumps(record).encode() for record in records]
+    batches = [json.dumps(records[i:i + args.batch_size]).encode()
+               for i in range(0, len(records), args.batch_size)]
+    print(f"json codec: {'orjson' if codec.orjson is not None else 'json'}")
+    for name, bodies in (("single record", singles), (f"batch of {args.batch_size}", batches)):
+        slow = per_request_us(before, bodies, args.repeat)
+        fast = per_request_us(after, bodies, args.repeat)
+        print(f"{name:>14}: before {slow:9.1f} us/request  after {fast:9.1f} us/request  "
+              f"({slow / fast:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,7 +24,7 @@ from monitoring.prod_logger import log_prediction_input
 # Set up module paths
 sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
 
-from data_cleaning.data_cleaning_utils_py import perform_data_cleaning
+from data_cleaning.record_cleaning import CLEANED_COLUMNS, clean_record, is_complete
 
 
 # Set pandas output config
@@ -80,13 +80,15 @@ class Data(BaseModel):
 # Required /invocations endpoint for SageMaker
 @app.post("/invocations")
 def invoke(data: Data):
-    pred_data = pd.DataFrame([data.dict()])
-    cleaned_data = perform_data_cleaning(pred_data).dropna()
-    transformed_data=preprocessor.transform(cleaned_data)
+    record = data.dict()
+    pred_data = pd.DataFrame([record])
+    cleaned_row = clean_record(record)
 
-    if cleaned_data.empty:
+    if cleaned_row is None or not is_complete(cleaned_row):
         return {"error": "No valid data after cleaning"}
-    
+
+    cleaned_data = pd.DataFrame([cleaned_row], columns=CLEANED_COLUMNS)
+    transformed_data=preprocessor.transform(cleaned_data)
 
     prediction = model.predict(transformed_data)[0]
 
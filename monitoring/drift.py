@@ -5,10 +5,15 @@ from evidently import Dataset, DataDefinition, Report
 from evidently.presets import DataDriftPreset
 from pathlib import Path
 import json
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'src'))
+
+from data_cleaning.dtypes import RAW_DTYPES
 
 def calculate_drift_metrics(reference_path: Path, current_path: Path):
-    reference_df = pd.read_csv(reference_path)
-    current_df = pd.read_csv(current_path)
+    reference_df = pd.read_csv(reference_path, dtype=RAW_DTYPES)
+    current_df = pd.read_csv(current_path, dtype=RAW_DTYPES)
 
     for df in [reference_df, current_df]:
         if 'timestamp' in df.columns:
@@ -1,24 +1,177 @@
 # monitoring/prod_logger.py
 
+import atexit
+import csv
+import io
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
 from pathlib import Path
+
 import pandas as pd
-from datetime import datetime
+from prometheus_client import Counter
+
+try:
+    import fcntl
+except ImportError:  # Windows: single writer only
+    fcntl = None
 
 PROD_LOG_PATH = Path(__file__).resolve().parent / "production_data.csv"
 PROD_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
 
-def log_prediction_input(data: pd.DataFrame, prediction: float):
-    row = data.copy()
-    row["prediction"] = prediction
-    row["timestamp"] = datetime.utcnow()
-
-    # Append to existing file or create new one
-    if PROD_LOG_PATH.exists():
-        existing_data = pd.read_csv(PROD_LOG_PATH)
-        updated_data = pd.concat([existing_data, row], ignore_index=True)
-    else:
-        updated_data = row
-
-    # Trim to last 20 records
-    trimmed_data = updated_data.tail(20)
-    trimmed_data.to_csv(PROD_LOG_PATH, index=False)
+logged_records_counter = Counter("prod_log_records_written", "Prediction records written to the production log")
+dropped_records_counter = Counter("prod_log_records_dropped", "Prediction records dropped because the log queue was full")
+
+_FLUSH = object()
+_STOP = object()
+
+
+class ProductionLogger:
+    """Logs prediction inputs to the production CSV from a background writer thread.
+
+    `log` only puts the record on a bounded queue, so the request thread never touches
+    the disk. The writer appends queued records in batches once `batch_size` records are
+    waiting or `flush_interval` seconds have passed, and compacts the file to the most
+    recent `max_rows` records once it holds twice as many. When the queue is full,
+    records are dropped and counted instead of blocking the caller.
+    """
+
+    def __init__(self, path: Path, max_queue_size: int = 10000, batch_size: int = 256,
+                 flush_interval: float = 1.0, max_rows: int = 20):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_rows = max_rows
+        self.dropped = 0
+        self.written = 0
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def log(self, record: dict, prediction: float):
+        """Queue one prediction input; costs a few microseconds on the caller's thread."""
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait((record, prediction, time.time()))
+        except queue.Full:
+            self.dropped += 1
+            dropped_records_counter.inc()
+
+    def log_many(self, records, predictions):
+        for record, prediction in zip(records, predictions):
+            self.log(record, prediction)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far has been written."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put((_FLUSH, done, None))
+        return done.wait(timeout)
+
+    def shutdown(self, timeout: float = 5.0):
+        """Write out the queued records and stop the writer thread."""
+        if self._thread is not None:
+            self._queue.put((_STOP, None, None))
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="prod-logger", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is not None and item[0] is not _FLUSH and item[0] is not _STOP:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(batch) < self.batch_size:
+                    continue
+
+            # size or time trigger, an explicit flush or shutdown
+            if batch:
+                self._write(batch)
+                batch, deadline = [], None
+            if item is not None and item[0] is _FLUSH:
+                item[1].set()
+            elif item is not None and item[0] is _STOP:
+                return
+
+    def _write(self, batch):
+        try:
+            with open(self.path, "a+", newline="") as f:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                f.seek(0)
+                header = f.readline()
+                fieldnames = next(csv.reader([header])) if header else \
+                    list(batch[0][0]) + ["prediction", "timestamp"]
+
+                buffer = io.StringIO()
+                writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+                if not header:
+                    writer.writeheader()
+                for record, prediction, logged_at in batch:
+                    writer.writerow({**record, "prediction": prediction,
+                                     "timestamp": _format_timestamp(logged_at)})
+                f.seek(0, os.SEEK_END)
+                f.write(buffer.getvalue())
+                f.flush()
+                self._compact(f)
+            self.written += len(batch)
+            logged_records_counter.inc(len(batch))
+        except Exception as e:
+            print(f"⚠️ Failed to write production log: {e}")
+
+    def _compact(self, f):
+        """Keep the most recent `max_rows` records once the file holds twice as many."""
+        if not self.max_rows:
+            return
+        f.seek(0)
+        lines = f.readlines()
+        if len(lines) - 1 <= 2 * self.max_rows:
+            return
+        f.seek(0)
+        f.truncate()
+        f.writelines([lines[0]] + lines[-self.max_rows:])
+        f.flush()
+
+
+def _format_timestamp(logged_at: float) -> str:
+    # naive UTC, same format as the previous datetime.utcnow() column
+    return str(datetime.fromtimestamp(logged_at, timezone.utc).replace(tzinfo=None))
+
+
+production_logger = ProductionLogger(
+    PROD_LOG_PATH,
+    max_queue_size=int(os.getenv("PROD_LOG_MAX_QUEUE", "10000")),
+    batch_size=int(os.getenv("PROD_LOG_BATCH_SIZE", "256")),
+    flush_interval=float(os.getenv("PROD_LOG_FLUSH_INTERVAL", "1.0")),
+    max_rows=int(os.getenv("PROD_LOG_MAX_ROWS", "20")),
+)
+atexit.register(production_logger.shutdown)
+
+
+def log_predictions(records, predictions):
+    """Queue raw input records (dicts) with their predictions for the production log."""
+    production_logger.log_many(records, predictions)
+
+
+def log_prediction_input(data: pd.DataFrame, prediction):
+    """Queue the rows of `data` with their prediction(s) for the production log."""
+    predictions = prediction if pd.api.types.is_list_like(prediction) else [prediction] * len(data)
+    production_logger.log_many(data.to_dict("records"), predictions)
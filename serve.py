@@ -1,24 +1,44 @@
-from fastapi import FastAPI, Request
-from pydantic import BaseModel
+import asyncio
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
 import numpy as np
 import pandas as pd
-import json
-import joblib
-from sklearn.pipeline import Pipeline
 from sklearn import set_config
 from pathlib import Path
+import gc
 import os
 import sys
+import tempfile
 import mlflow
 from mlflow import pyfunc
 from dotenv import load_dotenv
-from monitoring.prod_logger import log_prediction_input
+from monitoring.prod_logger import ProductionLogger, log_predictions, production_logger
 
 
 # Set up module paths
 sys.path.append(str(Path(__file__).resolve().parent / "src"))
 
-from data_cleaning.data_cleaning_utils_py import perform_data_cleaning
+from data_cleaning.geospatial import record_distances
+from data_cleaning.record_cleaning import CLEANED_COLUMNS, clean_record, is_complete
+from model_building.compiled_model import compile_model
+from serving.shared_model import CompiledPredictor, SharedModelSource, publish_shared_model
+from serving.payloads import (PayloadError, UnsupportedContentType, is_ndjson, parse_payload,
+                              validate_records)
+from serving.metrics import (RequestMetricsMiddleware, latest_metrics, mark_process_dead,
+                             model_latency_histogram, predictions_counter, prepare_multiprocess_dir, record_errors_counter,
+                             stage_timer)
+from serving.micro_batcher import MicroBatcher
+from serving.model_reload import (ModelInfoSource, ModelReloader, RegistrySource, ServedModel,
+                                  publish_model_info)
+from serving.prediction_cache import PredictionCache, row_key
+from serving.codec import dumps
+from serving.schema import Data
+from serving.shadow import ShadowScorer
+from serving.streaming import NDJSONDecoder, RequestStreamingResponse
+from serving.warmup import Warmup
 
 # Load environment variables
 dotenv_path = Path(__file__).resolve().parent / '.env'
@@ -34,69 +54,444 @@ mlflow.set_tracking_uri(tracking_uri)
 set_config(transform_output='pandas')
 
 # Model + path loading
-def load_model_information(file_path):
-    with open(file_path) as f:
-        return json.load(f)
-
 current_dir = Path(__file__).resolve()
 root_dir = current_dir.parent
 info_path = root_dir / "model_info.json"
-run_info = load_model_information(info_path)
 
 model_name = 'swiggy_time_predictor'
-run_id = run_info['run_id']
-model_path = f"runs:/{run_id}/{model_name}"
-model = mlflow.pyfunc.load_model(model_path)
-print("✅ Model loaded.")
+
+# Where the served model comes from: the run_id in model_info.json, or the newest version
+# in a model registry stage. A background watcher hot-swaps new versions in.
+model_source_kind = os.getenv("MODEL_SOURCE", "model_info").lower()
+if model_source_kind == "registry":
+    model_source = RegistrySource(model_name, os.getenv("MODEL_REGISTRY_STAGE", "Staging"))
+else:
+    model_source = ModelInfoSource(info_path, model_name)
+model_reload_interval = float(os.getenv("MODEL_RELOAD_INTERVAL", "30"))
+
+# Compiled tree engine for the stacked model, the MLflow pyfunc model is the fallback
+compiled_trees_enabled = os.getenv("COMPILED_TREES", "true").lower() in ("1", "true", "yes")
+
+def compile_pyfunc_model(pyfunc_model):
+    """Compile the stacked model wrapped by the MLflow model, None when that is not possible."""
+    if not compiled_trees_enabled:
+        return None
+    try:
+        python_model = pyfunc_model.unwrap_python_model()
+        compiled = compile_model(python_model.model)
+        preprocessor = python_model.preprocessor
+        # the preprocessor was fitted with n_jobs=-1, process pools only add latency here
+        preprocessor.set_params(n_jobs=None)
+    except Exception as e:
+        print(f"Compiled tree engine unavailable, using the MLflow model: {e}")
+        return None
+    print(f"✅ Compiled {sum(f.n_trees for f in compiled.forests)} trees for inference.")
+    return CompiledPredictor(compiled, preprocessor)
+
+def load_served_model(version, run_id, uri) -> ServedModel:
+    pyfunc_model = mlflow.pyfunc.load_model(uri)
+    print(f"✅ Model {version} loaded from {uri}")
+    compiled_predictor = compile_pyfunc_model(pyfunc_model)
+    # the compiled trees replace the MLflow model, do not keep both in memory
+    return ServedModel(version, run_id, uri,
+                       model=pyfunc_model if compiled_predictor is None else None,
+                       compiled_predictor=compiled_predictor)
+
+shared_model_dir = os.getenv("SHARED_MODEL_DIR")
+if shared_model_dir:
+    # multi-worker mode: only the parent process loads and compiles models, it exports
+    # every version to SHARED_MODEL_DIR and the workers map the last one read-only
+    shared_source = SharedModelSource(shared_model_dir)
+
+    def load_shared_model(version, run_id, uri) -> ServedModel:
+        served = ServedModel(version, run_id, uri, compiled_predictor=shared_source.load(version))
+        print(f"✅ Shared compiled model {version} mapped from {shared_model_dir}")
+        return served
+
+    reload_source, reload_model = shared_source, load_shared_model
+else:
+    reload_source, reload_model = model_source, load_served_model
+served_model = reload_model(*reload_source())
+publish_model_info(served_model)
 
 # FastAPI app
 app = FastAPI()
 
+# Request counters, latency and in-flight requests of the scoring routes
+app.add_middleware(RequestMetricsMiddleware,
+                   routes=("/invocations", "/invocations/stream", "/predict"))
+
+# Optional dynamic micro-batching of concurrent single-record requests
+micro_batching_enabled = os.getenv("MICRO_BATCHING_ENABLED", "false").lower() in ("1", "true", "yes")
+micro_batch_window_ms = float(os.getenv("MICRO_BATCH_WINDOW_MS", "5"))
+micro_batch_max_size = int(os.getenv("MICRO_BATCH_MAX_SIZE", "32"))
+micro_batcher = None
+
+# LRU + TTL cache of predictions keyed on the cleaned feature row, per model version
+prediction_cache = PredictionCache(
+    max_entries=int(os.getenv("PREDICTION_CACHE_SIZE", "10000")),
+    ttl_seconds=float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "300")),
+    model_version=served_model.version,
+)
+
+# Optional shadow model scored on a sample of live traffic, results only go to metrics
+# and monitoring/shadow_data.csv
+shadow_model_uri = os.getenv("SHADOW_MODEL_URI")
+shadow_logger = None
+shadow_scorer = None
+if shadow_model_uri:
+    shadow_logger = ProductionLogger(
+        root_dir / "monitoring" / "shadow_data.csv",
+        max_rows=int(os.getenv("SHADOW_LOG_MAX_ROWS", "10000")),
+    )
+    shadow_scorer = ShadowScorer(
+        sample_rate=float(os.getenv("SHADOW_SAMPLE_RATE", "0.1")),
+        max_workers=int(os.getenv("SHADOW_WORKERS", "1")),
+        shadow_logger=shadow_logger,
+    )
+
+# Startup warmup with sample orders, /ping reports ready once it has finished
+warmup = Warmup(
+    lambda records, log=True: score_records(records, log=log, use_cache=False),
+    data_path=Path(os.getenv("WARMUP_DATA_PATH", root_dir / "data" / "raw" / "swiggy_sample.csv")),
+    n_requests=int(os.getenv("WARMUP_REQUESTS", "50")),
+    latency_samples=int(os.getenv("WARMUP_LATENCY_SAMPLES", "20")),
+    retries=int(os.getenv("WARMUP_RETRIES", "2")),
+)
+
 # Health check
 @app.get("/ping")
 def ping():
-    return {"status": "ok"}
-
-# Inference input format
-class Data(BaseModel):  
-    ID: str
-    Delivery_person_ID: str
-    Delivery_person_Age: str
-    Delivery_person_Ratings: str
-    Restaurant_latitude: float
-    Restaurant_longitude: float
-    Delivery_location_latitude: float
-    Delivery_location_longitude: float
-    Order_Date: str
-    Time_Orderd: str
-    Time_Order_picked: str
-    Weatherconditions: str
-    Road_traffic_density: str
-    Vehicle_condition: int
-    Type_of_order: str
-    Type_of_vehicle: str
-    multiple_deliveries: str
-    Festival: str
-    City: str
+    if not warmup.ready:
+        return JSONResponse(status_code=503,
+                            content={"status": warmup.status, "warmup": warmup.report(),
+                                     "model": served_model.info()})
+    status = {"status": "ok", "warmup": warmup.report(), "model": served_model.info()}
+    if shadow_scorer is not None:
+        status["shadow"] = shadow_scorer.info()
+    return status
+
+# Hot model reload: new versions are loaded and warmed in the background, then swapped in;
+# requests already running keep the ServedModel they started with. Shared-model workers
+# only watch SHARED_MODEL_DIR and remap what the parent published, each on its own poll.
+def warm_candidate(candidate: ServedModel) -> bool:
+    """Replay the startup warmup traffic through a freshly loaded model."""
+    candidate_warmup = Warmup(
+        lambda records, log=True: score_records(records, log=False, use_cache=False,
+                                                served=candidate),
+        data_path=warmup.data_path, n_requests=warmup.n_requests,
+        latency_samples=warmup.latency_samples,
+        # a failed candidate is not swapped in, the reloader tries again on its next poll
+        retries=0,
+    )
+    candidate_warmup.run()
+    return candidate_warmup.status != "failed"
+
+def swap_model(candidate: ServedModel):
+    global served_model
+    previous, served_model = served_model, candidate
+    prediction_cache.set_model_version(candidate.version)
+    publish_model_info(candidate, previous)
+
+model_reloader = ModelReloader(reload_source, reload_model, warm_candidate, swap_model,
+                               current_version=served_model.version,
+                               interval=model_reload_interval)
+
+@app.get("/metrics")
+def metrics():
+    body, content_type = latest_metrics()
+    return Response(body, media_type=content_type)
+
+# Online feature cleaning: the record-level cleaner by default, the pandas pipeline on request
+online_cleaning = os.getenv("ONLINE_CLEANING", "record").lower()
+
+def clean_with_pandas(pred_data: pd.DataFrame):
+    """Clean all records in one pandas pass, isolating the rows that break the batch pass."""
+    from data_cleaning.pipeline import perform_data_cleaning
+    try:
+        return perform_data_cleaning(pred_data).dropna(), {}
+    except Exception:
+        cleaned_rows, errors = [], {}
+        for idx in pred_data.index:
+            try:
+                cleaned_rows.append(perform_data_cleaning(pred_data.loc[[idx]]).dropna())
+            except Exception as e:
+                errors[idx] = f"Data cleaning failed: {e}"
+        cleaned = pd.concat(cleaned_rows) if cleaned_rows else pred_data.iloc[0:0]
+        return cleaned, errors
+
+def clean_batch(records, positions):
+    """Clean validated records into model features, returning the complete rows and per-row errors."""
+    if online_cleaning == "pandas":
+        return clean_with_pandas(pd.DataFrame([records[pos].raw for pos in positions],
+                                              index=positions))
+
+    # the batch's distances in one kernel pass; if a coordinate does not parse, each
+    # record computes its own (and reports its error)
+    try:
+        distances = record_distances([records[pos] for pos in positions]).tolist()
+    except (KeyError, TypeError, ValueError):
+        distances = [None] * len(positions)
+
+    rows, errors = {}, {}
+    for pos, distance in zip(positions, distances):
+        try:
+            row = clean_record(records[pos], distance)
+        except Exception as e:
+            errors[pos] = f"Data cleaning failed: {e}"
+            continue
+        if row is not None and is_complete(row):
+            rows[pos] = row
+    return pd.DataFrame(list(rows.values()), index=list(rows), columns=CLEANED_COLUMNS), errors
+
+def predict_with(served: ServedModel, cleaned_data: pd.DataFrame) -> np.ndarray:
+    with model_latency_histogram.labels(role="primary").time():
+        return served.predict(cleaned_data)
+
+def predict_cleaned(cleaned_data: pd.DataFrame, served: ServedModel,
+                    use_cache: bool = True) -> np.ndarray:
+    """Predict cleaned rows, scoring only the rows missing from the prediction cache."""
+    if not (use_cache and prediction_cache.enabled):
+        return predict_with(served, cleaned_data)
+
+    with stage_timer("cache"):
+        keys = [row_key(row) for row in
+                cleaned_data.reindex(columns=CLEANED_COLUMNS).itertuples(index=False)]
+        cached = [prediction_cache.get(key) for key in keys]
+    misses = [i for i, prediction in enumerate(cached) if prediction is None]
+    predictions = np.array([np.nan if p is None else p for p in cached], dtype=np.float64)
+    if misses:
+        scored = predict_with(served, cleaned_data.iloc[misses])
+        predictions[misses] = scored
+        for i, prediction in zip(misses, scored):
+            prediction_cache.put(keys[i], float(prediction), served.version)
+    return predictions
+
+def score_records(records, log: bool = True, use_cache: bool = True, served: ServedModel = None,
+                  shadow_samples: list = None):
+    """Score validated records with a single cleaning + model pass, keeping input order.
+
+    `records` holds either a validated Order or an error message per row. With
+    log=False (warmup traffic) nothing is written to the production log, counted as a
+    served prediction or shadow scored. `served` defaults to the model being served
+    when the call starts. Shadow samples are appended to `shadow_samples` for the
+    caller to `submit_shadow` once its response is sent.
+    """
+    served = served or served_model
+    results = [{"error": rec} if isinstance(rec, str) else None for rec in records]
+    valid_positions = [pos for pos, rec in enumerate(records) if not isinstance(rec, str)]
+    if not valid_positions:
+        return results
+
+    with stage_timer("cleaning"):
+        cleaned_data, errors = clean_batch(records, valid_positions)
+
+    if not cleaned_data.empty:
+        predictions = predict_cleaned(cleaned_data, served, use_cache)
+        for pos, prediction in zip(cleaned_data.index, predictions):
+            results[pos] = {"prediction": float(prediction)}
+        if log:
+            # the production log keeps the records as they were sent
+            scored_records = [records[pos].raw for pos in cleaned_data.index]
+            predictions_counter.inc(len(predictions))
+            with stage_timer("logging"):
+                log_predictions(scored_records, predictions)
+            if shadow_scorer is not None and shadow_samples is not None:
+                shadow_samples.append((scored_records, cleaned_data, predictions, served.version))
+
+    for pos in valid_positions:
+        if results[pos] is None:
+            results[pos] = {"error": errors.get(pos, "No valid data after cleaning")}
+            if log:
+                record_errors_counter.labels(stage="cleaning").inc()
+    return results
+
+def submit_shadow(shadow_samples: list):
+    """Hand the shadow samples of responses already sent to the shadow scorer."""
+    for sample in shadow_samples:
+        shadow_scorer.submit(*sample)
+    shadow_samples.clear()
+
+def shadow_task(shadow_samples: list):
+    """Background task submitting `shadow_samples` after the response, None without any."""
+    return BackgroundTask(submit_shadow, shadow_samples) if shadow_samples else None
+
+def json_response(content, shadow_samples: list = None) -> Response:
+    return Response(dumps(content), media_type="application/json",
+                    background=shadow_task(shadow_samples))
+
+def validate_counted(records):
+    """`validate_records`, timed and with the invalid records counted as errors."""
+    with stage_timer("validation"):
+        records = validate_records(records)
+    invalid = sum(isinstance(rec, str) for rec in records)
+    if invalid:
+        record_errors_counter.labels(stage="validation").inc(invalid)
+    return records
 
 # Required /invocations endpoint for SageMaker
 @app.post("/invocations")
-def invoke(data: Data):
-    pred_data = pd.DataFrame([data.dict()])
-    cleaned_data = perform_data_cleaning(pred_data).dropna()
-    prediction = model.predict(cleaned_data)[0]
-    log_prediction_input(pred_data,prediction)
-    return {"prediction": float(prediction)}
+async def invoke(request: Request):
+    body = await request.body()
+    try:
+        with stage_timer("parsing"):
+            records, is_batch = parse_payload(body, request.headers.get("content-type"))
+    except UnsupportedContentType as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except PayloadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    records = validate_counted(records)
+    if not is_batch and isinstance(records[0], str):
+        raise HTTPException(status_code=422, detail=records[0])
+
+    if not is_batch:
+        return await single_response(records[0])
+
+    # cleaning and prediction are CPU bound, keep them off the event loop
+    shadow_samples = []
+    results = await run_in_threadpool(score_records, records, shadow_samples=shadow_samples)
+    return json_response({"predictions": results}, shadow_samples)
+
+# Streaming JSON Lines scoring for bulk re-scoring: records are scored in fixed-size
+# chunks while the body is still uploading and each chunk's results are sent right away
+stream_chunk_size = int(os.getenv("STREAM_CHUNK_SIZE", "256"))
+
+def score_chunk(records, shadow_samples: list) -> bytes:
+    """Score one chunk of a streamed body into NDJSON result lines."""
+    try:
+        results = score_records(validate_counted(records), shadow_samples=shadow_samples)
+    except Exception as e:
+        results = [{"error": f"Prediction failed: {e}"}] * len(records)
+    return b"".join(dumps(result) + b"\n" for result in results)
+
+@app.post("/invocations/stream")
+async def invoke_stream(request: Request):
+    if not is_ndjson(request.headers.get("content-type")):
+        raise HTTPException(status_code=415, detail="Streaming requires a JSON Lines body")
+
+    async def results():
+        decoder = NDJSONDecoder()
+        chunk, shadow_samples = [], []
+        try:
+            async for data in request.stream():
+                for record in decoder.feed(data):
+                    chunk.append(record)
+                    if len(chunk) >= stream_chunk_size:
+                        yield await run_in_threadpool(score_chunk, chunk, shadow_samples)
+                        # the chunk's results are sent, shadow score it now
+                        submit_shadow(shadow_samples)
+                        chunk = []
+        except ClientDisconnect:
+            return
+        chunk.extend(decoder.close())
+        if chunk:
+            yield await run_in_threadpool(score_chunk, chunk, shadow_samples)
+            submit_shadow(shadow_samples)
+
+    return RequestStreamingResponse(results(), media_type="application/x-ndjson")
+
+async def single_response(record) -> Response:
+    """Score one validated record, through the micro-batcher when it is enabled."""
+    if micro_batcher is not None:
+        # the batcher submits the batch's shadow samples once its futures are resolved
+        return json_response(await asyncio.wrap_future(micro_batcher.submit(record)))
+    shadow_samples = []
+    results = await run_in_threadpool(score_records, [record], shadow_samples=shadow_samples)
+    return json_response(results[0], shadow_samples)
 
 # Optional custom route (can be used locally)
 @app.post("/predict")
-def do_predictions(data: Data):
-    return invoke(data)
+async def do_predictions(data: Data):
+    # Data validated the body with the same coercers as /invocations
+    return await single_response(data.order)
+
+@app.on_event("startup")
+def start_micro_batcher():
+    global micro_batcher
+    if micro_batching_enabled:
+        batch_shadow_samples = []
+        micro_batcher = MicroBatcher(
+            lambda records: score_records(records, shadow_samples=batch_shadow_samples),
+            max_batch_size=micro_batch_max_size, window_ms=micro_batch_window_ms,
+            after_flush=lambda: submit_shadow(batch_shadow_samples)).start()
+        print(f"Micro-batching enabled: window={micro_batch_window_ms}ms, "
+              f"max_batch_size={micro_batch_max_size}")
+
+@app.on_event("startup")
+def start_warmup():
+    warmup.start()
+
+@app.on_event("startup")
+def start_model_reloader():
+    model_reloader.start()
+
+@app.on_event("startup")
+def load_shadow_model():
+    if shadow_scorer is not None:
+        version = os.getenv("SHADOW_MODEL_VERSION", shadow_model_uri)
+        shadow_scorer.load_async(lambda: load_served_model(version, "", shadow_model_uri))
+
+@app.on_event("shutdown")
+def stop_model_reloader():
+    model_reloader.stop()
+
+@app.on_event("shutdown")
+def stop_micro_batcher():
+    if micro_batcher is not None:
+        micro_batcher.stop()
+
+@app.on_event("shutdown")
+def stop_shadow_scoring():
+    if shadow_scorer is not None:
+        shadow_scorer.shutdown()
+        shadow_logger.shutdown()
+
+@app.on_event("shutdown")
+def flush_production_log():
+    production_logger.shutdown()
+
+@app.on_event("shutdown")
+def drop_worker_metrics():
+    mark_process_dead()
 
 # Run locally
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    port = int(os.getenv("SERVING_PORT", "8080"))
+    workers = int(os.getenv("SERVING_WORKERS", "1"))
+
+    if workers > 1:
+        # every worker writes its metrics here, /metrics aggregates them
+        prepare_multiprocess_dir(os.getenv("PROMETHEUS_MULTIPROC_DIR")
+                                 or Path(tempfile.gettempdir()) / "swiggy_serving_metrics")
+
+    if workers > 1 and served_model.compiled_predictor is not None:
+        # export once per version and let every worker memory-map the same read-only
+        # arrays; this process is the only one polling the model source and compiling
+        export_dir = Path(os.getenv("SHARED_MODEL_EXPORT_DIR",
+                                    Path(tempfile.gettempdir()) / "swiggy_shared_model"))
+
+        def publish(candidate: ServedModel):
+            publish_shared_model(export_dir, candidate.version, candidate.run_id,
+                                 candidate.uri, candidate.compiled_predictor)
+            print(f"Published model version {candidate.version} to the workers")
+
+        def warm_publishable(candidate: ServedModel) -> bool:
+            if candidate.compiled_predictor is None:
+                raise RuntimeError("the compiled tree engine is unavailable, workers cannot share it")
+            return warm_candidate(candidate)
 
-   
-    
+        publish(served_model)
+        os.environ["SHARED_MODEL_DIR"] = str(export_dir)
+        ModelReloader(model_source, load_served_model, warm_publishable, publish,
+                      current_version=served_model.version, interval=model_reload_interval).start()
+        served_model = None
+        gc.collect()
+        print(f"Starting {workers} workers sharing the compiled model in {export_dir}")
+        uvicorn.run("serve:app", host="0.0.0.0", port=port, workers=workers)
+    elif workers > 1:
+        print("⚠️ Compiled model unavailable, every worker loads its own copy of the model")
+        uvicorn.run("serve:app", host="0.0.0.0", port=port, workers=workers)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=port)
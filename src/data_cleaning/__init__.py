@@ -0,0 +1,19 @@
+"""Cleaning of raw swiggy orders into model features.
+
+    pipeline         batch cleaning with pandas (DVC stage and the pandas serving mode)
+    record_cleaning  the same features for one record in plain Python (online path)
+    time_parsing     memoized order date and time parsing
+    binning          time slot, distance type and weekend bins
+    geospatial       coordinate cleaning, distance and distance type in one numpy kernel
+    incremental      raw partition manifests of the incremental stage runs
+
+Importing the package or the record-level modules does no I/O and does not import
+pandas; `perform_data_cleaning` loads the pipeline on first access.
+"""
+
+
+def __getattr__(name):
+    if name == 'perform_data_cleaning':
+        from data_cleaning.pipeline import perform_data_cleaning
+        return perform_data_cleaning
+    raise AttributeError(f"module 'data_cleaning' has no attribute {name!r}")
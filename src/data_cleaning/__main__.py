@@ -0,0 +1,14 @@
+"""DVC data_cleaning stage: `python src/data_cleaning`, or `python -m data_cleaning` from src."""
+
+import sys
+from pathlib import Path
+
+if not __package__:
+    # run as a directory, import the package from src rather than from this directory
+    sys.path[0] = str(Path(__file__).resolve().parent.parent)
+
+from data_cleaning.pipeline import main
+
+# guarded for the worker processes of the parallel mode
+if __name__ == '__main__':
+    main()
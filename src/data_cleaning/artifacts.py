@@ -0,0 +1,106 @@
+"""Typed Parquet artifacts passed between the DVC stages.
+
+The cleaned data and the train/test splits are written with the explicit
+`CLEANED_SCHEMA`, the cleaned dtype plan of dtypes.py: label columns are dictionary
+encoded (pandas Categoricals on read) and numeric columns keep their downcast type,
+so no stage re-parses text or re-infers dtypes. Stages read only the columns they
+use with `read_artifact(path, columns)`.
+
+Text that `pd.read_csv` reads as missing ('nan' from `astype(str)`, '') is stored as
+missing, so an artifact holds the values of its former CSV. `export_csv` writes a
+CSV copy for humans; the copies are not DVC outputs.
+"""
+
+import logging
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data_cleaning.dtypes import CLEANED_DTYPES, to_cleaned_dtypes
+
+logger = logging.getLogger('data_cleaning')
+
+DEFAULT_COMPRESSION = 'zstd'
+
+_LABEL = pa.dictionary(pa.int8(), pa.string())
+
+# the cleaned data dtype plan as an Arrow schema
+CLEANED_SCHEMA = pa.schema([
+    (name, _LABEL if dtype == 'category' else pa.from_numpy_dtype(np.dtype(dtype)))
+    for name, dtype in CLEANED_DTYPES.items()])
+
+def to_table(data: pd.DataFrame) -> pa.Table:
+    """Arrow table of `data` with `CLEANED_SCHEMA`, raising ValueError when values do not fit it."""
+    try:
+        return pa.Table.from_pandas(to_cleaned_dtypes(data), schema=CLEANED_SCHEMA,
+                                    preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        raise ValueError(f"Data does not match the artifact schema: {e}") from e
+
+
+def save_artifact(data: pd.DataFrame, path, compression: str = DEFAULT_COMPRESSION,
+                  csv_export: bool = False):
+    """Write `data` as a Parquet artifact, plus a CSV copy next to it with csv_export."""
+    pq.write_table(to_table(data), path, compression=compression)
+    logger.info(f"Artifact saved to {path}")
+    if csv_export:
+        export_csv(path)
+
+
+def open_artifact_writer(path, compression: str = DEFAULT_COMPRESSION) -> pq.ParquetWriter:
+    """Writer appending frames as row groups with `writer.write_table(to_table(frame))`."""
+    return pq.ParquetWriter(path, CLEANED_SCHEMA, compression=compression)
+
+
+@contextmanager
+def append_artifact(path, kept_rows: int, compression: str = DEFAULT_COMPRESSION):
+    """Writer for a new version of the artifact at `path` that starts with its first `kept_rows` rows.
+
+    Whole row groups are copied without going through pandas; `kept_rows` must end on
+    a row group boundary. The new file replaces `path` when the block completes.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    try:
+        with open_artifact_writer(tmp_path, compression) as writer:
+            copied, group = 0, 0
+            old = pq.ParquetFile(path) if kept_rows else None
+            while copied < kept_rows:
+                # Parquet reads dictionary indices back as int32
+                write_row_group(writer, old.read_row_group(group).cast(CLEANED_SCHEMA))
+                copied += old.metadata.row_group(group).num_rows
+                group += 1
+            if copied != kept_rows:
+                raise ValueError(f"{kept_rows} rows do not end on a row group of {path}")
+            yield writer
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def write_row_group(writer: pq.ParquetWriter, table: pa.Table):
+    """Append `table` as exactly one row group, nothing when it is empty."""
+    if table.num_rows:
+        writer.write_table(table, row_group_size=table.num_rows)
+
+
+def read_artifact(path, columns=None) -> pd.DataFrame:
+    """Load a Parquet artifact in the `CLEANED_DTYPES` plan, only `columns` when given."""
+    return pq.read_table(path, columns=columns).to_pandas()
+
+
+def export_csv(path, csv_path=None) -> Path:
+    """Write a CSV copy of an artifact one row group at a time, next to it by default."""
+    csv_path = Path(csv_path) if csv_path else Path(path).with_suffix('.csv')
+    parquet_file = pq.ParquetFile(path)
+    with open(csv_path, 'w', newline='') as out:
+        for group in range(parquet_file.num_row_groups):
+            frame = parquet_file.read_row_group(group).to_pandas()
+            frame.to_csv(out, index=False, header=group == 0)
+    logger.info(f"CSV copy saved to {csv_path}")
+    return csv_path
@@ -0,0 +1,78 @@
+"""Categorical bins of the cleaned features, shared by the cleaning stage and serving.
+
+The column functions bin whole columns with `np.searchsorted` into pandas Categoricals;
+the scalar functions use the same edges for the record-level cleaner. Category orders
+follow the OrdinalEncoder categories of feature_engineering.py, which imports them.
+numpy and pandas are only imported by the column functions.
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_right
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+NAN = float("nan")
+
+# OrdinalEncoder category orders
+TRAFFIC_ORDER = ['medium', 'high', 'jam', 'low']
+DISTANCE_ORDER = ['short', 'medium', 'long', 'very long']
+
+# order hour: [6, 12) Morning, [12, 17) Afternoon, [17, 20) Evening, otherwise Night
+TIME_SLOT_EDGES = [6, 12, 17, 20]
+TIME_SLOT_BINS = ['Night', 'Morning', 'Afternoon', 'Evening', 'Night']
+TIME_SLOTS = ['Morning', 'Afternoon', 'Evening', 'Night']
+
+# distance in km: negative is invalid, then [0, 5), [5, 10), [10, 15) and 15 and more
+DISTANCE_EDGES = [0, 5, 10, 15]
+DISTANCE_BINS = ['invalid'] + DISTANCE_ORDER
+DISTANCE_TYPES = DISTANCE_ORDER + ['invalid']
+
+FIRST_WEEKEND_DAY = 5  # dt.dayofweek of Saturday, Monday is 0
+
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def time_slot(order_hour):
+    """Time slot of one order hour, NaN when missing."""
+    if _is_missing(order_hour):
+        return NAN
+    return TIME_SLOT_BINS[bisect_right(TIME_SLOT_EDGES, order_hour)]
+
+
+def distance_type(distance: float):
+    """Distance range of one distance in km, NaN when missing."""
+    if _is_missing(distance):
+        return NAN
+    return DISTANCE_BINS[bisect_right(DISTANCE_EDGES, distance)]
+
+
+def _bin_column(values, edges, bins, categories, index=None) -> pd.Series:
+    import numpy as np
+    import pandas as pd
+
+    values = np.asarray(values, dtype=float)
+    positions = np.searchsorted(edges, values, side='right')
+    bin_codes = np.array([categories.index(label) for label in bins])
+    codes = np.where(np.isnan(values), -1, bin_codes[positions])
+    return pd.Series(pd.Categorical.from_codes(codes, categories=categories), index=index)
+
+
+def time_slot_column(order_hour: pd.Series) -> pd.Series:
+    """Categorical time slot of an order hour column, NaN where the hour is missing."""
+    return _bin_column(order_hour, TIME_SLOT_EDGES, TIME_SLOT_BINS, TIME_SLOTS, order_hour.index)
+
+
+def distance_type_column(distance: pd.Series) -> pd.Series:
+    """Categorical distance range of a distance column, NaN where the distance is missing."""
+    return _bin_column(distance, DISTANCE_EDGES, DISTANCE_BINS, DISTANCE_TYPES, distance.index)
+
+
+def is_weekend_column(order_date: pd.Series) -> pd.Series:
+    """1 for Saturday and Sunday orders, 0 otherwise (also when the date is missing)."""
+    return (order_date.dt.dayofweek >= FIRST_WEEKEND_DAY).astype(int)
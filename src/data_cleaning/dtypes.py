@@ -0,0 +1,152 @@
+"""Dtype plan of the raw and cleaned swiggy data.
+
+`RAW_DTYPES` is passed to `pd.read_csv` by every loader of the raw layout (the
+cleaning stage, drift): low-cardinality text is read as categoricals, the order and
+delivery person IDs as Arrow-backed strings, and the latitudes and longitudes stay
+float64 since they are not exact in float32. The cleaning steps give the same values
+on these dtypes as on the default object columns.
+
+`CLEANED_DTYPES` is the compact layout of the cleaned data and of the Parquet
+artifacts (see artifacts.py): labels are categoricals with a fixed dictionary, and
+numbers are downcast where every value the cleaning derives is exact (whole ages,
+small counts, flags). Ratings, distances and the pickup minutes, which have fractions
+of a second, keep float64. Delivery times are int16, which holds any delivery (up to
+22 days) rather than the range of one sample, since every chunk and partition of an
+artifact is written with the same schema. `ORDER_KEY` is a hash of the raw order
+identity that the train/test split is drawn from; it is not a model feature.
+"""
+
+import logging
+
+import pandas as pd
+
+from data_cleaning.binning import DISTANCE_TYPES, TIME_SLOTS, TRAFFIC_ORDER
+
+logger = logging.getLogger('data_cleaning')
+
+ID_STRING = pd.StringDtype('pyarrow')
+
+RAW_DTYPES = {
+    'ID': ID_STRING,
+    'Delivery_person_ID': ID_STRING,
+    # ages and ratings are still text with 'NaN ' tokens
+    'Delivery_person_Age': 'category',
+    'Delivery_person_Ratings': 'category',
+    'Restaurant_latitude': 'float64',
+    'Restaurant_longitude': 'float64',
+    'Delivery_location_latitude': 'float64',
+    'Delivery_location_longitude': 'float64',
+    'Order_Date': 'category',
+    'Time_Orderd': 'category',
+    'Time_Order_picked': 'category',
+    'Weatherconditions': 'category',
+    'Road_traffic_density': 'category',
+    'Vehicle_condition': 'int8',
+    'Type_of_order': 'category',
+    'Type_of_vehicle': 'category',
+    'multiple_deliveries': 'category',
+    'Festival': 'category',
+    'City': 'category',
+    'Time_taken(min)': 'category',
+}
+
+# dictionary of each label column; labels outside it are appended with a warning
+CATEGORIES = {
+    'weather_condition': ['cloudy', 'fog', 'sandstorms', 'stormy', 'sunny', 'windy'],
+    'traffic_density': TRAFFIC_ORDER,
+    'order_type': ['Buffet ', 'Drinks ', 'Meal ', 'Snack '],
+    'vehicle_type': ['bicycle', 'electric_scooter', 'motorcycle', 'scooter'],
+    'festival': ['no', 'yes'],
+    'city': ['metropolitian', 'semi-urban', 'urban'],
+    'city_name': ['AGR', 'ALH', 'AURG', 'BANG', 'BHP', 'CHEN', 'COIMB', 'DEH', 'GOA', 'HYD',
+                  'INDO', 'JAP', 'KNP', 'KOC', 'KOL', 'LUDH', 'MUM', 'MYS', 'PUNE', 'RANCHI',
+                  'SUR', 'VAD'],
+    'time_slot': TIME_SLOTS,
+    'distance_type': DISTANCE_TYPES,
+}
+
+ORDER_KEY = 'order_key'
+
+# column order of the cleaned training data (perform_data_cleaning(..., training=True))
+CLEANED_DTYPES = {
+    'person_age': 'float32',
+    'person_ratings': 'float64',
+    'weather_condition': 'category',
+    'traffic_density': 'category',
+    'vehicle_condition': 'int8',
+    'order_type': 'category',
+    'vehicle_type': 'category',
+    'multiple_deliveries': 'float32',
+    'festival': 'category',
+    'city': 'category',
+    'time_taken': 'int16',
+    'city_name': 'category',
+    'is_weekend': 'int8',
+    'pickup_time_in_minutes': 'float64',
+    'time_slot': 'category',
+    'distance': 'float64',
+    'distance_type': 'category',
+    ORDER_KEY: 'int64',
+}
+
+# strings pd.read_csv reads as missing by default
+CSV_NA_VALUES = frozenset(['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN',
+                           '-nan', '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN',
+                           'None', 'n/a', 'nan', 'null'])
+
+
+def to_categorical(values: pd.Series, categories: list) -> pd.Series:
+    """Categorical of `values` over `categories`, with CSV missing tokens ('nan') missing."""
+    values = values.astype(object)
+    values = values.where(~values.isin(CSV_NA_VALUES))
+    unknown = sorted(set(values.dropna()) - set(categories))
+    if unknown:
+        logger.warning(f"New {values.name} labels {unknown} added to the dictionary")
+        categories = list(categories) + unknown
+    return values.astype(pd.CategoricalDtype(categories))
+
+
+def to_cleaned_dtypes(data: pd.DataFrame) -> pd.DataFrame:
+    """The cleaned data in the `CLEANED_DTYPES` columns and dtypes.
+
+    Raises ValueError when a number does not fit its downcast dtype exactly.
+    """
+    columns = {}
+    for name, dtype in CLEANED_DTYPES.items():
+        if dtype == 'category':
+            columns[name] = to_categorical(data[name], CATEGORIES[name])
+            continue
+        # time_taken is still text after cleaning
+        values = pd.to_numeric(data[name])
+        cast = values.astype(dtype)
+        if not (cast.astype(values.dtype) == values)[values.notna()].all():
+            raise ValueError(f"{name} values are not exact as {dtype}")
+        columns[name] = cast
+    return pd.DataFrame(columns, index=data.index)
+
+
+def widen_dtypes(data: pd.DataFrame) -> pd.DataFrame:
+    """`data` with text labels, float64 and int64 numbers, the dtypes of the former CSVs.
+
+    For MLflow signatures and pyfunc inputs, which expect the serving dtypes.
+    """
+    wide = {}
+    for name, dtype in data.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            wide[name] = object
+        elif pd.api.types.is_float_dtype(dtype):
+            wide[name] = 'float64'
+        elif pd.api.types.is_signed_integer_dtype(dtype):
+            wide[name] = 'int64'
+    return data.astype(wide)
+
+
+def memory_mb(data: pd.DataFrame) -> float:
+    return data.memory_usage(deep=True).sum() / 2**20
+
+
+def log_memory(name: str, before: pd.DataFrame, after: pd.DataFrame):
+    """Log the deep memory usage of `before` and `after` the dtype plan."""
+    before_mb, after_mb = memory_mb(before), memory_mb(after)
+    logger.info(f"{name}: {before_mb:.1f} MB -> {after_mb:.1f} MB with the dtype plan "
+                f"({before_mb / after_mb:.1f}x smaller)")
@@ -0,0 +1,135 @@
+"""Coordinate cleaning, haversine distance and distance bucketing in one kernel.
+
+`GeoKernel` takes the restaurant and delivery latitudes and longitudes as an (n, 4)
+block (or the four columns) and, in one sequence of in-place ufunc calls over a
+reusable (4, n) work buffer, takes absolute values, sets coordinates below the
+threshold to NaN, computes the haversine distance in km and bins it into the
+`DISTANCE_TYPES` codes of binning.py. Only the outputs are allocated per call (or
+passed in with `out`/`codes`) instead of a dozen temporary arrays.
+
+The float64 kernel gives the values of the former pandas steps bit for bit; the
+float32 mode halves the buffers and is about 1.8x faster again, at up to a metre of
+error (see benchmarks/bench_geospatial.py). Every cleaned distance comes from the
+float64 kernel, single records included (`clean_record`), since math.sin and the numpy
+ufuncs can differ in the last bit: a call costs some 40 us, but an order then cleans
+to the same row whatever its batch. A kernel's buffers are not shared between
+threads: `get_kernel` keeps one per thread and dtype.
+"""
+
+import threading
+
+import numpy as np
+
+from data_cleaning.binning import DISTANCE_BINS, DISTANCE_EDGES, DISTANCE_TYPES
+
+EARTH_RADIUS_KM = 6371
+COORDINATE_THRESHOLD = 1
+
+# raw record keys of the four coordinates, in kernel order
+RECORD_COORDINATES = ['Restaurant_latitude', 'Restaurant_longitude',
+                      'Delivery_location_latitude', 'Delivery_location_longitude']
+
+# category code of each searchsorted position over DISTANCE_EDGES
+_BIN_CODES = np.array([DISTANCE_TYPES.index(label) for label in DISTANCE_BINS], dtype=np.int8)
+
+
+class GeoKernel:
+    """Distance kernel with work buffers reused across calls, grown to the largest batch."""
+
+    def __init__(self, dtype=np.float64, threshold: float = COORDINATE_THRESHOLD):
+        self.dtype = np.dtype(dtype)
+        self.threshold = threshold
+        self._allocate(0)
+
+    def _allocate(self, n: int):
+        self._work = np.empty((4, n), dtype=self.dtype)
+        self._scratch = np.empty(n, dtype=self.dtype)
+        self._mask = np.empty((4, n), dtype=bool)
+        self._capacity = n
+
+    def _buffers(self, n: int):
+        if n > self._capacity:
+            self._allocate(n)
+        return self._work[:, :n], self._scratch[:n], self._mask[:, :n]
+
+    def distances(self, coordinates, out: np.ndarray = None) -> np.ndarray:
+        """Haversine distance in km of each row of `coordinates`, NaN when a coordinate is.
+
+        `coordinates` is an (n, 4) array or a sequence of four columns, in the order
+        restaurant latitude, longitude, delivery latitude, longitude. Coordinates are
+        taken as absolute values, and those below the threshold as missing.
+        """
+        columns = coordinates.T if isinstance(coordinates, np.ndarray) else coordinates
+        n = len(columns[0])
+        work, scratch, mask = self._buffers(n)
+        if out is None:
+            out = np.empty(n, dtype=self.dtype)
+
+        for row, column in zip(work, columns):
+            np.abs(column, out=row, casting='unsafe')
+        np.less(work, self.threshold, out=mask)
+        np.copyto(work, np.nan, where=mask)
+        np.radians(work, out=work)
+        lat1, lon1, lat2, lon2 = work
+
+        # sin(dlat / 2)**2 + cos(lat1) * cos(lat2) * sin(dlon / 2)**2, in this order
+        np.subtract(lat2, lat1, out=out)
+        out /= 2.0
+        np.sin(out, out=out)
+        np.square(out, out=out)
+        np.cos(lat2, out=scratch)
+        # lat2 is not needed any more, its row holds cos(lat1) * cos(lat2)
+        np.cos(lat1, out=lat2)
+        lat2 *= scratch
+        np.subtract(lon2, lon1, out=scratch)
+        scratch /= 2.0
+        np.sin(scratch, out=scratch)
+        np.square(scratch, out=scratch)
+        lat2 *= scratch
+        out += lat2
+
+        np.sqrt(out, out=out)
+        np.arcsin(out, out=out)
+        out *= 2
+        out *= EARTH_RADIUS_KM
+        return out
+
+    def distance_codes(self, distance: np.ndarray, codes: np.ndarray = None) -> np.ndarray:
+        """int8 `DISTANCE_TYPES` codes of `distance`, -1 where it is missing."""
+        n = len(distance)
+        mask = self._buffers(n)[2][0]
+        if codes is None:
+            codes = np.empty(n, dtype=np.int8)
+        # searchsorted(DISTANCE_EDGES, distance, side='right'), counted edge by edge
+        codes[:] = 0
+        for edge in DISTANCE_EDGES:
+            np.greater_equal(distance, edge, out=mask)
+            codes += mask
+        np.take(_BIN_CODES, codes, out=codes)
+        np.isnan(distance, out=mask)
+        np.copyto(codes, -1, where=mask)
+        return codes
+
+    def __call__(self, coordinates, out: np.ndarray = None, codes: np.ndarray = None):
+        """(distance, distance type codes) of `coordinates`, see `distances`."""
+        distance = self.distances(coordinates, out)
+        return distance, self.distance_codes(distance, codes)
+
+
+_kernels = threading.local()
+
+
+def get_kernel(dtype=np.float64) -> GeoKernel:
+    """The calling thread's kernel for `dtype`."""
+    kernels = _kernels.__dict__.setdefault('by_dtype', {})
+    dtype = np.dtype(dtype)
+    if dtype not in kernels:
+        kernels[dtype] = GeoKernel(dtype)
+    return kernels[dtype]
+
+
+def record_distances(records) -> np.ndarray:
+    """float64 distances of raw order records, for `clean_record(record, distance=...)`."""
+    coordinates = np.array([[record[key] for key in RECORD_COORDINATES] for record in records],
+                           dtype=float).reshape(-1, 4)
+    return get_kernel().distances(coordinates)
@@ -0,0 +1,92 @@
+"""Partition manifests for the incremental data_cleaning and data_processing stages.
+
+The raw CSV is read as partitions of `partition_rows` lines (one order per line, as
+swiggy.csv has no quoted newlines), each identified by the sha256 of its bytes. A
+stage's manifest lists the partitions its outputs hold, in order, with a fingerprint
+of the code and settings that produced them. Appending orders to the raw file only
+changes its last partitions, so a stage keeps the row groups of the leading
+partitions that still match and processes the rest; a changed fingerprint, a missing
+manifest or `rebuild` processes everything. Each non-empty partition is one row group
+of the outputs, so the result is the file a full rebuild writes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger('data_cleaning')
+
+MANIFEST_VERSION = 1
+
+
+def fingerprint(sources, **settings) -> str:
+    """sha256 of the `sources` files and the `settings` that shape a stage's output."""
+    digest = hashlib.sha256(json.dumps(settings, sort_keys=True).encode())
+    for source in sorted(map(str, sources)):
+        digest.update(Path(source).read_bytes())
+    return digest.hexdigest()
+
+
+def raw_partitions(path, partition_rows: int):
+    """Yield (sha256, header, body) of each `partition_rows`-line partition of a CSV file."""
+    with open(path, 'rb') as f:
+        header = f.readline()
+        while True:
+            lines = [line for _, line in zip(range(partition_rows), f)]
+            if not lines:
+                return
+            body = b''.join(lines)
+            yield hashlib.sha256(body).hexdigest(), header, body
+
+
+def load_manifest(path) -> dict:
+    """The manifest at `path`, None when there is none this code can read or it was reset."""
+    try:
+        manifest = json.loads(Path(path).read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+    if manifest.get('version') != MANIFEST_VERSION or not manifest.get('fingerprint'):
+        return None
+    return manifest
+
+
+def read_manifest(path, expected_fingerprint: str) -> list:
+    """Partitions of the manifest at `path`, empty when missing or written by other code or settings."""
+    manifest = load_manifest(path)
+    if manifest is None:
+        return []
+    if manifest['fingerprint'] != expected_fingerprint:
+        logger.info(f"Manifest {path} is out of date, rebuilding")
+        return []
+    return manifest['partitions']
+
+
+def write_manifest(path, expected_fingerprint: str, partitions: list):
+    """Write a manifest atomically, after the outputs it describes."""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(json.dumps({'version': MANIFEST_VERSION,
+                                    'fingerprint': expected_fingerprint,
+                                    'partitions': partitions}, indent=1))
+    os.replace(tmp_path, path)
+
+
+def reset_manifest(path):
+    """Empty the manifest of outputs written by a full, non-incremental run.
+
+    The file stays (it is a DVC output) but matches nothing, so the next incremental
+    run starts over.
+    """
+    write_manifest(path, None, [])
+
+
+def matching_prefix(previous: list, digests, key: str = 'sha256') -> int:
+    """Number of leading `digests` that are also the leading partitions of `previous`."""
+    kept = 0
+    for entry, digest in zip(previous, digests):
+        if entry[key] != digest:
+            break
+        kept += 1
+    return kept
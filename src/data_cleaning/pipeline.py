@@ -0,0 +1,415 @@
+"""Batch cleaning of raw swiggy orders, used by the DVC data_cleaning stage and serving.
+
+`perform_data_cleaning(data)` gives the online feature layout (the former
+data_cleaning_utils_py.py) and `perform_data_cleaning(data, training=True)` the cleaned
+training data written by the stage (the former data_cleaning.py). They only differ in
+two places: training keeps a missing traffic density as NaN and drops day_of_week.
+
+The stage cleans the raw file in memory, or `chunk_size` rows at a time when
+`data_cleaning.chunk_size` is set in params.yaml: every step is row-local, so chunks
+are cleaned independently and appended to the output, which holds the same rows as
+the in-memory result. For the same reason `data_cleaning.workers` > 1 cleans row
+partitions (or chunks) in a process pool and joins them back in row order.
+With `data_cleaning.incremental` only the raw partitions that are new since the last
+run are cleaned and appended (see incremental.py); `--rebuild` cleans them all.
+The raw file is read with the dtype plan of dtypes.py and the output is a typed
+Parquet artifact (see artifacts.py). Importing this module does no I/O.
+"""
+
+import argparse
+import io
+import itertools
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_cleaning.binning import DISTANCE_TYPES, is_weekend_column, time_slot_column
+from data_cleaning.dtypes import ORDER_KEY
+from data_cleaning.geospatial import get_kernel
+from data_cleaning.time_parsing import (format_time_column, parse_date_column,
+                                        parse_time_column, pickup_minutes)
+
+logger = logging.getLogger('data_cleaning')
+
+MISSING_TOKENS = ['NaN ', ' nan', '', 'NaN', 'None', ' null']
+LOCATION_COLUMNS = ['latitude', 'longitude', 'delivery_location_latitude',
+                    'delivery_location_longitude']
+
+
+def load_data(data_path: str) -> pd.DataFrame:
+    """Load raw orders with the `RAW_DTYPES` plan."""
+    from data_cleaning.dtypes import RAW_DTYPES, memory_mb
+
+    try:
+        df = pd.read_csv(data_path, dtype=RAW_DTYPES)
+        logger.info(f"Data loaded successfully from {data_path} ({memory_mb(df):.1f} MB)")
+        return df
+    except FileNotFoundError:
+        logger.error(f"File not found: {data_path}")
+        return pd.DataFrame()
+    except Exception as e:
+        logger.error(f"Error loading data: {e}")
+        return pd.DataFrame()
+
+
+COLUMN_NAMES = {
+    'delivery_person_id': 'delivery_ID',
+    'delivery_person_age': 'person_age',
+    'delivery_person_ratings': 'person_ratings',
+    'restaurant_latitude': 'latitude',
+    'restaurant_longitude': 'longitude',
+    'time_orderd': 'order_time',
+    'time_order_picked': 'order_picked_time',
+    'weatherconditions': 'weather_condition',
+    'road_traffic_density': 'traffic_density',
+    'type_of_order': 'order_type',
+    'type_of_vehicle': 'vehicle_type',
+    'time_taken(min)': 'time_taken',
+}
+
+WEATHER_MISSING = ['nan', '', ' nan', 'NaN', 'None', 'null']
+
+# raw text identifying an order in the training data (renamed columns)
+ORDER_ID_COLUMNS = ['id', 'delivery_ID', 'order_date']
+
+
+def change_column_name(data: pd.DataFrame) -> pd.DataFrame:
+    """`data` with lower-case, renamed columns, sharing its values (data_cleaning copies)."""
+    return data.rename(columns=lambda col: COLUMN_NAMES.get(col.lower(), col.lower()),
+                       copy=False)
+
+
+def _text_column(values: pd.Series, transform, missing=np.nan) -> np.ndarray:
+    """`transform` applied once per distinct value, `missing` where the value is missing.
+
+    The result shares one string object per distinct value, where the `.str` chains
+    it replaces built new strings (and intermediate arrays) for every row.
+    """
+    codes, uniques = pd.factorize(values)
+    labels = np.array([transform(value) for value in uniques] + [missing], dtype=object)
+    return labels[codes]
+
+
+def _weather(value: str):
+    label = value.replace('conditions', '').lower().strip()
+    return np.nan if label in WEATHER_MISSING else label
+
+
+def _second_word(value: str):
+    words = value.split()
+    return words[1] if len(words) > 1 else np.nan
+
+
+def order_keys(data: pd.DataFrame) -> np.ndarray:
+    """Stable int64 key of each order, a hash of the trimmed raw text of `ORDER_ID_COLUMNS`.
+
+    Order IDs repeat in swiggy.csv, with the delivery person and the order date they
+    do not. The key depends on nothing else, so changes to the cleaning or the dtype
+    plan never move an order between the train and test splits.
+    """
+    keys = np.zeros(len(data), dtype=np.uint64)
+    for col in ORDER_ID_COLUMNS:
+        codes, uniques = pd.factorize(data[col])
+        # a missing value hashes as ''
+        texts = np.array([str(value).strip() for value in uniques] + [''], dtype=object)
+        keys = pd.util.hash_array(keys ^ pd.util.hash_array(texts)[codes])
+    return keys.view(np.int64)
+
+
+def data_cleaning(data: pd.DataFrame, training: bool = False) -> pd.DataFrame:
+    """Cleans and preprocesses the given DataFrame.
+
+    The rows to keep are selected with one mask and taken once into a new frame,
+    the only copy of `data`; every later step replaces or adds single columns of it.
+    """
+    # missing tokens such as 'NaN ' parse as NaN
+    person_age = data['person_age'].astype(float).to_numpy()
+    person_ratings = data['person_ratings'].astype(float).to_numpy()
+    keep = np.flatnonzero(~((person_age < 18) | (person_ratings > 5)))
+    data = data.take(keep)
+
+    data['person_age'] = person_age[keep]
+    data['person_ratings'] = person_ratings[keep]
+    if training:
+        # from the raw identity text, before any of it is cleaned
+        data[ORDER_KEY] = order_keys(data)
+    for col, dtype in data.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            # categoricals of the raw dtype plan drop the missing tokens from their categories
+            categories = dtype.categories
+            data[col] = data[col].cat.remove_categories(categories[categories.isin(MISSING_TOKENS)])
+        elif not pd.api.types.is_numeric_dtype(dtype):
+            data[col] = data[col].where(~data[col].isin(MISSING_TOKENS))
+
+    if 'weather_condition' in data.columns:
+        data['weather_condition'] = _text_column(data['weather_condition'], _weather)
+
+    data['city_name'] = _text_column(data['delivery_ID'], lambda value: value.split('RES')[0])
+
+    data['order_date'] = parse_date_column(data['order_date'])
+
+    data['day'] = data['order_date'].dt.day
+    data['month'] = data['order_date'].dt.month
+    data['day_of_week'] = _text_column(data['order_date'], lambda date: date.day_name())
+
+    data['is_weekend'] = is_weekend_column(data['order_date'])
+
+    # each distinct time string is parsed once, the rest is integer arithmetic on seconds
+    order_seconds = parse_time_column(data['order_time'])
+    picked_seconds = parse_time_column(data['order_picked_time'])
+
+    data['pickup_time_in_minutes'] = pickup_minutes(order_seconds, picked_seconds)
+
+    data['order_time_hr'] = order_seconds // 3600
+    data['time_slot'] = time_slot_column(data['order_time_hr'])
+
+    data['order_time'] = format_time_column(order_seconds)
+    data['order_picked_time'] = format_time_column(picked_seconds)
+
+    # a missing label becomes the text 'nan', as with astype(str)
+    for col in ['vehicle_type', 'festival', 'city']:
+        if col in data.columns:
+            data[col] = _text_column(data[col], lambda value: value.rstrip().lower(), 'nan')
+
+    if 'multiple_deliveries' in data.columns:
+        data['multiple_deliveries'] = data['multiple_deliveries'].astype(float)
+    if 'traffic_density' in data.columns:
+        # serving has always turned a missing traffic density into the text 'nan'
+        data['traffic_density'] = _text_column(data['traffic_density'],
+                                               lambda value: value.lower().strip(),
+                                               np.nan if training else 'nan')
+
+    if 'time_taken' in data.columns:
+        data['time_taken'] = _text_column(data['time_taken'], _second_word)
+
+    return data
+
+
+def add_distance(data: pd.DataFrame, dtype=np.float64) -> pd.DataFrame:
+    """Add the haversine `distance` in km and its `distance_type` to `data` in place.
+
+    Coordinates are taken as absolute values and those below 1 as missing, all in
+    one pass of the geospatial kernel over the four location columns.
+    """
+    coordinates = [data[col].to_numpy(dtype=float) for col in LOCATION_COLUMNS]
+    distance, codes = get_kernel(dtype)(coordinates)
+    data['distance'] = distance
+    data['distance_type'] = pd.Categorical.from_codes(codes, categories=DISTANCE_TYPES)
+    return data
+
+
+def drop_columns(data: pd.DataFrame, training: bool = False) -> pd.DataFrame:
+    """Delete the columns the model does not use from `data` in place."""
+    columns = [
+        'id', 'delivery_ID', 'order_date', 'order_time', 'order_picked_time',
+        'latitude', 'longitude', 'delivery_location_latitude', 'delivery_location_longitude',
+        'order_time_hr', 'day', 'month'
+    ]
+    if training:
+        columns.append('day_of_week')
+    for col in columns:
+        if col in data.columns:
+            del data[col]
+    return data
+
+
+def perform_data_cleaning(data: pd.DataFrame, training: bool = False) -> pd.DataFrame:
+    """Clean raw swiggy.csv-layout orders into the model feature columns.
+
+    `data` is left unchanged: `data_cleaning` takes the kept rows into a new frame and
+    the later steps replace, add or delete its columns without copying the frame,
+    with or without copy-on-write.
+    """
+    data = data_cleaning(change_column_name(data), training=training)
+    return drop_columns(add_distance(data), training=training)
+
+
+def resolve_workers(workers) -> int:
+    """Worker processes to use, 0 or None means one per core."""
+    return workers if workers else os.cpu_count() or 1
+
+
+def _clean_in_order(frames, training: bool, workers: int):
+    """Yield the cleaned `frames` in input order, on `workers` processes.
+
+    At most two frames per worker are in flight, so reading `frames` lazily keeps
+    memory bounded.
+    """
+    if workers <= 1:
+        for frame in frames:
+            yield perform_data_cleaning(frame, training=training)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for frame in frames:
+            pending.append(pool.submit(perform_data_cleaning, frame, training))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def perform_data_cleaning_parallel(data: pd.DataFrame, workers=None, training: bool = False,
+                                   partitions: int = None) -> pd.DataFrame:
+    """`perform_data_cleaning` on row partitions in a process pool, concatenated in row order.
+
+    `partitions` defaults to four per worker to even out the load.
+    """
+    workers = resolve_workers(workers)
+    bounds = np.linspace(0, len(data), (partitions or 4 * workers) + 1).astype(int)
+    frames = [data.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])
+              if stop > start]
+    if len(frames) <= 1:
+        return perform_data_cleaning(data, training=training)
+    return pd.concat(list(_clean_in_order(frames, training, workers)))
+
+
+def clean_csv_in_chunks(data_path, saved_data_path, chunk_size: int, workers: int = 1,
+                        compression: str = None) -> int:
+    """Clean a raw CSV `chunk_size` rows at a time into a training data artifact.
+
+    Each cleaned chunk is appended as a Parquet row group, so only a few raw chunks
+    and their cleaned copies are in memory at a time (two per worker with
+    workers > 1). Returns the number of cleaned rows written.
+    """
+    from data_cleaning.artifacts import DEFAULT_COMPRESSION, open_artifact_writer, to_table
+    from data_cleaning.dtypes import RAW_DTYPES
+
+    rows = 0
+    with pd.read_csv(data_path, chunksize=chunk_size, dtype=RAW_DTYPES) as reader, \
+            open_artifact_writer(saved_data_path, compression or DEFAULT_COMPRESSION) as writer:
+        cleaned_chunks = _clean_in_order(reader, True, resolve_workers(workers))
+        for chunk_no, cleaned in enumerate(cleaned_chunks):
+            writer.write_table(to_table(cleaned))
+            rows += len(cleaned)
+            logger.debug(f"Cleaned chunk {chunk_no}")
+    return rows
+
+
+def clean_csv_incrementally(data_path, saved_data_path, manifest_path, partition_rows: int,
+                            workers: int = 1, compression: str = None, rebuild: bool = False):
+    """Clean only the raw partitions missing from the manifest, appending them to the artifact.
+
+    The artifact keeps the row groups of the leading raw partitions that are unchanged
+    since the last run (see incremental.py) and gets one row group per new partition.
+    Returns the number of cleaned rows and of partitions cleaned in this run.
+    """
+    from data_cleaning import incremental
+    from data_cleaning.artifacts import (DEFAULT_COMPRESSION, append_artifact, to_table,
+                                         write_row_group)
+    from data_cleaning.dtypes import RAW_DTYPES
+
+    compression = compression or DEFAULT_COMPRESSION
+    # any change to the package's code or these settings cleans everything again
+    expected = incremental.fingerprint(Path(__file__).resolve().parent.glob('*.py'),
+                                       partition_rows=partition_rows, compression=compression)
+    previous = [] if rebuild or not Path(saved_data_path).exists() else \
+        incremental.read_manifest(manifest_path, expected)
+
+    partitions = incremental.raw_partitions(data_path, partition_rows)
+    kept, first_new = [], []
+    for digest, header, body in partitions:
+        if len(kept) < len(previous) and previous[len(kept)]['sha256'] == digest:
+            kept.append(previous[len(kept)])
+        else:
+            first_new = [(digest, header, body)]
+            break
+    if previous and kept == previous and not first_new:
+        logger.info("No new raw partitions, the cleaned data is up to date")
+        return sum(entry['rows'] for entry in kept), 0
+
+    new_digests = []
+
+    def new_frames():
+        for digest, header, body in itertools.chain(first_new, partitions):
+            new_digests.append(digest)
+            yield pd.read_csv(io.BytesIO(header + body), dtype=RAW_DTYPES)
+
+    entries = list(kept)
+    with append_artifact(saved_data_path, sum(entry['rows'] for entry in kept),
+                         compression) as writer:
+        for cleaned in _clean_in_order(new_frames(), True, resolve_workers(workers)):
+            write_row_group(writer, to_table(cleaned))
+            entries.append({'sha256': new_digests[len(entries) - len(kept)],
+                            'rows': len(cleaned)})
+    incremental.write_manifest(manifest_path, expected, entries)
+    logger.info(f"Kept {len(kept)} raw partitions, cleaned {len(entries) - len(kept)}")
+    return sum(entry['rows'] for entry in entries), len(entries) - len(kept)
+
+
+def load_params(params_path) -> dict:
+    import yaml
+
+    try:
+        with open(params_path) as f:
+            return yaml.safe_load(f) or {}
+    except FileNotFoundError:
+        logger.warning(f"Parameter file not found: {params_path}, using defaults")
+        return {}
+
+
+def main(argv=None):
+    from data_cleaning.artifacts import DEFAULT_COMPRESSION, export_csv, save_artifact
+    from data_cleaning.dtypes import log_memory, to_cleaned_dtypes
+    from data_cleaning.incremental import reset_manifest
+
+    parser = argparse.ArgumentParser(description="DVC data_cleaning stage")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="clean every raw partition in the incremental mode")
+    args = parser.parse_args(argv)
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(
+        logging.Formatter(fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    # the stage owns its process: pandas 3 semantics, copies deferred until a write
+    pd.set_option('mode.copy_on_write', True)
+
+    root_path = Path(__file__).resolve().parent.parent.parent
+    data_load_path = root_path / "data" / "raw" / "swiggy.csv"
+    cleaned_data_save_dir = root_path / "data" / "cleaned"
+    cleaned_data_save_dir.mkdir(exist_ok=True, parents=True)
+    cleaned_data_save_path = cleaned_data_save_dir / "swiggy_cleaned.parquet"
+    manifest_path = cleaned_data_save_dir / "manifest.json"
+
+    all_params = load_params(root_path / "params.yaml")
+    params = all_params.get('data_cleaning') or {}
+    artifact_params = all_params.get('artifacts') or {}
+    chunk_size = params.get('chunk_size')
+    workers = resolve_workers(params.get('workers', 1))
+    compression = artifact_params.get('compression') or DEFAULT_COMPRESSION
+
+    if params.get('incremental'):
+        partition_rows = params.get('partition_rows') or 10000
+        logger.info(f"Starting incremental data cleaning in partitions of {partition_rows} rows")
+        rows, _ = clean_csv_incrementally(data_load_path, cleaned_data_save_path, manifest_path,
+                                          partition_rows, workers=workers,
+                                          compression=compression, rebuild=args.rebuild)
+        if artifact_params.get('csv_export'):
+            export_csv(cleaned_data_save_path)
+    elif chunk_size:
+        reset_manifest(manifest_path)
+        logger.info(f"Starting data cleaning in chunks of {chunk_size} rows, {workers} worker(s)")
+        rows = clean_csv_in_chunks(data_load_path, cleaned_data_save_path, chunk_size,
+                                   workers=workers, compression=compression)
+        if artifact_params.get('csv_export'):
+            export_csv(cleaned_data_save_path)
+    else:
+        reset_manifest(manifest_path)
+        df = load_data(data_load_path)
+        logger.info(f"Starting data cleaning, {workers} worker(s)")
+        if workers > 1:
+            cleaned_data = perform_data_cleaning_parallel(df, workers, training=True)
+        else:
+            cleaned_data = perform_data_cleaning(df, training=True)
+        log_memory("Cleaned data", cleaned_data, to_cleaned_dtypes(cleaned_data))
+        save_artifact(cleaned_data, cleaned_data_save_path, compression,
+                      csv_export=artifact_params.get('csv_export', False))
+        rows = len(cleaned_data)
+    logger.info(f"Cleaned data ({rows} rows) saved to {cleaned_data_save_path}")
@@ -0,0 +1,160 @@
+"""Record-level counterpart of `perform_data_cleaning` for the online prediction path.
+
+Builds the cleaned feature row of a single validated `Data` record with plain Python,
+reproducing the pandas pipeline in data_cleaning.pipeline value for value.
+"""
+
+import math
+from datetime import datetime
+
+from data_cleaning.binning import distance_type, time_slot
+from data_cleaning.geospatial import record_distances
+from data_cleaning.time_parsing import SECONDS_PER_DAY, parse_day_first_date, parse_time_of_day
+
+NAN = float("nan")
+
+# values the pandas pipeline turns into NaN with its frame-wide replace
+MISSING_TOKENS = frozenset(['NaN ', ' nan', '', 'NaN', 'None', ' null'])
+WEATHER_MISSING_TOKENS = frozenset(['nan', '', ' nan', 'NaN', 'None', 'null'])
+WEEKEND_DAYS = frozenset(['Saturday', 'Sunday'])
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# column order produced by perform_data_cleaning for a raw (target-less) record
+CLEANED_COLUMNS = [
+    'person_age', 'person_ratings', 'weather_condition', 'traffic_density',
+    'vehicle_condition', 'order_type', 'vehicle_type', 'multiple_deliveries', 'festival',
+    'city', 'city_name', 'day_of_week', 'is_weekend', 'pickup_time_in_minutes', 'time_slot',
+    'distance', 'distance_type'
+]
+
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _value(record: dict, key: str):
+    value = record.get(key)
+    if isinstance(value, str) and value in MISSING_TOKENS:
+        return NAN
+    return value
+
+
+def _as_str(value) -> str:
+    """Mimic `Series.astype(str)`, which renders missing values as 'nan'."""
+    return 'nan' if _is_missing(value) else str(value)
+
+
+def parse_order_date(value):
+    """Order date as a datetime (day first), None when missing; datetimes pass through."""
+    if _is_missing(value):
+        return None
+    if isinstance(value, datetime):
+        return value
+    return parse_day_first_date(value)
+
+
+def seconds_of_day(value):
+    """Seconds since midnight of an order/pickup time string, None when missing.
+
+    Integers are taken as already parsed seconds.
+    """
+    if _is_missing(value):
+        return None
+    if isinstance(value, int):
+        return value
+    return parse_time_of_day(value)
+
+
+def normalize_weather(value):
+    """'conditions Sunny' -> 'sunny', NaN for the missing tokens."""
+    weather = _as_str(value).replace('conditions', '').lower().strip()
+    return NAN if weather in WEATHER_MISSING_TOKENS else weather
+
+
+def normalize_traffic(value) -> str:
+    return _as_str(value).lower().strip()
+
+
+def normalize_label(value) -> str:
+    """Vehicle type, festival and city labels: trailing blanks removed, lower case."""
+    return _as_str(value).rstrip().lower()
+
+
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Scalar reference formula; `clean_record` takes its distance from the geospatial kernel."""
+    lon1, lat1, lon2, lat2 = map(math.radians, [lon1, lat1, lon2, lat2])
+    a = math.sin((lat2 - lat1) / 2.0)**2 + \
+        math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2.0)**2
+    return 6371 * (2 * math.asin(math.sqrt(a)))
+
+
+def _coordinate(value, threshold: float = 1) -> float:
+    value = abs(float(value))
+    return NAN if value < threshold else value
+
+
+def clean_record(record: dict, distance: float = None):
+    """Clean one raw order record (a `Data` dict) into a model feature row.
+
+    Also accepts the pre-coerced records of serving.schema.validate_batch, whose
+    numbers, dates, times and labels are already parsed and normalized. `distance`
+    is the record's distance when already computed for its batch by
+    `geospatial.record_distances`; otherwise it is computed by the same kernel, so a
+    record cleans to the same row alone as in any batch.
+
+    Returns None when the pandas pipeline would drop the row (underage delivery
+    person or a rating above 5). Missing values are NaN, as in the pandas output.
+    """
+    # filters are evaluated on the raw strings, before the missing-token replace
+    if float(record['Delivery_person_Age']) < 18 or float(record['Delivery_person_Ratings']) > 5:
+        return None
+
+    person_age = float(_value(record, 'Delivery_person_Age'))
+    person_ratings = float(_value(record, 'Delivery_person_Ratings'))
+
+    weather = normalize_weather(_value(record, 'Weatherconditions'))
+
+    delivery_id = _value(record, 'Delivery_person_ID')
+    city_name = delivery_id.split('RES')[0] if isinstance(delivery_id, str) else NAN
+
+    order_date = parse_order_date(_value(record, 'Order_Date'))
+    day_of_week = DAY_NAMES[order_date.weekday()] if order_date is not None else NAN
+
+    order_seconds = seconds_of_day(_value(record, 'Time_Orderd'))
+    picked_seconds = seconds_of_day(_value(record, 'Time_Order_picked'))
+    if order_seconds is None or picked_seconds is None:
+        pickup_time_in_minutes = NAN
+    else:
+        # Timedelta.seconds wraps negative differences (pickup after midnight)
+        pickup_time_in_minutes = ((picked_seconds - order_seconds) % SECONDS_PER_DAY) / 60
+    order_hour = order_seconds // 3600 if order_seconds is not None else None
+
+    multiple_deliveries = _value(record, 'multiple_deliveries')
+
+    if distance is None:
+        distance = float(record_distances([record])[0])
+
+    return {
+        'person_age': person_age,
+        'person_ratings': person_ratings,
+        'weather_condition': weather,
+        'traffic_density': normalize_traffic(_value(record, 'Road_traffic_density')),
+        'vehicle_condition': _value(record, 'Vehicle_condition'),
+        'order_type': _value(record, 'Type_of_order'),
+        'vehicle_type': normalize_label(_value(record, 'Type_of_vehicle')),
+        'multiple_deliveries': float(multiple_deliveries),
+        'festival': normalize_label(_value(record, 'Festival')),
+        'city': normalize_label(_value(record, 'City')),
+        'city_name': city_name,
+        'day_of_week': day_of_week,
+        'is_weekend': int(day_of_week in WEEKEND_DAYS),
+        'pickup_time_in_minutes': pickup_time_in_minutes,
+        'time_slot': time_slot(order_hour),
+        'distance': distance,
+        'distance_type': distance_type(distance),
+    }
+
+
+def is_complete(row: dict) -> bool:
+    """True when the cleaned row has no missing values (the `.dropna()` of the serving path)."""
+    return all(not _is_missing(value) for value in row.values())
@@ -0,0 +1,87 @@
+"""Order date and time parsing shared by the batch cleaning and the online path.
+
+The raw data only uses DD-MM-YYYY dates and HH:MM[:SS] times, with a few hundred
+distinct dates and a few thousand distinct times. Each distinct string is parsed once
+with an explicit fast path and memoized; values in any other format fall back to
+pandas with the same settings as the original `pd.to_datetime` calls.
+
+numpy and pandas are imported on first use, the scalar parsers of the record-level
+cleaner do not need them for the known formats.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+SECONDS_PER_DAY = 86400
+
+
+@lru_cache(maxsize=4096)
+def parse_day_first_date(value: str) -> datetime:
+    """Date of a 'DD-MM-YYYY' string, other layouts parsed by pandas with dayfirst=True."""
+    parts = value.split('-')
+    if len(parts) == 3 and len(parts[2]) == 4 and all(part.isdigit() for part in parts):
+        try:
+            return datetime(int(parts[2]), int(parts[1]), int(parts[0]))
+        except ValueError:
+            pass
+    import pandas as pd
+    return pd.to_datetime(value, dayfirst=True).to_pydatetime()
+
+
+@lru_cache(maxsize=16384)
+def parse_time_of_day(value: str) -> int:
+    """Seconds since midnight of an 'HH:MM[:SS]' string, other layouts parsed by pandas."""
+    parts = value.split(':')
+    if 2 <= len(parts) <= 3 and all(part.isdigit() for part in parts):
+        hours, minutes = int(parts[0]), int(parts[1])
+        seconds = int(parts[2]) if len(parts) == 3 else 0
+        if hours < 24 and minutes < 60 and seconds < 60:
+            return hours * 3600 + minutes * 60 + seconds
+    import pandas as pd
+    parsed = pd.to_datetime(value, format='mixed')
+    return parsed.hour * 3600 + parsed.minute * 60 + parsed.second
+
+
+def parse_date_column(values: pd.Series) -> pd.Series:
+    """datetime64 column of day-first date strings, NaT where missing."""
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(values)
+    # code -1 (missing) picks the trailing NaT
+    parsed = np.array([parse_day_first_date(value) for value in uniques] + [None],
+                      dtype='datetime64[ns]')
+    return pd.Series(parsed[codes], index=values.index, name=values.name)
+
+
+def parse_time_column(values: pd.Series) -> np.ndarray:
+    """Seconds since midnight (float) of time strings, NaN where missing."""
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(values)
+    parsed = np.array([parse_time_of_day(value) for value in uniques] + [np.nan], dtype=float)
+    return parsed[codes]
+
+
+def format_time_column(seconds: np.ndarray) -> np.ndarray:
+    """'HH:MM:SS' strings of seconds since midnight, NaN kept (strftime of the parsed times)."""
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(seconds)
+    labels = np.array([f"{int(s) // 3600:02d}:{int(s) // 60 % 60:02d}:{int(s) % 60:02d}"
+                       for s in uniques] + [np.nan], dtype=object)
+    return labels[codes]
+
+
+def pickup_minutes(order_seconds: np.ndarray, picked_seconds: np.ndarray) -> np.ndarray:
+    """Minutes from order to pickup; a pickup after midnight wraps like Timedelta.seconds."""
+    return ((picked_seconds - order_seconds) % SECONDS_PER_DAY) / 60
@@ -4,9 +4,22 @@ import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from pathlib import Path
+import argparse
 import logging
 import yaml
 import os
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data_cleaning import artifacts, dtypes, incremental
+from data_cleaning.artifacts import (CLEANED_SCHEMA, DEFAULT_COMPRESSION, append_artifact,
+                                     export_csv, open_artifact_writer, read_artifact,
+                                     save_artifact, write_row_group)
+from data_cleaning.dtypes import ORDER_KEY, memory_mb
 
 # -------------------- Logging Setup --------------------
 
@@ -26,10 +39,10 @@ if not logger.hasHandlers():
 # -------------------- Function to Load Dataset --------------------
 
 def load_data(data_path: str) -> pd.DataFrame:
-    """Load data from the specified CSV file path"""
+    """Load data from the specified Parquet artifact path"""
     try:
-        df = pd.read_csv(data_path)
-        logger.info(f'Data loaded successfully from {data_path}')
+        df = read_artifact(data_path)
+        logger.info(f'Data loaded successfully from {data_path} ({memory_mb(df):.1f} MB)')
         return df
     except FileNotFoundError:
         logger.error(f"File not found: {data_path}")
@@ -64,14 +77,112 @@ def split_data(data: pd.DataFrame, test_size: float, random_state: int):
     except Exception as e:
         logger.exception("Error while splitting data")
 
+# -------------------- Hash-Based Split --------------------
+
+def hash_test_mask(data: pd.DataFrame, test_size: float, random_state: int) -> np.ndarray:
+    """True for the rows of `data` that belong to the test set.
+
+    Each row is assigned by its `ORDER_KEY` salted with `random_state` and hashed, so
+    an order keeps its side whatever other rows the data holds, how it is chunked or
+    how its other columns are cleaned.
+    """
+    keys = data[ORDER_KEY].to_numpy(dtype=np.int64).view(np.uint64)
+    hashes = pd.util.hash_array(keys ^ np.uint64(random_state))
+    # top 53 bits as a uniform fraction in [0, 1)
+    return (hashes >> np.uint64(11)) / float(2**53) < test_size
+
+
+def split_table(table: pa.Table, test_size: float, random_state: int):
+    """(train, test) rows of an artifact table by `hash_test_mask`."""
+    test = hash_test_mask(table.select([ORDER_KEY]).to_pandas(), test_size, random_state)
+    return table.filter(pa.array(~test)), table.filter(pa.array(test))
+
+
+def split_artifact_by_hash(data_path, save_path: Path, test_size: float, random_state: int,
+                           chunk_size: int = 100_000, compression: str = DEFAULT_COMPRESSION,
+                           csv_export: bool = False):
+    """Stream the cleaned artifact into train and test artifacts by `hash_test_mask`.
+
+    Reads and writes `chunk_size` rows at a time. Returns the train and test row counts.
+    """
+    logger.info(f"Hash-splitting {data_path} in chunks of {chunk_size} rows")
+    rows = {'train': 0, 'test': 0}
+    paths = {name: save_path / f'{name}_data.parquet' for name in rows}
+    writers = {name: open_artifact_writer(path, compression) for name, path in paths.items()}
+    try:
+        for batch in pq.ParquetFile(data_path).iter_batches(batch_size=chunk_size):
+            # the rows are already typed: only the dictionary indices Parquet widened
+            # to int32 are cast back, without a round trip through the dtype plan
+            table = pa.Table.from_batches([batch]).cast(CLEANED_SCHEMA)
+            for name, part in zip(rows, split_table(table, test_size, random_state)):
+                writers[name].write_table(part)
+                rows[name] += part.num_rows
+    finally:
+        for writer in writers.values():
+            writer.close()
+    logger.info(f"Train and test data ({rows['train']} and {rows['test']} rows) saved to {save_path}")
+    if csv_export:
+        for path in paths.values():
+            export_csv(path)
+    return rows['train'], rows['test']
+
+def split_incrementally(data_path, cleaned_manifest: dict, save_path: Path, test_size: float,
+                        random_state: int, compression: str = DEFAULT_COMPRESSION,
+                        rebuild: bool = False):
+    """Hash-split only the cleaned partitions missing from the interim manifest, appending them.
+
+    `cleaned_manifest` is the manifest of the incremental data_cleaning stage, whose
+    artifact holds one row group per non-empty raw partition. Returns the train and
+    test row counts and the number of partitions split in this run.
+    """
+    train_path, test_path = save_path / 'train_data.parquet', save_path / 'test_data.parquet'
+    manifest_path = save_path / 'manifest.json'
+    expected = incremental.fingerprint(
+        [__file__, artifacts.__file__, dtypes.__file__], test_size=test_size,
+        random_state=random_state, compression=compression,
+        cleaned=cleaned_manifest['fingerprint'])
+    previous = [] if rebuild or not (train_path.exists() and test_path.exists()) else \
+        incremental.read_manifest(manifest_path, expected)
+
+    partitions = cleaned_manifest['partitions']
+    kept = incremental.matching_prefix(previous, [partition['sha256'] for partition in partitions])
+    entries = previous[:kept]
+    train_rows = sum(entry['train_rows'] for entry in entries)
+    test_rows = sum(entry['test_rows'] for entry in entries)
+    if previous and kept == len(previous) == len(partitions):
+        logger.info("No new cleaned partitions, the train and test data are up to date")
+        return train_rows, test_rows, 0
+
+    source = pq.ParquetFile(data_path)
+    group = sum(1 for partition in partitions[:kept] if partition['rows'])
+    with append_artifact(train_path, train_rows, compression) as train_writer, \
+            append_artifact(test_path, test_rows, compression) as test_writer:
+        for partition in partitions[kept:]:
+            if partition['rows']:
+                table = source.read_row_group(group).cast(CLEANED_SCHEMA)
+                group += 1
+            else:
+                table = CLEANED_SCHEMA.empty_table()
+            train, test = split_table(table, test_size, random_state)
+            write_row_group(train_writer, train)
+            write_row_group(test_writer, test)
+            entries.append({'sha256': partition['sha256'], 'train_rows': train.num_rows,
+                            'test_rows': test.num_rows})
+            train_rows, test_rows = train_rows + train.num_rows, test_rows + test.num_rows
+    incremental.write_manifest(manifest_path, expected, entries)
+    logger.info(f"Kept {kept} cleaned partitions, split {len(entries) - kept}: "
+                f"{train_rows} train and {test_rows} test rows")
+    return train_rows, test_rows, len(entries) - kept
+
 # -------------------- Function to Save Dataset --------------------
 
-def save_data(train_data: pd.DataFrame, test_data: pd.DataFrame, save_path: Path):
-    """Save train_data and test_data to specified path"""
+def save_data(train_data: pd.DataFrame, test_data: pd.DataFrame, save_path: Path,
+              compression: str = DEFAULT_COMPRESSION, csv_export: bool = False):
+    """Save train_data and test_data as Parquet artifacts to specified path"""
     try:
         logger.info(f"Saving data to directory: {save_path}")
-        train_data.to_csv(save_path / 'train_data.csv', index=False)
-        test_data.to_csv(save_path / 'test_data.csv', index=False)
+        save_artifact(train_data, save_path / 'train_data.parquet', compression, csv_export)
+        save_artifact(test_data, save_path / 'test_data.parquet', compression, csv_export)
         logger.info("Train and test data saved successfully")
     except Exception as e:
         logger.exception('Error while saving datasets')
@@ -102,7 +213,11 @@ def get_root_directory() -> Path:
 
 # -------------------- Main Function --------------------
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DVC data_processing stage")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="split every cleaned partition in the incremental mode")
+    args = parser.parse_args(argv)
     try:
         # Get current and root directories
         current_dir = Path(__file__).resolve()
@@ -110,16 +225,10 @@ def main():
         print(root_dir)
 
         # Define paths
-        data_path = root_dir/ 'data' / 'cleaned' / 'swiggy_cleaned.csv'
+        data_path = root_dir/ 'data' / 'cleaned' / 'swiggy_cleaned.parquet'
         params_path = root_dir / 'params.yaml'
         save_path = root_dir / 'data' / 'interim'
 
-        # Load data
-        data = load_data(str(data_path))
-        if data.empty:
-            logger.warning("Data is empty. Exiting.")
-            return
-
         # Load parameters
         params = load_params(str(params_path))
         if not params or 'data_preparation' not in params:
@@ -128,15 +237,49 @@ def main():
 
         test_size = params['data_preparation'].get('test_size', 0.2)
         random_state = params['data_preparation'].get('random_state', 42)
-
-        # Split data
-        train_data, test_data = split_data(data, test_size=test_size, random_state=random_state)
+        split = params['data_preparation'].get('split', 'random')
+        artifact_params = params.get('artifacts') or {}
+        compression = artifact_params.get('compression') or DEFAULT_COMPRESSION
+        csv_export = artifact_params.get('csv_export', False)
 
         # Ensure save directory exists
         ensure_directory_exists(save_path)
 
+        manifest_path = save_path / 'manifest.json'
+        if params['data_preparation'].get('incremental'):
+            if split != 'hash':
+                logger.error("The incremental mode needs split: hash. Exiting.")
+                return
+            cleaned_manifest = incremental.load_manifest(data_path.parent / 'manifest.json')
+            if cleaned_manifest is not None:
+                split_incrementally(data_path, cleaned_manifest, save_path, test_size,
+                                    random_state, compression=compression, rebuild=args.rebuild)
+                if csv_export:
+                    export_csv(save_path / 'train_data.parquet')
+                    export_csv(save_path / 'test_data.parquet')
+                return
+            logger.warning("The cleaned data has no manifest (data_cleaning.incremental is off), "
+                           "splitting it all")
+
+        incremental.reset_manifest(manifest_path)
+        if split == 'hash':
+            split_artifact_by_hash(data_path, save_path, test_size, random_state,
+                                   chunk_size=params['data_preparation'].get('chunk_size', 100_000),
+                                   compression=compression, csv_export=csv_export)
+            return
+
+        # Load data
+        data = load_data(str(data_path))
+        if data.empty:
+            logger.warning("Data is empty. Exiting.")
+            return
+
+        # Split data
+        train_data, test_data = split_data(data, test_size=test_size, random_state=random_state)
+
         # Save datasets
-        save_data(train_data, test_data, save_path)
+        save_data(train_data, test_data, save_path, compression=compression,
+                  csv_export=csv_export)
 
     except Exception as e:
         logger.exception('Error during the data preparation process')
@@ -145,5 +288,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-     
-        
\ No newline at end of file
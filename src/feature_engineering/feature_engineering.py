@@ -8,6 +8,14 @@ import logging
 import pickle
 import yaml
 import os
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from data_cleaning.artifacts import read_artifact
+from data_cleaning.binning import DISTANCE_ORDER, TRAFFIC_ORDER
+from data_cleaning.dtypes import ORDER_KEY, memory_mb
+from feature_engineering.feature_matrix import save_feature_matrix
 
 # Set sklearn transformer output to pandas DataFrame
 set_config(transform_output='pandas')
@@ -17,8 +25,9 @@ num_cols = ['person_age', 'person_ratings', 'pickup_time_in_minutes', 'distance'
 num_cat_cols = ['weather_condition', 'order_type', 'vehicle_type', 'multiple_deliveries', 'city', 'festival',
                 'city_name','time_slot']
 ordinal_cat_cols = ['traffic_density', 'distance_type']
-traffic_order = ['medium', 'high', 'jam', 'low']
-distance_order = ['short', 'medium', 'long', 'very long']
+# category orders shared with the cleaning bins
+traffic_order = TRAFFIC_ORDER
+distance_order = DISTANCE_ORDER
 
 target_column = ['time_taken']
 
@@ -34,11 +43,11 @@ logger.addHandler(handler)
 
 
 def load_data(data_path: str) -> pd.DataFrame:
-    """Load CSV data from path."""
+    """Load a Parquet artifact from path."""
     try:
         logger.info(f"Loading data from: {data_path}")
-        df = pd.read_csv(data_path)
-        logger.info(f"Data loaded successfully with shape: {df.shape}")
+        df = read_artifact(data_path)
+        logger.info(f"Data loaded successfully with shape: {df.shape} ({memory_mb(df):.1f} MB)")
         return df
     except FileNotFoundError:
         logger.error(f"File not found: {data_path}")
@@ -73,8 +82,8 @@ def drop_missing_values(data: pd.DataFrame) -> pd.DataFrame:
 def apply_transformation(train_data: pd.DataFrame):
     """Apply transformation using ColumnTransformer and return X, y."""
     logger.info("Starting transformation process...")
-    # Drop target column to get features
-    x_train = train_data.drop(columns=target_column)
+    # Drop the target and the split key to get features
+    x_train = train_data.drop(columns=target_column + [ORDER_KEY])
     y_train = train_data[target_column]
 
     preprocessor = ColumnTransformer(
@@ -124,7 +133,7 @@ def main():
     # Paths
     root_dir = get_root_directory()
     param_path = os.path.join(root_dir, 'params.yaml')
-    train_path = os.path.join(root_dir, 'data/interim/train_data.csv')
+    train_path = os.path.join(root_dir, 'data/interim/train_data.parquet')
     processed_data_dir = os.path.join(root_dir, 'data/processed')
 
     # Load params and data
@@ -140,11 +149,8 @@ def main():
     # Save preprocessed data and preprocessor
     ensure_directory_exists(processed_data_dir)
 
-    # Save transformed features and target
-    with open(os.path.join(processed_data_dir, 'x_train_trans.csv'), 'wb') as f:
-        pickle.dump(x_train_trans, f)
-    with open(os.path.join(processed_data_dir, 'y_train.csv'), 'wb') as f:
-        pickle.dump(y_train, f)
+    # Save transformed features and target as memory-mappable arrays
+    save_feature_matrix(processed_data_dir, x_train_trans, y_train, preprocessor)
     with open(os.path.join(root_dir, 'preprocessor.pkl'), 'wb') as f:
         pickle.dump(preprocessor, f)
 
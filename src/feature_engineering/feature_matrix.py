@@ -0,0 +1,68 @@
+"""Memory-mappable training matrices passed from feature_engineering to model_building.
+
+The transformed features are one C-contiguous float32 .npy file and the target
+another, next to a JSON sidecar with the column names and the fitted preprocessor's
+encoder metadata, as compiled_model.py stores the trees. `load_feature_matrix` opens
+the arrays with `mmap_mode`: loading reads only the headers, and trainings on one
+machine share the page cache instead of each unpickling a private copy.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FEATURES_FILE = 'x_train.npy'
+TARGET_FILE = 'y_train.npy'
+META_FILE = 'features.json'
+
+
+def encoder_metadata(preprocessor) -> list:
+    """Input columns, output features and categories of each fitted ColumnTransformer step."""
+    features = preprocessor.get_feature_names_out()
+    steps = []
+    for name, transformer, columns in preprocessor.transformers_:
+        if transformer == 'drop' or name not in preprocessor.output_indices_:
+            continue
+        step = {'name': name, 'columns': [str(column) for column in columns],
+                'features': features[preprocessor.output_indices_[name]].tolist()}
+        if hasattr(transformer, 'categories_'):
+            step['categories'] = [[str(category) for category in categories]
+                                  for categories in transformer.categories_]
+        steps.append(step)
+    return steps
+
+
+def save_feature_matrix(directory, x: pd.DataFrame, y: pd.DataFrame, preprocessor=None):
+    """Save the features as float32 and the target in its own dtype, plus the sidecar.
+
+    The feature file is filled one column at a time, without a float64 copy of `x`.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    features = np.lib.format.open_memmap(directory / FEATURES_FILE, mode='w+',
+                                         dtype=np.float32, shape=x.shape)
+    for j in range(x.shape[1]):
+        features[:, j] = x.iloc[:, j].to_numpy(dtype=np.float32)
+    features.flush()
+    del features
+    np.save(directory / TARGET_FILE, np.ascontiguousarray(y.to_numpy()))
+
+    meta = {
+        'features': [str(column) for column in x.columns],
+        'target': [str(column) for column in y.columns],
+        'rows': len(x),
+        'transformers': encoder_metadata(preprocessor) if preprocessor is not None else [],
+    }
+    (directory / META_FILE).write_text(json.dumps(meta, indent=1))
+
+
+def load_feature_matrix(directory, mmap_mode: str = 'r'):
+    """(x, y) DataFrames over the memory-mapped arrays, with their saved column names."""
+    directory = Path(directory)
+    meta = json.loads((directory / META_FILE).read_text())
+    features = np.load(directory / FEATURES_FILE, mmap_mode=mmap_mode)
+    target = np.load(directory / TARGET_FILE, mmap_mode=mmap_mode)
+    return (pd.DataFrame(features, columns=meta['features'], copy=False),
+            pd.DataFrame(target, columns=meta['target'], copy=False))
@@ -0,0 +1,272 @@
+"""Array-backed inference engine for the stacked RandomForest + LightGBM model.
+
+`compile_model` flattens every tree of the fitted TransformedTargetRegressor built by
+model_training.py into contiguous node arrays and returns a `CompiledModel`, whose
+`predict` evaluates all trees level by level with NumPy, blends them with the
+LinearRegression meta-model and applies the PowerTransformer inverse in one call.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+# missing value handling of a split, following LightGBM's MissingType
+MISSING_NONE, MISSING_ZERO, MISSING_NAN = 0, 1, 2
+# LightGBM treats |x| <= kZeroThreshold as zero
+ZERO_THRESHOLD = 1e-35
+
+FOREST_ARRAYS = ('feature', 'threshold', 'left', 'right', 'value', 'default_left',
+                 'missing_type', 'roots')
+
+
+class CompiledForest:
+    """A tree ensemble stored as flat node arrays.
+
+    Leaves point to themselves, so every tree can be walked for the same number of
+    steps (`depth`) without branching on leaf nodes.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, default_left, missing_type,
+                 roots, depth: int, average: bool, float32_input: bool):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.default_left = default_left
+        self.missing_type = missing_type
+        self.roots = roots
+        self.depth = depth
+        self.average = average
+        self.float32_input = float32_input
+        self.has_zero_missing = bool((missing_type == MISSING_ZERO).any())
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def predict(self, X: np.ndarray, block_size: int = 1024) -> np.ndarray:
+        if self.float32_input:
+            # sklearn trees compare float32 inputs against float64 thresholds
+            X = X.astype(np.float32)
+        X = np.asarray(X, dtype=np.float64)
+        out = np.empty(X.shape[0], dtype=np.float64)
+        for start in range(0, X.shape[0], block_size):
+            block = X[start:start + block_size]
+            values = self.value[self._leaves(block)]
+            out[start:start + block_size] = values.mean(axis=1) if self.average \
+                else values.sum(axis=1)
+        return out
+
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.n_trees))
+        check_missing = self.has_zero_missing or np.isnan(X).any()
+        for _ in range(self.depth):
+            x = X[rows, self.feature[nodes]]
+            go_left = x <= self.threshold[nodes]
+            if check_missing:
+                go_left = self._missing_decision(x, nodes, go_left)
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def _missing_decision(self, x, nodes, go_left):
+        missing_type = self.missing_type[nodes]
+        is_nan = np.isnan(x)
+        # NaN is read as 0.0 unless the split has a dedicated NaN branch
+        x = np.where(is_nan & (missing_type != MISSING_NAN), 0.0, x)
+        go_left = np.where(is_nan, x <= self.threshold[nodes], go_left)
+        use_default = ((missing_type == MISSING_NAN) & is_nan) | \
+            ((missing_type == MISSING_ZERO) & (np.abs(x) <= ZERO_THRESHOLD))
+        return np.where(use_default, self.default_left[nodes], go_left)
+
+
+class CompiledModel:
+    """Stacked tree ensembles + linear meta-model + power-transformed target."""
+
+    def __init__(self, forests, coef, intercept: float, lambdas, target_mean: float,
+                 target_scale: float, method: str, feature_names=None):
+        self.forests = forests
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.lambdas = np.asarray(lambdas, dtype=np.float64)
+        self.target_mean = target_mean
+        self.target_scale = target_scale
+        self.method = method
+        self.feature_names = list(feature_names) if feature_names is not None else None
+
+    def predict(self, X) -> np.ndarray:
+        """Predict delivery times from preprocessed features (array or DataFrame)."""
+        if self.feature_names is not None and hasattr(X, 'columns'):
+            X = X[self.feature_names]
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        blended = np.full(X.shape[0], self.intercept)
+        for forest, weight in zip(self.forests, self.coef):
+            blended += weight * forest.predict(X)
+        return self._inverse_target(blended)
+
+    def _inverse_target(self, y: np.ndarray) -> np.ndarray:
+        y = y * self.target_scale + self.target_mean
+        lmbda = self.lambdas[0]
+        with np.errstate(invalid='ignore'):
+            if self.method == 'box-cox':
+                if lmbda == 0:
+                    return np.exp(y)
+                return np.power(y * lmbda + 1, 1 / lmbda)
+
+            out = np.zeros_like(y)
+            pos = y >= 0
+            if abs(lmbda) < np.spacing(1.0):
+                out[pos] = np.exp(y[pos]) - 1
+            else:
+                out[pos] = np.power(y[pos] * lmbda + 1, 1 / lmbda) - 1
+            if abs(lmbda - 2) > np.spacing(1.0):
+                out[~pos] = 1 - np.power(-(2 - lmbda) * y[~pos] + 1, 1 / (2 - lmbda))
+            else:
+                out[~pos] = 1 - np.exp(-y[~pos])
+        return out
+
+
+def _finalize_forest(nodes, roots, average: bool, float32_input: bool) -> CompiledForest:
+    feature, threshold, left, right, value, default_left, missing_type, depth = nodes
+    return CompiledForest(
+        feature=np.asarray(feature, dtype=np.int32),
+        threshold=np.asarray(threshold, dtype=np.float64),
+        left=np.asarray(left, dtype=np.int32),
+        right=np.asarray(right, dtype=np.int32),
+        value=np.asarray(value, dtype=np.float64),
+        default_left=np.asarray(default_left, dtype=bool),
+        missing_type=np.asarray(missing_type, dtype=np.int8),
+        roots=np.asarray(roots, dtype=np.int32),
+        depth=max(depth),
+        average=average,
+        float32_input=float32_input,
+    )
+
+
+def compile_sklearn_forest(forest) -> CompiledForest:
+    """Flatten a fitted sklearn RandomForestRegressor (or any averaged tree ensemble)."""
+    columns = [[] for _ in range(7)]
+    depths, roots = [], []
+    offset = 0
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        node_ids = np.arange(tree.node_count)
+        is_leaf = tree.children_left == -1
+        columns[0].append(np.where(is_leaf, 0, tree.feature))
+        columns[1].append(np.where(is_leaf, np.inf, tree.threshold))
+        columns[2].append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+        columns[3].append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+        columns[4].append(tree.value[:, 0, 0])
+        missing_left = getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count))
+        columns[5].append(np.asarray(missing_left, dtype=bool))
+        columns[6].append(np.full(tree.node_count, MISSING_NAN))
+        depths.append(tree.max_depth)
+        roots.append(offset)
+        offset += tree.node_count
+    nodes = [np.concatenate(column) for column in columns] + [depths]
+    return _finalize_forest(nodes, roots, average=True, float32_input=True)
+
+
+def compile_lightgbm(model) -> CompiledForest:
+    """Flatten a fitted LGBMRegressor (numerical splits only) from its JSON dump."""
+    booster = model.booster_ if hasattr(model, 'booster_') else model
+    dump = booster.dump_model()
+    missing_types = {'None': MISSING_NONE, 'Zero': MISSING_ZERO, 'NaN': MISSING_NAN}
+    columns = [[] for _ in range(7)]
+    depths, roots = [], []
+
+    def add_node(node, depth):
+        node_id = len(columns[0])
+        for column in columns:
+            column.append(None)
+        if 'leaf_value' in node:
+            values = (0, np.inf, node_id, node_id, node['leaf_value'], False, MISSING_NONE)
+            depths.append(depth)
+        else:
+            if node['decision_type'] != '<=':
+                raise ValueError(f"Unsupported LightGBM split type: {node['decision_type']}")
+            left = add_node(node['left_child'], depth + 1)
+            right = add_node(node['right_child'], depth + 1)
+            values = (node['split_feature'], node['threshold'], left, right, 0.0,
+                      node['default_left'], missing_types[node['missing_type']])
+        for column, val in zip(columns, values):
+            column[node_id] = val
+        return node_id
+
+    for tree in dump['tree_info']:
+        roots.append(add_node(tree['tree_structure'], 0))
+    return _finalize_forest(columns + [depths], roots, average=False, float32_input=False)
+
+
+def compile_estimator(estimator) -> CompiledForest:
+    if hasattr(estimator, 'booster_'):
+        return compile_lightgbm(estimator)
+    if hasattr(estimator, 'estimators_') and hasattr(estimator.estimators_[0], 'tree_'):
+        return compile_sklearn_forest(estimator)
+    raise ValueError(f"Unsupported base estimator: {type(estimator).__name__}")
+
+
+def compile_model(model) -> CompiledModel:
+    """Compile a fitted TransformedTargetRegressor(StackingRegressor, PowerTransformer)."""
+    stacking = model.regressor_
+    transformer = model.transformer_
+    final = stacking.final_estimator_
+    if getattr(stacking, 'passthrough', False):
+        raise ValueError("Stacking with passthrough=True is not supported")
+    if not hasattr(final, 'coef_'):
+        raise ValueError(f"Unsupported meta-model: {type(final).__name__}")
+
+    forests = [compile_estimator(est) for est in stacking.estimators_ if est != 'drop']
+    scaler = transformer._scaler if transformer.standardize else None
+    return CompiledModel(
+        forests=forests,
+        coef=np.ravel(final.coef_),
+        intercept=float(np.ravel(final.intercept_)[0]),
+        lambdas=transformer.lambdas_,
+        target_mean=float(scaler.mean_[0]) if scaler is not None else 0.0,
+        target_scale=float(scaler.scale_[0]) if scaler is not None else 1.0,
+        method=transformer.method,
+        feature_names=getattr(model, 'feature_names_in_', None),
+    )
+
+
+def save_compiled_model(compiled: CompiledModel, directory: Path):
+    """Save a compiled model as one .npy file per node array plus a JSON sidecar."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    forests = []
+    for i, forest in enumerate(compiled.forests):
+        for name in FOREST_ARRAYS:
+            np.save(directory / f"forest{i}_{name}.npy", getattr(forest, name))
+        forests.append({'depth': forest.depth, 'average': forest.average,
+                        'float32_input': forest.float32_input})
+    meta = {
+        'forests': forests,
+        'coef': compiled.coef.tolist(),
+        'intercept': compiled.intercept,
+        'lambdas': compiled.lambdas.tolist(),
+        'target_mean': compiled.target_mean,
+        'target_scale': compiled.target_scale,
+        'method': compiled.method,
+        'feature_names': compiled.feature_names,
+    }
+    with open(directory / 'compiled_model.json', 'w') as f:
+        json.dump(meta, f, indent=4)
+
+
+def load_compiled_model(directory: Path, mmap_mode=None) -> CompiledModel:
+    """Load a model written by `save_compiled_model`, optionally memory-mapping the arrays."""
+    directory = Path(directory)
+    with open(directory / 'compiled_model.json') as f:
+        meta = json.load(f)
+    forests = [
+        CompiledForest(**{name: np.load(directory / f"forest{i}_{name}.npy", mmap_mode=mmap_mode)
+                          for name in FOREST_ARRAYS}, **params)
+        for i, params in enumerate(meta.pop('forests'))
+    ]
+    return CompiledModel(forests=forests, **meta)
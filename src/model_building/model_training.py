@@ -10,9 +10,15 @@ from pathlib import Path
 import logging
 import pickle
 import os
+import sys
 import yaml
 import mlflow
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from model_building.compiled_model import compile_model, save_compiled_model
+from feature_engineering.feature_matrix import load_feature_matrix
+
 #configure logging
 logger=logging.getLogger('model_building')
 logger.setLevel(logging.DEBUG)
@@ -28,22 +34,6 @@ logger.addHandler(file_handler)
 formatter=logging.Formatter(fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 file_handler.setFormatter(formatter)
 
-def load_data(file_path):
-    """
-    Load a single pickle file.
-
-   
-    """
-    try:
-        logger.info(f"Loading data from: {file_path}")
-        with open(file_path, 'rb') as f:
-            data = pickle.load(f)
-        logger.info(f"Loaded data successfully from: {file_path}")
-        return data
-    except Exception as e:
-        logger.error(f"Error loading pickle file at {file_path}: {e}")
-        raise
-
 def load_params(params_path: str):
     """
     Load parameters from a pickle file.
@@ -109,11 +99,11 @@ def main():
     lgbm_params=params['model_building']['lgbm_params']
 
     
-    x_train_path = root_dir / "data" / "processed" / "x_train_trans.csv"
-    y_train_path = root_dir / "data" / "processed" / "y_train.csv"
-
-    x_train = load_data(x_train_path)
-    y_train = load_data(y_train_path)
+    # memory-mapped: no load time, and the pages are shared with other trainings
+    processed_dir = root_dir / "data" / "processed"
+    logger.info(f"Loading the feature matrix from: {processed_dir}")
+    x_train, y_train = load_feature_matrix(processed_dir)
+    logger.info(f"Loaded {x_train.shape[0]} rows x {x_train.shape[1]} features")
 
 
     rf_regressor=RandomForestRegressor(**rf_params)
@@ -131,5 +121,9 @@ def main():
     save_model(model, Path(root_dir / 'model.pkl'))
     save_transformer(transformer,Path(root_dir/'transformer.pkl'))
 
+    #export the flattened trees for the serving engine
+    save_compiled_model(compile_model(model), root_dir / 'compiled_model')
+    logger.info("Compiled model saved successfully.")
+
 if __name__ == "__main__":
     main()
@@ -11,8 +11,14 @@ import mlflow
 from mlflow.models.signature import infer_signature
 import logging
 import os
+import sys
 from dotenv import  load_dotenv
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from data_cleaning.artifacts import read_artifact
+from data_cleaning.dtypes import widen_dtypes
+
 # Configure logging
 logger = logging.getLogger('model_evaluation')
 logger.setLevel(logging.DEBUG)
@@ -66,8 +72,8 @@ def main():
 
         model_path = os.path.join(root_dir,"model.pkl")
         preprocessor_path = os.path.join(root_dir,"preprocessor.pkl")
-        train_data_path = root_dir / 'data' / 'interim' / 'train_data.csv'
-        test_data_path = root_dir / 'data' / 'interim' / 'test_data.csv'
+        train_data_path = root_dir / 'data' / 'interim' / 'train_data.parquet'
+        test_data_path = root_dir / 'data' / 'interim' / 'test_data.parquet'
         params_path = root_dir / 'params.yaml'
 
         # Load all files
@@ -80,8 +86,10 @@ def main():
                 mlflow.log_param(key, value)
                 logger.info('All parameters logged successfully.')
 
-        train_df = pd.read_csv(train_data_path).dropna()
-        test_df = pd.read_csv(test_data_path).dropna()
+        # only the preprocessor inputs and the target are read
+        columns = list(preprocessor.feature_names_in_) + ["time_taken"]
+        train_df = read_artifact(train_data_path, columns=columns).dropna()
+        test_df = read_artifact(test_data_path, columns=columns).dropna()
 
         # Separate features and target
         x_train = train_df.drop(columns=["time_taken"])
@@ -103,15 +111,16 @@ def main():
         logger.info(f"log all metrices successfully")
 
        #change data into mlflow dataframe
-        train_data_input=mlflow.data.from_pandas(train_df.head(20),targets='time_taken')
-        test_data_input=mlflow.data.from_pandas(test_df.head(20),targets='time_taken')
+        # logged samples and the signature take the serving dtypes
+        train_data_input=mlflow.data.from_pandas(widen_dtypes(train_df.head(20)),targets='time_taken')
+        test_data_input=mlflow.data.from_pandas(widen_dtypes(test_df.head(20)),targets='time_taken')
 
             #saving data into mlflow
         mlflow.log_input(dataset=train_data_input,context='training')
         mlflow.log_input(dataset=test_data_input,context='validation')
         logger.info(f"log datasets successfully")
 
-        sample_input = x_train.sample(20, random_state=42)
+        sample_input = widen_dtypes(x_train.sample(20, random_state=42))
         transformed_input=preprocessor.transform(sample_input)
         signature = mlflow.models.infer_signature(model_input=sample_input,
                                                     model_output=model.predict(transformed_input))
@@ -0,0 +1,27 @@
+"""JSON encoding for the serving routes: orjson when it is installed, the json module otherwise."""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with the serving image
+    orjson = None
+
+def loads(data):
+    """Decode JSON from str or bytes, raising json.JSONDecodeError on bad input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj) -> bytes:
+    """Encode to compact UTF-8 JSON bytes, numpy values included."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, separators=(",", ":"), default=_default).encode()
+
+
+def _default(obj):
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
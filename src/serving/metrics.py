@@ -0,0 +1,96 @@
+import os
+import shutil
+import time
+from pathlib import Path
+
+from prometheus_client import (CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge,
+                               Histogram, generate_latest, multiprocess)
+
+# Request-level metrics of the serving app. With several uvicorn workers every worker
+# writes its samples to PROMETHEUS_MULTIPROC_DIR and /metrics aggregates them.
+LATENCY_BUCKETS = (.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+
+request_latency_histogram = Histogram("serving_request_seconds", "End-to-end request latency",
+                                      ["route"], buckets=LATENCY_BUCKETS)
+stage_latency_histogram = Histogram("serving_stage_seconds",
+                                    "Time spent per serving stage, per request or per batch",
+                                    ["stage"], buckets=LATENCY_BUCKETS)
+requests_counter = Counter("serving_requests", "Requests handled", ["route", "status"])
+request_errors_counter = Counter("serving_request_errors", "Requests that did not return 200",
+                                 ["route", "status"])
+record_errors_counter = Counter("serving_record_errors",
+                                "Records answered with an error instead of a prediction", ["stage"])
+model_latency_histogram = Histogram("serving_model_predict_seconds",
+                                    "Preprocessing + prediction time per model call, by model role",
+                                    ["role"], buckets=LATENCY_BUCKETS)
+predictions_counter = Counter("serving_predictions", "Records answered with a prediction")
+in_flight_gauge = Gauge("serving_requests_in_flight", "Requests currently being handled",
+                        ["route"], multiprocess_mode="livesum")
+
+
+def stage_timer(stage: str):
+    """Context manager observing the duration of one serving stage."""
+    return stage_latency_histogram.labels(stage=stage).time()
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware counting requests, errors, latency and in-flight requests per route.
+
+    Plain ASGI instead of BaseHTTPMiddleware, so streamed request and response bodies
+    pass through untouched. Only the listed routes are tracked.
+    """
+
+    def __init__(self, app, routes):
+        self.app = app
+        self.routes = set(routes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.routes:
+            return await self.app(scope, receive, send)
+
+        route = scope["path"]
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight_gauge.labels(route=route).inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight_gauge.labels(route=route).dec()
+            request_latency_histogram.labels(route=route).observe(time.perf_counter() - started)
+            requests_counter.labels(route=route, status=status).inc()
+            if status != 200:
+                request_errors_counter.labels(route=route, status=status).inc()
+
+
+def multiprocess_dir():
+    return os.getenv("PROMETHEUS_MULTIPROC_DIR") or os.getenv("prometheus_multiproc_dir")
+
+
+def prepare_multiprocess_dir(directory: Path):
+    """Point the metrics of worker processes started after this call to an empty directory."""
+    directory = Path(directory)
+    shutil.rmtree(directory, ignore_errors=True)
+    directory.mkdir(parents=True)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(directory)
+
+
+def mark_process_dead():
+    """Drop the live gauges of this worker from the multiprocess aggregate."""
+    if multiprocess_dir():
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def latest_metrics():
+    """Return (body, content type) for /metrics, aggregating all workers when needed."""
+    if multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,148 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Prometheus metrics for tuning the window / batch size against latency
+batch_size_histogram = Histogram("micro_batch_size", "Records scored per micro-batch",
+                                 buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256))
+queue_wait_histogram = Histogram("micro_batch_queue_wait_seconds",
+                                 "Time a request waited for its micro-batch to be flushed",
+                                 buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25))
+flush_counter = Counter("micro_batch_flush", "Micro-batch flushes by trigger", ["reason"])
+window_gauge = Gauge("micro_batch_window_seconds", "Configured micro-batching window",
+                     multiprocess_mode="max")
+max_size_gauge = Gauge("micro_batch_max_size", "Configured maximum micro-batch size",
+                       multiprocess_mode="max")
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """Collects single-record requests into batches scored with one `score_fn` call.
+
+    `score_fn` takes a list of records and returns a list of results aligned with it.
+    A batch is flushed when it reaches `max_batch_size` or when `window_ms` has passed
+    since its first record arrived, whichever comes first. `after_flush()`, when given,
+    runs on the batching thread once a batch's futures are resolved, for work that must
+    not delay the responses.
+    """
+
+    def __init__(self, score_fn, max_batch_size: int = 32, window_ms: float = 5.0,
+                 after_flush=None):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.score_fn = score_fn
+        self.after_flush = after_flush
+        self.max_batch_size = max_batch_size
+        self.window = window_ms / 1000.0
+        self._queue = queue.Queue()
+        self._thread = None
+        # guards _closed and the queue puts, so nothing is queued behind _STOP
+        self._lock = threading.Lock()
+        self._closed = True
+        window_gauge.set(self.window)
+        max_size_gauge.set(self.max_batch_size)
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._closed = False
+                self._thread = threading.Thread(target=self._run, name="micro-batcher",
+                                                daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        """Flush whatever is queued and stop the batching thread.
+
+        Records submitted from now on are refused; any still queued once the thread
+        has exited get a RuntimeError.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        thread.join(timeout)
+        if not thread.is_alive():
+            self._fail_queued(RuntimeError("MicroBatcher stopped"))
+
+    def submit(self, record) -> Future:
+        """Queue one record; the returned future resolves to its own result."""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is not running")
+            self._queue.put((record, future, time.perf_counter()))
+        return future
+
+    def _fail_queued(self, error: Exception):
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(error)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.perf_counter() + self.window
+            reason = "window"
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 \
+                        else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping, reason = True, "shutdown"
+                    break
+                batch.append(item)
+            else:
+                reason = "full"
+            self._flush(batch, reason)
+
+    def _flush(self, batch, reason: str):
+        flushed_at = time.perf_counter()
+        flush_counter.labels(reason=reason).inc()
+        batch_size_histogram.observe(len(batch))
+        for _, _, enqueued_at in batch:
+            queue_wait_histogram.observe(flushed_at - enqueued_at)
+
+        # futures cancelled while queued (a client gone) are dropped; the rest can no
+        # longer be cancelled, so resolving them below cannot raise InvalidStateError
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            results = self.score_fn([record for record, _, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"score_fn returned {len(results)} results "
+                                   f"for {len(batch)} records")
+        except Exception as e:
+            results, error = None, e
+        for i, (_, future, _) in enumerate(batch):
+            try:
+                if results is None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(results[i])
+            except Exception:
+                # one unresolvable future must not stop the batching thread
+                continue
+        if self.after_flush is not None:
+            try:
+                self.after_flush()
+            except Exception as e:
+                print(f"⚠️ Micro-batch after_flush failed: {e}")
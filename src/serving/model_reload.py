@@ -0,0 +1,144 @@
+import json
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+import numpy as np
+from prometheus_client import Counter, Gauge
+
+from serving.metrics import stage_timer
+
+model_info_gauge = Gauge("serving_model_info", "Model version currently served (value 1)",
+                         ["version", "run_id"], multiprocess_mode="liveall")
+model_reloads_counter = Counter("serving_model_reloads", "Hot model reload attempts", ["result"])
+
+
+class ServedModel:
+    """One loaded model version: the compiled predictor, or the MLflow model as fallback.
+
+    Requests take the current ServedModel once and use it throughout, so a reload that
+    swaps in a new version never changes the model under a request that is in flight.
+    """
+
+    def __init__(self, version: str, run_id: str, uri: str, model=None, compiled_predictor=None):
+        if model is None and compiled_predictor is None:
+            raise ValueError("ServedModel needs a model or a compiled predictor")
+        self.version = version
+        self.run_id = run_id
+        self.uri = uri
+        self.model = model
+        self.compiled_predictor = compiled_predictor
+        self.loaded_at = time.time()
+
+    def predict(self, cleaned_data, timed: bool = True) -> np.ndarray:
+        """Preprocess and score cleaned rows, timing both stages unless timed=False."""
+        timer = stage_timer if timed else (lambda stage: nullcontext())
+        if self.compiled_predictor is None:
+            # the MLflow model runs its preprocessor inside predict
+            with timer("prediction"):
+                return np.asarray(self.model.predict(cleaned_data)).ravel()
+        with timer("preprocessing"):
+            features = self.compiled_predictor.preprocessor.transform(cleaned_data)
+        with timer("prediction"):
+            return self.compiled_predictor.compiled.predict(features)
+
+    def info(self) -> dict:
+        return {"version": self.version, "run_id": self.run_id, "uri": self.uri,
+                "compiled": self.compiled_predictor is not None, "loaded_at": self.loaded_at}
+
+
+class ModelInfoSource:
+    """Resolves the model to serve from the run_id in model_info.json."""
+
+    def __init__(self, info_path: Path, model_name: str):
+        self.info_path = Path(info_path)
+        self.model_name = model_name
+
+    def __call__(self):
+        with open(self.info_path) as f:
+            run_id = json.load(f)['run_id']
+        return run_id, run_id, f"runs:/{run_id}/{self.model_name}"
+
+
+class RegistrySource:
+    """Resolves the model to serve from the newest registered version in a stage."""
+
+    def __init__(self, model_name: str, stage: str):
+        self.model_name = model_name
+        self.stage = stage
+
+    def __call__(self):
+        from mlflow import MlflowClient
+
+        versions = MlflowClient().get_latest_versions(self.model_name, stages=[self.stage])
+        if not versions:
+            raise LookupError(f"No version of {self.model_name} in stage {self.stage}")
+        latest = max(versions, key=lambda v: int(v.version))
+        return latest.version, latest.run_id, f"models:/{self.model_name}/{latest.version}"
+
+
+class ModelReloader:
+    """Polls a model source and hot-swaps new versions in, off the request path.
+
+    `source()` returns (version, run_id, uri) of the model that should be served. When
+    the version differs from the served one, the new model is loaded with
+    `load(version, run_id, uri)`, checked with `warm(candidate)` (which returns False
+    when the candidate must not be served) and handed to `swap(candidate)`. Any failure
+    keeps the current model and is retried on the next poll.
+    """
+
+    def __init__(self, source, load, warm, swap, current_version: str, interval: float = 30.0):
+        self.source = source
+        self.load = load
+        self.warm = warm
+        self.swap = swap
+        self.current_version = current_version
+        self.interval = interval
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.interval > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="model-reloader", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self) -> bool:
+        """Reload if the source points to a new version; True when a new model was swapped in."""
+        try:
+            version, run_id, uri = self.source()
+            if version == self.current_version:
+                return False
+            print(f"New model version {version} found, loading {uri}")
+            candidate = self.load(version, run_id, uri)
+            if not self.warm(candidate):
+                raise RuntimeError(f"Warmup of model version {version} failed")
+        except Exception as e:
+            self.last_error = str(e)
+            model_reloads_counter.labels(result="failure").inc()
+            print(f"❌ Model reload failed, still serving version {self.current_version}: {e}")
+            return False
+        self.swap(candidate)
+        self.current_version = version
+        self.last_error = None
+        model_reloads_counter.labels(result="success").inc()
+        print(f"✅ Now serving model version {version}")
+        return True
+
+
+def publish_model_info(served: ServedModel, previous: ServedModel = None):
+    if previous is not None:
+        model_info_gauge.labels(version=previous.version, run_id=previous.run_id).set(0)
+    model_info_gauge.labels(version=served.version, run_id=served.run_id).set(1)
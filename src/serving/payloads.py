@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+
+from serving.codec import loads
+from serving.schema import RAW_COLUMNS, validate_batch
+
+JSON_CONTENT_TYPES = {"application/json"}
+NDJSON_CONTENT_TYPES = {"application/jsonlines", "application/x-ndjson", "application/jsonl",
+                        "application/x-jsonlines"}
+CSV_CONTENT_TYPES = {"text/csv", "application/csv"}
+
+
+class PayloadError(ValueError):
+    """Raised when an /invocations body cannot be decoded for its Content-Type."""
+
+
+class UnsupportedContentType(PayloadError):
+    """Raised when an /invocations body has a Content-Type we do not accept."""
+
+
+def _media_type(content_type: str) -> str:
+    return (content_type or "application/json").split(";")[0].strip().lower()
+
+
+def parse_json(body: str):
+    """Decode a JSON body; a single object is a single record, a list is a batch."""
+    try:
+        payload = loads(body)
+    except json.JSONDecodeError as e:
+        raise PayloadError(f"Invalid JSON body: {e}")
+    if isinstance(payload, dict):
+        return [payload], False
+    if isinstance(payload, list):
+        return payload, True
+    raise PayloadError("JSON body must be an object or a list of objects")
+
+
+def is_ndjson(content_type: str) -> bool:
+    return _media_type(content_type) in NDJSON_CONTENT_TYPES
+
+
+def parse_ndjson(body: str):
+    """Decode a JSON Lines body, one record per non-empty line."""
+    records = []
+    for line_no, line in enumerate(body.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            records.append(loads(line))
+        except json.JSONDecodeError as e:
+            # keep the slot so the response stays aligned with the input lines
+            records.append(PayloadError(f"Invalid JSON on line {line_no}: {e}"))
+    return records, True
+
+
+def parse_csv(body: str):
+    """Decode a CSV body in the raw swiggy.csv column layout.
+
+    The header row is optional (SageMaker Batch Transform splits files by line), rows
+    without one are read positionally and any trailing target column is ignored.
+    """
+    rows = [row for row in csv.reader(io.StringIO(body)) if row]
+    if not rows:
+        return [], True
+    header = [col.strip() for col in rows[0]]
+    if header[0] == RAW_COLUMNS[0]:
+        rows = rows[1:]
+    else:
+        header = RAW_COLUMNS
+    return [dict(zip(header, row)) for row in rows], True
+
+
+def parse_payload(body: bytes, content_type: str):
+    """Decode an /invocations body into raw records according to its Content-Type.
+
+    Returns the list of records and whether the request was a batch request.
+    """
+    media_type = _media_type(content_type)
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError as e:
+        raise PayloadError(f"Body is not valid UTF-8: {e}") from e
+    if media_type in JSON_CONTENT_TYPES:
+        return parse_json(text)
+    if media_type in NDJSON_CONTENT_TYPES:
+        return parse_ndjson(text)
+    if media_type in CSV_CONTENT_TYPES:
+        return parse_csv(text)
+    raise UnsupportedContentType(f"Unsupported Content-Type: {content_type}")
+
+
+def validate_records(records):
+    """Validate raw records against the serving schema.
+
+    Returns a list aligned with the input holding either the typed `Order` or an
+    error message for that row.
+    """
+    return validate_batch(records)
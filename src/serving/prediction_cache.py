@@ -0,0 +1,96 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from prometheus_client import Counter, Gauge
+
+cache_hits_counter = Counter("prediction_cache_hits", "Predictions served from the cache")
+cache_misses_counter = Counter("prediction_cache_misses", "Cleaned rows that had to be scored")
+cache_evictions_counter = Counter("prediction_cache_evictions",
+                                  "Cache entries removed before a lookup hit them", ["reason"])
+cache_size_gauge = Gauge("prediction_cache_entries", "Entries currently held by the prediction cache",
+                         multiprocess_mode="livesum")
+
+
+def row_key(values) -> bytes:
+    """Canonical digest of one cleaned feature row (values in CLEANED_COLUMNS order).
+
+    NumPy scalars are converted to Python ones first, so a row produced by the pandas
+    cleaner hashes the same as the record cleaner's dict row.
+    """
+    canonical = tuple(value.item() if hasattr(value, 'item') else value for value in values)
+    return hashlib.blake2b(repr(canonical).encode(), digest_size=16).digest()
+
+
+class PredictionCache:
+    """Thread-safe LRU cache of predictions with a per-entry time to live.
+
+    Entries belong to the model version that produced them: `set_model_version` drops
+    everything when the version changes, and a `put` computed under an older version is
+    ignored, so a reload racing with a request can never leave stale predictions behind.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 300.0, model_version=None):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.model_version = model_version
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the cached prediction for `key`, or None on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= now:
+                del self._entries[key]
+                self._evicted("expired")
+                entry = None
+            if entry is None:
+                self.misses += 1
+                cache_misses_counter.inc()
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            cache_hits_counter.inc()
+            return entry[0]
+
+    def put(self, key, prediction, model_version=None):
+        if not self.enabled:
+            return
+        with self._lock:
+            if model_version != self.model_version:
+                return
+            self._entries[key] = (prediction, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evicted("capacity")
+            cache_size_gauge.set(len(self._entries))
+
+    def set_model_version(self, model_version):
+        """Switch to a new model version, invalidating the cache if it changed."""
+        with self._lock:
+            if model_version == self.model_version:
+                return
+            self.model_version = model_version
+            dropped = len(self._entries)
+            self._entries.clear()
+            if dropped:
+                self._evicted("invalidated", dropped)
+
+    def _evicted(self, reason: str, count: int = 1):
+        self.evictions += count
+        cache_evictions_counter.labels(reason=reason).inc(count)
+        cache_size_gauge.set(len(self._entries))
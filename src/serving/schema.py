@@ -0,0 +1,221 @@
+from typing import Annotated, Union
+
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
+
+from data_cleaning.record_cleaning import (MISSING_TOKENS, NAN, normalize_label,
+                                           normalize_traffic, normalize_weather,
+                                           parse_order_date, seconds_of_day)
+
+
+# Labels seen in training, after the cleaning normalization
+WEATHER_CONDITIONS = frozenset(['sunny', 'stormy', 'sandstorms', 'cloudy', 'fog', 'windy'])
+TRAFFIC_DENSITIES = frozenset(['low', 'medium', 'high', 'jam'])
+VEHICLE_TYPES = frozenset(['motorcycle', 'scooter', 'electric_scooter', 'bicycle'])
+CITY_TYPES = frozenset(['metropolitian', 'urban', 'semi-urban'])
+
+MISSING_NOTE = "missing tokens such as 'NaN ' mean missing"
+NumberText = Annotated[Union[float, str], Field(description=f"A number or its text; {MISSING_NOTE}")]
+DateText = Annotated[str, Field(description=f"DD-MM-YYYY; {MISSING_NOTE}", examples=["19-03-2022"])]
+TimeText = Annotated[str, Field(description=f"HH:MM or HH:MM:SS; {MISSING_NOTE}",
+                                examples=["11:30:00"])]
+
+
+def _label_field(example: str, allowed):
+    return Field(description=f"One of {', '.join(sorted(allowed))} after normalization; "
+                             f"{MISSING_NOTE}", examples=[example])
+
+
+# Inference input format
+class Data(BaseModel):
+    """One raw order, in the swiggy.csv layout.
+
+    The annotations are the OpenAPI contract of /predict; validation runs the
+    `FIELD_COERCERS` of `validate_batch` only, as /invocations does, and `order` holds
+    the resulting typed `Order`.
+    """
+
+    ID: str
+    Delivery_person_ID: str
+    Delivery_person_Age: NumberText
+    Delivery_person_Ratings: NumberText
+    Restaurant_latitude: float
+    Restaurant_longitude: float
+    Delivery_location_latitude: float
+    Delivery_location_longitude: float
+    Order_Date: DateText
+    Time_Orderd: TimeText
+    Time_Order_picked: TimeText
+    Weatherconditions: Annotated[str, _label_field("conditions Sunny", WEATHER_CONDITIONS)]
+    Road_traffic_density: Annotated[str, _label_field("High ", TRAFFIC_DENSITIES)]
+    Vehicle_condition: Annotated[int, Field(description="An integer; integer-valued floats "
+                                                        "(2.0) and text ('2') are accepted")]
+    Type_of_order: str
+    Type_of_vehicle: Annotated[str, _label_field("motorcycle ", VEHICLE_TYPES)]
+    multiple_deliveries: NumberText
+    Festival: str
+    City: Annotated[str, _label_field("Urban ", CITY_TYPES)]
+
+    _order = PrivateAttr()
+
+    @model_validator(mode='wrap')
+    @classmethod
+    def _validate(cls, values, handler):
+        if isinstance(values, cls):
+            return values
+        order = validate_batch([values])[0]
+        if isinstance(order, str):
+            raise ValueError(order)
+        # the raw values are already of the annotated types, this only builds the model
+        data = handler(order.raw)
+        data._order = order
+        return data
+
+    @property
+    def order(self) -> 'Order':
+        return self._order
+
+
+# Raw swiggy.csv column layout (without the Time_taken(min) target)
+RAW_COLUMNS = list(Data.model_fields)
+
+
+class Order(dict):
+    """A validated order with typed, pre-coerced values, ready for `clean_record`.
+
+    Ages, ratings and delivery counts are floats, the order date a datetime, times are
+    seconds since midnight and labels are normalized; missing values are NaN. `raw`
+    keeps the record in the `Data` layout for the production log.
+    """
+
+    __slots__ = ('raw',)
+
+
+def _string(value) -> str:
+    if not isinstance(value, str):
+        raise ValueError("Input should be a valid string")
+    return value
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _text(value):
+    return _string(value), value
+
+
+def _number_text(value):
+    """Numeric field sent as text (age, ratings, multiple deliveries), NaN when missing."""
+    if _is_number(value):
+        return str(value), float(value)
+    if _string(value) in MISSING_TOKENS:
+        return value, NAN
+    try:
+        return value, float(value)
+    except ValueError:
+        raise ValueError("Input should be a valid number")
+
+
+def _float(value):
+    if not _is_number(value):
+        try:
+            value = float(_string(value))
+        except ValueError:
+            raise ValueError("Input should be a valid number")
+    return float(value), float(value)
+
+
+def _int(value):
+    """An int, or an integer-valued float (2.0) or integer text ('2') as pydantic's lax int mode."""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    elif isinstance(value, str) and value.strip().lstrip('-').isdigit():
+        value = int(value)
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError("Input should be a valid integer")
+    return value, value
+
+
+def _date(value):
+    if _string(value) in MISSING_TOKENS:
+        return value, NAN
+    try:
+        return value, parse_order_date(value)
+    except (ValueError, OverflowError):
+        raise ValueError("Input should be a valid date in DD-MM-YYYY format")
+
+
+def _time(value):
+    if _string(value) in MISSING_TOKENS:
+        return value, NAN
+    try:
+        return value, seconds_of_day(value)
+    except (ValueError, OverflowError):
+        raise ValueError("Input should be a valid time of day")
+
+
+def _label(normalize, allowed):
+    message = f"Input should be one of {', '.join(sorted(allowed))}"
+
+    def coerce(value):
+        label = normalize(NAN if _string(value) in MISSING_TOKENS else value)
+        if not isinstance(label, str) or label == 'nan':
+            return value, NAN
+        if label not in allowed:
+            raise ValueError(message)
+        return value, label
+    return coerce
+
+
+FIELD_COERCERS = {
+    'ID': _text,
+    'Delivery_person_ID': _text,
+    'Delivery_person_Age': _number_text,
+    'Delivery_person_Ratings': _number_text,
+    'Restaurant_latitude': _float,
+    'Restaurant_longitude': _float,
+    'Delivery_location_latitude': _float,
+    'Delivery_location_longitude': _float,
+    'Order_Date': _date,
+    'Time_Orderd': _time,
+    'Time_Order_picked': _time,
+    'Weatherconditions': _label(normalize_weather, WEATHER_CONDITIONS),
+    'Road_traffic_density': _label(normalize_traffic, TRAFFIC_DENSITIES),
+    'Vehicle_condition': _int,
+    'Type_of_order': _text,
+    'Type_of_vehicle': _label(normalize_label, VEHICLE_TYPES),
+    'multiple_deliveries': _number_text,
+    'Festival': _text,
+    'City': _label(normalize_label, CITY_TYPES),
+}
+
+
+def validate_batch(records):
+    """Validate and coerce a list of raw records in one pass.
+
+    Returns a list aligned with `records` holding an `Order` or an error message.
+    Exceptions in `records` (undecodable lines) become their message.
+    """
+    validated = []
+    items = FIELD_COERCERS.items()
+    for record in records:
+        if isinstance(record, Exception):
+            validated.append(str(record))
+            continue
+        if not isinstance(record, dict):
+            validated.append("Record must be a JSON object")
+            continue
+        order, raw, errors = Order(), {}, []
+        for name, coerce in items:
+            try:
+                raw[name], order[name] = coerce(record[name])
+            except KeyError:
+                errors.append(f"{name}: Field required")
+            except ValueError as e:
+                errors.append(f"{name}: {e}")
+        if errors:
+            validated.append("Invalid record: " + "; ".join(errors))
+        else:
+            order.raw = raw
+            validated.append(order)
+    return validated
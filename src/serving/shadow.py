@@ -0,0 +1,94 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from prometheus_client import Counter, Histogram
+
+from serving.metrics import model_latency_histogram
+
+shadow_delta_histogram = Histogram(
+    "shadow_prediction_delta_minutes", "Shadow minus primary predicted delivery time",
+    buckets=(-20, -10, -5, -2, -1, -0.5, 0, 0.5, 1, 2, 5, 10, 20))
+shadow_samples_counter = Counter("shadow_samples", "Sampled scoring calls by outcome", ["result"])
+
+
+class ShadowScorer:
+    """Scores a sample of live traffic with a candidate model on a small bounded pool.
+
+    `submit` is called once the primary predictions are known and only hands the
+    cleaned rows to a pool of `max_workers` threads. When every worker is busy the
+    sample is dropped instead of queued, so the shadow model can never build up a
+    backlog or slow the primary path down. Deltas and latencies go to Prometheus and
+    the rows to `shadow_logger`, a ProductionLogger.
+    """
+
+    def __init__(self, sample_rate: float, max_workers: int = 1, shadow_logger=None):
+        self.sample_rate = sample_rate
+        self.shadow_logger = shadow_logger
+        self.model = None
+        self.error = None
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="shadow")
+        self._slots = threading.BoundedSemaphore(max_workers)
+
+    def load_async(self, load):
+        """Load the shadow model with `load()` in the background, sampling starts once it is ready."""
+        def run():
+            try:
+                self.model = load()
+                print(f"✅ Shadow model {self.model.version} ready, sampling {self.sample_rate:.0%}")
+            except Exception as e:
+                self.error = str(e)
+                print(f"❌ Shadow model could not be loaded: {e}")
+
+        threading.Thread(target=run, name="shadow-loader", daemon=True).start()
+        return self
+
+    def info(self):
+        if self.model is None:
+            return {"status": "failed" if self.error else "loading", "error": self.error}
+        return {"status": "ready", "sample_rate": self.sample_rate, **self.model.info()}
+
+    def submit(self, records, cleaned_data, primary_predictions, primary_version: str) -> bool:
+        """Maybe score `cleaned_data` with the shadow model; True when the sample was taken."""
+        if self.model is None or random.random() >= self.sample_rate:
+            return False
+        if not self._slots.acquire(blocking=False):
+            shadow_samples_counter.labels(result="dropped").inc()
+            return False
+        try:
+            future = self._pool.submit(self._score, records, cleaned_data,
+                                       np.asarray(primary_predictions), primary_version)
+        except RuntimeError:  # pool shut down
+            self._slots.release()
+            return False
+        future.add_done_callback(lambda _: self._slots.release())
+        return True
+
+    def _score(self, records, cleaned_data, primary_predictions, primary_version):
+        model = self.model
+        started = time.perf_counter()
+        try:
+            shadow_predictions = model.predict(cleaned_data, timed=False)
+        except Exception as e:
+            shadow_samples_counter.labels(result="failed").inc()
+            print(f"⚠️ Shadow scoring failed: {e}")
+            return
+        elapsed = time.perf_counter() - started
+        model_latency_histogram.labels(role="shadow").observe(elapsed)
+        shadow_samples_counter.labels(result="scored").inc()
+
+        deltas = shadow_predictions - primary_predictions
+        for delta in deltas:
+            shadow_delta_histogram.observe(delta)
+        if self.shadow_logger is not None:
+            self.shadow_logger.log_many(
+                [{"ID": record.get("ID"), "primary_version": primary_version,
+                  "shadow_version": model.version, "primary_prediction": float(primary),
+                  "delta": float(delta), "shadow_latency_ms": round(elapsed * 1000, 3)}
+                 for record, primary, delta in zip(records, primary_predictions, deltas)],
+                shadow_predictions)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,89 @@
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from model_building.compiled_model import load_compiled_model, save_compiled_model
+
+
+class CompiledPredictor:
+    """Preprocessor + compiled tree engine, predicting from cleaned feature frames.
+
+    `save` writes the node arrays as .npy files next to the pickled preprocessor, and
+    `load(..., mmap_mode="r")` maps them read-only, so every serving worker shares the
+    same physical pages instead of holding its own copy of the trees.
+    """
+
+    def __init__(self, compiled, preprocessor):
+        self.compiled = compiled
+        self.preprocessor = preprocessor
+
+    def predict(self, cleaned_data):
+        return self.compiled.predict(self.preprocessor.transform(cleaned_data))
+
+    def save(self, directory: Path):
+        directory = Path(directory)
+        save_compiled_model(self.compiled, directory)
+        with open(directory / 'preprocessor.pkl', 'wb') as f:
+            pickle.dump(self.preprocessor, f)
+
+    @classmethod
+    def load(cls, directory: Path, mmap_mode=None):
+        directory = Path(directory)
+        with open(directory / 'preprocessor.pkl', 'rb') as f:
+            preprocessor = pickle.load(f)
+        return cls(load_compiled_model(directory, mmap_mode=mmap_mode), preprocessor)
+
+
+SHARED_MODEL_INFO = 'served_model.json'
+
+
+def publish_shared_model(root: Path, version: str, run_id: str, uri: str,
+                         predictor: CompiledPredictor, keep: int = 2) -> Path:
+    """Export `predictor` to a new directory under `root` and point `root` at it.
+
+    Files that workers have mapped are never rewritten: every version gets its own
+    directory, and `served_model.json` is replaced atomically once the export is
+    complete. Only the newest `keep` directories are kept; a worker still mapping a
+    removed one keeps its pages until it remaps.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    # names sort in publication order
+    directory = Path(tempfile.mkdtemp(prefix=f'model-{time.time_ns():020d}-', dir=root))
+    predictor.save(directory)
+    tmp_path = root / (SHARED_MODEL_INFO + '.tmp')
+    tmp_path.write_text(json.dumps({'version': version, 'run_id': run_id, 'uri': uri,
+                                    'directory': directory.name}))
+    os.replace(tmp_path, root / SHARED_MODEL_INFO)
+
+    exported = sorted(root.glob('model-*'))
+    for old in exported[:-keep]:
+        if old != directory:
+            shutil.rmtree(old, ignore_errors=True)
+    return directory
+
+
+class SharedModelSource:
+    """Resolves the model to serve from the version last published under `root`."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def read(self) -> dict:
+        with open(self.root / SHARED_MODEL_INFO) as f:
+            return json.load(f)
+
+    def __call__(self):
+        info = self.read()
+        return info['version'], info['run_id'], info['uri']
+
+    def load(self, version: str, mmap_mode='r') -> CompiledPredictor:
+        """Map the published predictor of `version`, LookupError when another one is published."""
+        info = self.read()
+        if info['version'] != version:
+            raise LookupError(f"Version {info['version']} was published while loading {version}")
+        return CompiledPredictor.load(self.root / info['directory'], mmap_mode=mmap_mode)
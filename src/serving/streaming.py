@@ -0,0 +1,64 @@
+import codecs
+import json
+
+from starlette.responses import StreamingResponse
+
+from serving.codec import loads
+from serving.payloads import PayloadError
+
+
+class NDJSONDecoder:
+    """Incrementally splits a JSON Lines byte stream into records.
+
+    `feed` takes body chunks as they arrive and returns the records of every line they
+    completed, keeping only the unfinished last line buffered. Only the new chunk is
+    split; the pieces of an unfinished line are joined once its newline arrives, so a
+    long line fed in small chunks costs linear time. Lines that are not valid JSON
+    become PayloadError placeholders, like parse_ndjson, so results stay aligned.
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._pending = []
+        self.line_no = 0
+
+    def feed(self, data: bytes):
+        lines = self._decoder.decode(data).split("\n")
+        if len(lines) == 1:
+            self._pending.append(lines[0])
+            return []
+        lines[0] = "".join(self._pending) + lines[0]
+        self._pending = [lines.pop()]
+        return self._parse(lines)
+
+    def close(self):
+        """Return the records of the last line when the body did not end with a newline."""
+        tail = "".join(self._pending) + self._decoder.decode(b"", final=True)
+        self._pending = []
+        return self._parse([tail])
+
+    def _parse(self, lines):
+        records = []
+        for line in lines:
+            self.line_no += 1
+            if not line.strip():
+                continue
+            try:
+                records.append(loads(line))
+            except json.JSONDecodeError as e:
+                records.append(PayloadError(f"Invalid JSON on line {self.line_no}: {e}"))
+        return records
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """StreamingResponse for a generator that is still reading the request body.
+
+    Starlette's StreamingResponse watches for a client disconnect by reading `receive`
+    concurrently, which would swallow request body messages. Here the generator is the
+    only reader and notices a disconnect itself through `request.stream()`.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
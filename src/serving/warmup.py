@@ -0,0 +1,126 @@
+import csv
+import json
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from serving.payloads import parse_payload, validate_records
+from serving.schema import RAW_COLUMNS
+
+
+def load_warmup_records(data_path: Path, limit: int):
+    """Read up to `limit` raw orders from a swiggy.csv-layout file as JSON-ready records."""
+    records = []
+    with open(data_path, newline='') as f:
+        for row in csv.DictReader(f):
+            records.append({col: row[col] for col in RAW_COLUMNS})
+            if len(records) >= limit:
+                break
+    return records
+
+
+class Warmup:
+    """Warms the serving path up with sample orders and tracks readiness for /ping.
+
+    `score_fn` takes validated records and returns one result per record, like
+    serve.score_records, and is called with log=False to keep warmup traffic out of
+    the production log. Requests are replayed through the same payload decoding and
+    validation as /invocations: first one by one, then as a single batch, and finally
+    `latency_samples` more single-record calls are timed as the steady-state latency.
+
+    A failed warmup is retried up to `retries` times, `retry_delay` seconds apart. The
+    server is marked ready even when every attempt failed: nothing else would retry, so
+    /ping would stay unhealthy for the life of the container. The error stays in
+    `report()`.
+    """
+
+    def __init__(self, score_fn, data_path: Path, n_requests: int = 50,
+                 latency_samples: int = 20, retries: int = 2, retry_delay: float = 1.0):
+        self.score_fn = score_fn
+        self.data_path = Path(data_path)
+        self.n_requests = n_requests
+        self.latency_samples = latency_samples
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.status = "pending"
+        self.error = None
+        self.duration = None
+        self.latency_ms = {}
+        self._ready = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def start(self):
+        threading.Thread(target=self.run, name="warmup", daemon=True).start()
+        return self
+
+    def run(self):
+        started = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.retry_delay)
+            if self._attempt():
+                break
+            print(f"❌ Warmup attempt {attempt + 1} of {self.retries + 1} failed: {self.error}")
+        self.duration = time.perf_counter() - started
+        if self.status == "failed":
+            print(f"⚠️ Warmup failed, marking ready without it: {self.error}")
+        else:
+            print(f"✅ Warmup {self.status} in {self.duration:.2f}s, steady-state latency: {self.latency_ms}")
+        self._ready.set()
+
+    def _attempt(self) -> bool:
+        """One warmup run, False when it failed."""
+        self.status = "running"
+        self.error = None
+        try:
+            if self.n_requests <= 0:
+                self.status = "skipped"
+            elif not self.data_path.exists():
+                self.status = "skipped"
+                self.error = f"Warmup data not found: {self.data_path}"
+            else:
+                records = load_warmup_records(self.data_path, self.n_requests)
+                if not records:
+                    raise ValueError(f"No warmup records in {self.data_path}")
+                self._warm(records)
+                self.status = "ready"
+        except Exception as e:
+            self.status = "failed"
+            self.error = str(e)
+            return False
+        return True
+
+    def _invoke(self, body: bytes, content_type: str):
+        records, _ = parse_payload(body, content_type)
+        return self.score_fn(validate_records(records), log=False)
+
+    def _warm(self, records):
+        bodies = [json.dumps(record).encode() for record in records]
+        for body in bodies:
+            self._invoke(body, "application/json")
+        self._invoke(json.dumps(records).encode(), "application/json")
+
+        latencies = []
+        for i in range(self.latency_samples):
+            started = time.perf_counter()
+            self._invoke(bodies[i % len(bodies)], "application/json")
+            latencies.append((time.perf_counter() - started) * 1000)
+        if latencies:
+            self.latency_ms = {
+                "p50": round(float(np.percentile(latencies, 50)), 3),
+                "p99": round(float(np.percentile(latencies, 99)), 3),
+                "mean": round(float(np.mean(latencies)), 3),
+            }
+
+    def report(self) -> dict:
+        return {
+            "status": self.status,
+            "duration_seconds": round(self.duration, 3) if self.duration is not None else None,
+            "steady_state_latency_ms": self.latency_ms,
+            "error": self.error,
+        }
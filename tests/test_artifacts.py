@@ -0,0 +1,76 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / 'src'))
+
+from data_cleaning.artifacts import CLEANED_SCHEMA, export_csv, read_artifact, save_artifact
+from data_cleaning.dtypes import widen_dtypes
+
+cleaned = pd.DataFrame({
+    'person_age': [37.0, np.nan, 25.0],
+    'person_ratings': [4.9, 4.5, np.nan],
+    'weather_condition': ['sunny', np.nan, 'fog'],
+    'traffic_density': ['high', 'jam', np.nan],
+    'vehicle_condition': [2, 1, 0],
+    'order_type': ['Snack ', 'Meal ', 'Drinks '],
+    'vehicle_type': ['motorcycle', 'scooter', 'bicycle'],
+    'multiple_deliveries': [0.0, np.nan, 1.0],
+    'festival': ['no', 'nan', 'yes'],
+    'city': ['urban', 'metropolitian', 'nan'],
+    'time_taken': ['24', '33', '17'],
+    'city_name': ['INDO', 'BANG', 'MUM'],
+    'is_weekend': [1, 0, 0],
+    'pickup_time_in_minutes': [15.0, 5.0, np.nan],
+    'time_slot': pd.Categorical(['Morning', 'Night', np.nan]),
+    'distance': [3.0, 12.5, np.nan],
+    'distance_type': pd.Categorical(['short', 'long', np.nan]),
+    'order_key': [-4611686018427387904, 17, 9223372036854775807],
+})
+
+
+def test_round_trip_keeps_types_and_loads_like_csv(tmp_path):
+    path = tmp_path / 'cleaned.parquet'
+    save_artifact(cleaned, path)
+    loaded = read_artifact(path)
+
+    assert list(loaded.columns) == CLEANED_SCHEMA.names
+    assert loaded['time_taken'].dtype == np.int16
+    assert loaded['multiple_deliveries'].dtype == np.float32
+    assert loaded['time_slot'].cat.categories.tolist() == ['Morning', 'Afternoon', 'Evening', 'Night']
+
+    csv_path = tmp_path / 'cleaned.csv'
+    cleaned.to_csv(csv_path, index=False)
+    # 'nan' text is missing in both
+    pd.testing.assert_frame_equal(widen_dtypes(read_artifact(path)),
+                                  pd.read_csv(csv_path))
+
+
+def test_reads_only_requested_columns(tmp_path):
+    path = tmp_path / 'cleaned.parquet'
+    save_artifact(cleaned, path)
+    loaded = read_artifact(path, columns=['distance', 'time_taken'])
+    assert list(loaded.columns) == ['distance', 'time_taken']
+
+
+def test_new_labels_are_added_to_the_dictionary(tmp_path):
+    path = tmp_path / 'cleaned.parquet'
+    save_artifact(cleaned.assign(city_name=['INDO', 'NEW', 'MUM']), path)
+    assert read_artifact(path)['city_name'].tolist() == ['INDO', 'NEW', 'MUM']
+
+
+def test_values_outside_the_schema_raise(tmp_path):
+    with pytest.raises(ValueError):
+        save_artifact(cleaned.assign(vehicle_condition=[2.5, 1, 0]), tmp_path / 'bad.parquet')
+
+
+def test_csv_export(tmp_path):
+    path = tmp_path / 'cleaned.parquet'
+    save_artifact(cleaned, path, csv_export=True)
+    assert export_csv(path) == tmp_path / 'cleaned.csv'
+    exported = pd.read_csv(tmp_path / 'cleaned.csv')
+    pd.testing.assert_frame_equal(exported, widen_dtypes(read_artifact(path)))
@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / 'src'))
+
+from data_cleaning.binning import (DISTANCE_ORDER, distance_type, distance_type_column,
+                                   is_weekend_column, time_slot, time_slot_column)
+
+hours = [0, 5, 5.5, 6, 11, 12, 16, 17, 19, 20, 23, np.nan]
+slots = ['Night', 'Night', 'Night', 'Morning', 'Morning', 'Afternoon', 'Afternoon', 'Evening',
+         'Evening', 'Night', 'Night', np.nan]
+distances = [-0.1, 0, 4.99, 5, 9.9, 10, 14.9, 15, 120, np.nan]
+ranges = ['invalid', 'short', 'short', 'medium', 'medium', 'long', 'long', 'very long',
+          'very long', np.nan]
+
+
+@pytest.mark.parametrize("column, scalar, values, expected", [
+    (time_slot_column, time_slot, hours, slots),
+    (distance_type_column, distance_type, distances, ranges),
+])
+def test_column_and_scalar_bins_agree_at_the_edges(column, scalar, values, expected):
+    binned = column(pd.Series(values, index=range(10, 10 + len(values))))
+    assert isinstance(binned.dtype, pd.CategoricalDtype)
+    assert binned.index.to_list() == list(range(10, 10 + len(values)))
+    pd.testing.assert_series_equal(binned.astype(object).reset_index(drop=True),
+                                   pd.Series(expected, dtype=object))
+    assert [scalar(value) for value in values][:-1] == expected[:-1]
+    assert np.isnan(scalar(values[-1]))
+
+
+def test_distance_categories_follow_the_ordinal_encoder_order():
+    binned = distance_type_column(pd.Series([1.0, 20.0]))
+    assert list(binned.cat.categories[:4]) == DISTANCE_ORDER
+
+
+def test_weekend_flag():
+    dates = pd.Series(pd.to_datetime(['2022-03-19', '2022-03-20', '2022-03-21', None]))
+    assert is_weekend_column(dates).to_list() == [1, 1, 0, 0]
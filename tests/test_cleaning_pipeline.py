@@ -0,0 +1,95 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / 'src'))
+
+from data_cleaning.artifacts import read_artifact, to_table
+from data_cleaning.pipeline import (clean_csv_in_chunks, perform_data_cleaning,
+                                    perform_data_cleaning_parallel)
+
+record = {
+    "ID": "0x4607 ", "Delivery_person_ID": "INDORES13DEL02 ", "Delivery_person_Age": "37",
+    "Delivery_person_Ratings": "4.9", "Restaurant_latitude": 22.745049,
+    "Restaurant_longitude": 75.892471, "Delivery_location_latitude": 22.765049,
+    "Delivery_location_longitude": 75.912471, "Order_Date": "19-03-2022",
+    "Time_Orderd": "11:30:00", "Time_Order_picked": "11:45:00",
+    "Weatherconditions": "conditions Sunny", "Road_traffic_density": "High ",
+    "Vehicle_condition": 2, "Type_of_order": "Snack ", "Type_of_vehicle": "motorcycle ",
+    "multiple_deliveries": "0", "Festival": "No ", "City": "Urban ", "Time_taken(min)": "(min) 24",
+}
+
+raw_orders = [
+    record,
+    {**record, "Time_Orderd": "23:55:00", "Time_Order_picked": "00:10:00"},
+    {**record, "Delivery_person_Age": "15"},
+    {**record, "Time_Orderd": "NaN ", "Road_traffic_density": "NaN "},
+    {**record, "Delivery_person_Ratings": "6", "City": "NaN "},
+    {**record, "Restaurant_latitude": -22.745049, "Order_Date": "20-03-2022"},
+    {**record, "Weatherconditions": "conditions NaN", "multiple_deliveries": "NaN "},
+    # dropped by both the age and the rating filter
+    {**record, "Delivery_person_Age": "16", "Delivery_person_Ratings": "6"},
+    # minutes with seconds are not exact in float32, nor 300 minutes in int8
+    {**record, "Time_Order_picked": "11:45:07", "Time_taken(min)": "(min) 300"},
+]
+
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    path = tmp_path / 'swiggy.csv'
+    pd.DataFrame(raw_orders).to_csv(path, index=False)
+    return path
+
+
+def as_artifact(cleaned: pd.DataFrame) -> pd.DataFrame:
+    return to_table(cleaned).to_pandas()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 100])
+def test_chunked_output_is_identical_to_in_memory(raw_csv, tmp_path, chunk_size):
+    in_memory = perform_data_cleaning(pd.read_csv(raw_csv), training=True)
+
+    chunked = tmp_path / 'chunked.parquet'
+    rows = clean_csv_in_chunks(raw_csv, chunked, chunk_size)
+    pd.testing.assert_frame_equal(read_artifact(chunked), as_artifact(in_memory))
+    assert rows == len(in_memory) == 6
+
+
+def test_parallel_cleaning_keeps_row_order(raw_csv, tmp_path):
+    raw = pd.read_csv(raw_csv)
+    expected = perform_data_cleaning(raw, training=True)
+    pd.testing.assert_frame_equal(
+        perform_data_cleaning_parallel(raw, workers=2, training=True, partitions=3), expected)
+
+    chunked = tmp_path / 'chunked.parquet'
+    clean_csv_in_chunks(raw_csv, chunked, chunk_size=2, workers=2)
+    pd.testing.assert_frame_equal(read_artifact(chunked), as_artifact(expected))
+
+
+def test_training_and_serving_layouts():
+    raw = pd.DataFrame(raw_orders)
+    training = perform_data_cleaning(raw, training=True)
+    serving = perform_data_cleaning(raw.drop(columns=['Time_taken(min)']))
+    assert 'day_of_week' not in training and 'day_of_week' in serving
+    assert training['time_taken'].tolist()[0] == '24'
+    assert pd.isna(training.loc[3, 'traffic_density']) and serving.loc[3, 'traffic_density'] == 'nan'
+
+
+def test_artifact_keeps_minutes_with_seconds_and_long_deliveries(tmp_path):
+    cleaned = perform_data_cleaning(pd.DataFrame(raw_orders), training=True)
+    artifact = as_artifact(cleaned)
+    assert artifact.loc[5, 'pickup_time_in_minutes'] == cleaned.loc[8, 'pickup_time_in_minutes'] == 15 + 7 / 60
+    assert artifact.loc[5, 'time_taken'] == 300
+
+
+@pytest.mark.parametrize("copy_on_write", [False, True])
+def test_cleaning_leaves_input_unchanged(copy_on_write):
+    raw = pd.DataFrame(raw_orders)
+    original = raw.copy()
+    with pd.option_context('mode.copy_on_write', copy_on_write):
+        cleaned = perform_data_cleaning(raw, training=True)
+    pd.testing.assert_frame_equal(raw, original)
+    assert cleaned.index.tolist() == [0, 1, 3, 5, 6, 8]
@@ -0,0 +1,111 @@
+import pickle
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from lightgbm import LGBMRegressor
+from sklearn.compose import TransformedTargetRegressor
+from sklearn.ensemble import RandomForestRegressor, StackingRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import PowerTransformer
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / 'src'))
+
+from data_cleaning.artifacts import read_artifact
+from data_cleaning.dtypes import ORDER_KEY
+from model_building.compiled_model import (compile_model, load_compiled_model,
+                                           save_compiled_model)
+from serving.shared_model import CompiledPredictor, SharedModelSource, publish_shared_model
+
+model_path = root_path / 'model.pkl'
+preprocessor_path = root_path / 'preprocessor.pkl'
+test_data_path = root_path / 'data' / 'interim' / 'test_data.parquet'
+
+
+def build_model(rf_params, lgbm_params):
+    stacking = StackingRegressor(
+        estimators=[('rf', RandomForestRegressor(**rf_params)),
+                    ('lgbm_reg', LGBMRegressor(**lgbm_params))],
+        final_estimator=LinearRegression())
+    return TransformedTargetRegressor(regressor=stacking, transformer=PowerTransformer())
+
+
+@pytest.fixture(scope='module')
+def synthetic_model():
+    rng = np.random.default_rng(42)
+    x = pd.DataFrame(rng.uniform(0, 1, (2000, 12)), columns=[f"f{i}" for i in range(12)])
+    x['f10'] = (x['f10'] > 0.5).astype(float)
+    y = pd.DataFrame({'time_taken': 10 + 30 * x['f0'] + 15 * x['f1'] ** 2 + 5 * x['f10']
+                      + rng.normal(0, 2, len(x))})
+    x.loc[rng.random(len(x)) < 0.05, 'f2'] = np.nan
+    model = build_model(
+        {'n_estimators': 40, 'max_depth': 12, 'min_samples_leaf': 5, 'max_samples': 0.8,
+         'random_state': 0},
+        {'n_estimators': 60, 'num_leaves': 31, 'max_depth': 7, 'verbose': -1, 'random_state': 0})
+    model.fit(x, y)
+    return model, x
+
+
+def test_compiled_predictions_match_sklearn(synthetic_model):
+    model, x = synthetic_model
+    compiled = compile_model(model)
+    np.testing.assert_allclose(compiled.predict(x), np.ravel(model.predict(x)), rtol=0, atol=1e-6)
+    np.testing.assert_allclose(compiled.predict(x.iloc[:1]), np.ravel(model.predict(x.iloc[:1])),
+                               rtol=0, atol=1e-6)
+
+
+def test_saved_model_round_trips_with_mmap(synthetic_model, tmp_path):
+    model, x = synthetic_model
+    save_compiled_model(compile_model(model), tmp_path)
+    loaded = load_compiled_model(tmp_path, mmap_mode='r')
+    assert isinstance(loaded.forests[0].feature, np.memmap)
+    np.testing.assert_allclose(loaded.predict(x), np.ravel(model.predict(x)), rtol=0, atol=1e-6)
+
+
+def test_shared_predictor_maps_arrays_and_keeps_preprocessor(synthetic_model, tmp_path):
+    model, x = synthetic_model
+    preprocessor = PowerTransformer().fit(x.fillna(0))
+    CompiledPredictor(compile_model(model), preprocessor).save(tmp_path)
+    shared = CompiledPredictor.load(tmp_path, mmap_mode='r')
+    assert isinstance(shared.compiled.forests[1].threshold, np.memmap)
+    x_clean = x.fillna(0)
+    expected = np.ravel(model.predict(pd.DataFrame(preprocessor.transform(x_clean),
+                                                   columns=x.columns)))
+    np.testing.assert_allclose(shared.predict(x_clean), expected, rtol=0, atol=1e-6)
+
+
+
+def test_published_versions_get_new_directories(synthetic_model, tmp_path):
+    model, x = synthetic_model
+    predictor = CompiledPredictor(compile_model(model), None)
+    source = SharedModelSource(tmp_path)
+    first = publish_shared_model(tmp_path, '1', 'run-1', 'models:/m/1', predictor)
+    mapped = source.load('1')
+    assert source() == ('1', 'run-1', 'models:/m/1')
+
+    publish_shared_model(tmp_path, '2', 'run-2', 'models:/m/2', predictor)
+    third = publish_shared_model(tmp_path, '3', 'run-3', 'models:/m/3', predictor)
+    assert source()[0] == '3' and isinstance(source.load('3').compiled.forests[0].feature, np.memmap)
+    assert not first.exists() and len(list(tmp_path.glob('model-*'))) == 2 and third.exists()
+    # the first mapping outlives its directory
+    np.testing.assert_allclose(mapped.compiled.predict(x), np.ravel(model.predict(x)),
+                               rtol=0, atol=1e-6)
+    with pytest.raises(LookupError):
+        source.load('2')
+
+@pytest.mark.skipif(not (model_path.exists() and preprocessor_path.exists()
+                         and test_data_path.exists()),
+                    reason="model.pkl, preprocessor.pkl or the test split are not available")
+def test_compiled_predictions_match_pickled_model_on_test_split():
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)
+    with open(preprocessor_path, 'rb') as f:
+        preprocessor = pickle.load(f)
+    test_df = read_artifact(test_data_path).dropna()
+    x_test = preprocessor.transform(test_df.drop(columns=['time_taken', ORDER_KEY]))
+
+    np.testing.assert_allclose(compile_model(model).predict(x_test),
+                               np.ravel(model.predict(x_test)), rtol=0, atol=1e-6)
@@ -0,0 +1,84 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / 'src'))
+
+from data_cleaning.artifacts import read_artifact, save_artifact
+from data_cleaning.dtypes import CATEGORIES
+from data_cleaning.pipeline import order_keys
+from data_processing.data_processing import hash_test_mask, split_artifact_by_hash
+
+rng = np.random.default_rng(0)
+n = 2000
+cleaned = pd.DataFrame({
+    'person_age': rng.integers(20, 40, n).astype(float),
+    'person_ratings': rng.integers(25, 50, n) / 10,
+    'weather_condition': rng.choice(['sunny', 'fog', 'windy'], n),
+    'traffic_density': rng.choice(['low', 'jam', 'high'], n),
+    'vehicle_condition': rng.integers(0, 3, n),
+    'order_type': rng.choice(['Snack ', 'Meal '], n),
+    'vehicle_type': rng.choice(['motorcycle', 'scooter'], n),
+    'multiple_deliveries': rng.integers(0, 3, n).astype(float),
+    'festival': rng.choice(['no', 'yes'], n),
+    'city': rng.choice(['urban', 'metropolitian'], n),
+    'time_taken': rng.integers(10, 50, n),
+    'city_name': rng.choice(['INDO', 'BANG', 'MUM'], n),
+    'is_weekend': rng.integers(0, 2, n),
+    'pickup_time_in_minutes': rng.choice([5.0, 10.0, 15.0], n),
+    'time_slot': rng.choice(CATEGORIES['time_slot'], n),
+    'distance': rng.uniform(1, 20, n),
+    'distance_type': rng.choice(['short', 'medium', 'long'], n),
+    'order_key': order_keys(pd.DataFrame({'id': [f'0x{i % 500:04x} ' for i in range(n)],
+                                          'delivery_ID': [f'INDORES{i % 7:02d}DEL01 ' for i in range(n)],
+                                          'order_date': [f'{1 + i % 28:02d}-03-2022' for i in range(n)]})),
+})
+
+
+def test_assignment_is_per_row_and_near_test_size(tmp_path):
+    path = tmp_path / 'cleaned.parquet'
+    save_artifact(cleaned, path)
+    data = read_artifact(path)
+    test = hash_test_mask(data, 0.25, 42)
+    assert abs(test.mean() - 0.25) < 0.03
+
+    # the same rows keep their side when rows are added or reordered
+    grown = pd.concat([data.iloc[::-1], data.sample(500, random_state=1)])
+    np.testing.assert_array_equal(hash_test_mask(grown, 0.25, 42)[:n], test[::-1])
+    assert (hash_test_mask(data, 0.25, 7) != test).any()
+
+
+def test_assignment_depends_on_the_order_id_only(tmp_path):
+    test = hash_test_mask(cleaned, 0.25, 42)
+    # other cleaning or dtypes of the same orders
+    recleaned = cleaned.assign(time_taken=cleaned['time_taken'] + 1,
+                               pickup_time_in_minutes=cleaned['pickup_time_in_minutes'] + 1 / 60,
+                               city=np.nan)
+    np.testing.assert_array_equal(hash_test_mask(recleaned, 0.25, 42), test)
+    # the key ignores the padding of the raw text, and tells apart orders sharing an ID
+    keys = order_keys(pd.DataFrame({
+        'id': pd.Series(['0x4607 ', '0x4607', None, '0x4607'], dtype='string[pyarrow]'),
+        'delivery_ID': ['INDORES13DEL02 ', 'INDORES13DEL02', 'INDORES13DEL02', 'BANGRES01DEL01'],
+        'order_date': pd.Categorical(['19-03-2022'] * 4),
+    }))
+    assert keys[0] == keys[1] and len(set(keys)) == 3
+
+
+def test_streaming_split_matches_the_mask_for_any_chunk_size(tmp_path):
+    path = tmp_path / 'cleaned.parquet'
+    save_artifact(cleaned, path)
+    data = read_artifact(path)
+    test = hash_test_mask(data, 0.25, 42)
+
+    for chunk_size in (n, 300):
+        out = tmp_path / str(chunk_size)
+        out.mkdir()
+        rows = split_artifact_by_hash(path, out, 0.25, 42, chunk_size=chunk_size)
+        assert rows == ((~test).sum(), test.sum())
+        pd.testing.assert_frame_equal(read_artifact(out / 'train_data.parquet'),
+                                      data[~test].reset_index(drop=True))
+        pd.testing.assert_frame_equal(read_artifact(out / 'test_data.parquet'),
+                                      data[test].reset_index(drop=True))
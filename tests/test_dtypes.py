@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / 'src'))
+
+from data_cleaning.dtypes import (CLEANED_DTYPES, RAW_DTYPES, memory_mb, to_cleaned_dtypes,
+                                  widen_dtypes)
+from data_cleaning.pipeline import load_data, perform_data_cleaning
+
+raw_data_path = root_path / 'data' / 'raw' / 'swiggy_sample.csv'
+
+
+@pytest.mark.skipif(not raw_data_path.exists(), reason="raw sample data is not available")
+@pytest.mark.parametrize("training", [True, False])
+def test_raw_dtype_plan_cleans_like_default_dtypes(training):
+    default = pd.read_csv(raw_data_path)
+    planned = load_data(raw_data_path)
+    assert memory_mb(planned) < memory_mb(default)
+    assert planned['ID'].dtype == RAW_DTYPES['ID']
+
+    expected = perform_data_cleaning(default, training=training)
+    cleaned = perform_data_cleaning(planned, training=training)
+    assert cleaned.to_csv(index=False) == expected.to_csv(index=False)
+
+
+@pytest.mark.skipif(not raw_data_path.exists(), reason="raw sample data is not available")
+def test_cleaned_dtype_plan_is_exact():
+    cleaned = perform_data_cleaning(pd.read_csv(raw_data_path), training=True)
+    compact = to_cleaned_dtypes(cleaned)
+    assert compact.dtypes.astype(str).to_dict() == CLEANED_DTYPES
+    assert memory_mb(compact) < memory_mb(cleaned)
+
+    expected = cleaned.assign(time_taken=cleaned['time_taken'].astype(int))
+    wide = widen_dtypes(compact)
+    for column in ['festival', 'city', 'vehicle_type']:
+        # 'nan' text is missing, as when the CSV was read back
+        expected[column] = expected[column].replace('nan', np.nan)
+    pd.testing.assert_frame_equal(wide.astype({'time_slot': 'category',
+                                               'distance_type': 'category'}),
+                                  expected[list(CLEANED_DTYPES)], check_categorical=False)
+
+
+def test_inexact_downcast_raises():
+    cleaned = pd.DataFrame({name: ['x'] if dtype == 'category' else [1]
+                            for name, dtype in CLEANED_DTYPES.items()})
+    to_cleaned_dtypes(cleaned)
+    compact = to_cleaned_dtypes(cleaned.assign(time_taken=[300],
+                                               pickup_time_in_minutes=[15 + 7 / 60]))
+    assert compact['time_taken'][0] == 300
+    assert compact['pickup_time_in_minutes'][0] == 15 + 7 / 60
+    with pytest.raises(ValueError):
+        to_cleaned_dtypes(cleaned.assign(time_taken=[40_000]))
+    with pytest.raises(ValueError):
+        to_cleaned_dtypes(cleaned.assign(person_age=[37.1]))
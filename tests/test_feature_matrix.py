@@ -0,0 +1,62 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import MinMaxScaler, OneHotEncoder
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / 'src'))
+
+from feature_engineering.feature_matrix import (FEATURES_FILE, META_FILE, load_feature_matrix,
+                                                save_feature_matrix)
+
+train = pd.DataFrame({
+    'distance': [3.2, 12.5, 7.75, 1.0],
+    'city': ['urban', 'metropolitian', 'urban', 'semi-urban'],
+    'is_weekend': np.array([1, 0, 0, 1], dtype=np.int8),
+})
+target = pd.DataFrame({'time_taken': np.array([24, 33, 17, 40], dtype=np.int8)})
+
+
+def fitted_preprocessor():
+    preprocessor = ColumnTransformer(
+        transformers=[('scaling', MinMaxScaler(), ['distance']),
+                      ('OHE', OneHotEncoder(drop='first', sparse_output=False), ['city'])],
+        remainder='passthrough', verbose_feature_names_out=False)
+    return preprocessor.set_output(transform='pandas').fit(train)
+
+
+def test_round_trip_is_float32_and_memory_mapped(tmp_path):
+    preprocessor = fitted_preprocessor()
+    x = preprocessor.transform(train)
+    save_feature_matrix(tmp_path, x, target, preprocessor)
+    x_loaded, y_loaded = load_feature_matrix(tmp_path)
+
+    assert list(x_loaded.columns) == list(x.columns)
+    assert (x_loaded.dtypes == np.float32).all()
+    np.testing.assert_allclose(x_loaded.to_numpy(), x.to_numpy(), rtol=1e-7)
+    pd.testing.assert_frame_equal(y_loaded, target)
+
+    features = np.load(tmp_path / FEATURES_FILE, mmap_mode='r')
+    assert features.flags['C_CONTIGUOUS'] and features.shape == x.shape
+    base = x_loaded.to_numpy()
+    while getattr(base, 'base', None) is not None:
+        base = base.base
+    assert not isinstance(base, np.ndarray)  # the file mapping, not a copy
+
+
+def test_sidecar_has_the_encoder_metadata(tmp_path):
+    preprocessor = fitted_preprocessor()
+    save_feature_matrix(tmp_path, preprocessor.transform(train), target, preprocessor)
+    meta = json.loads((tmp_path / META_FILE).read_text())
+
+    assert meta['rows'] == 4 and meta['target'] == ['time_taken']
+    steps = {step['name']: step for step in meta['transformers']}
+    assert steps['OHE']['columns'] == ['city']
+    assert steps['OHE']['categories'] == [['metropolitian', 'semi-urban', 'urban']]
+    assert steps['OHE']['features'] == ['city_semi-urban', 'city_urban']
+    assert steps['remainder']['features'] == ['is_weekend']
+    assert sum(len(step['features']) for step in steps.values()) == len(meta['features'])
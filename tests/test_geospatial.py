@@ -0,0 +1,93 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / 'src'))
+
+from data_cleaning.binning import DISTANCE_TYPES, distance_type_column
+from data_cleaning.geospatial import GeoKernel, get_kernel, record_distances
+from data_cleaning.record_cleaning import _coordinate, clean_record, haversine_distance
+
+# restaurant latitude, longitude, delivery latitude, longitude
+coordinates = np.array([
+    [22.745049, 75.892471, 22.765049, 75.912471],
+    [-22.745049, 75.892471, 22.765049, -75.912471],
+    [0.0, 75.892471, 22.765049, 75.912471],
+    [12.914264, 77.6784, 13.004264, 77.7684],
+    [19.0, 72.8, 19.12, 72.95],
+    [30.327968, 78.046106, 30.397968, 78.116106],
+    [11.0, 76.0, 12.5, 77.9],
+])
+
+
+def scalar_distances(block):
+    return np.array([haversine_distance(*map(_coordinate, row)) for row in block])
+
+
+def test_matches_the_scalar_distance_and_bins():
+    distance, codes = GeoKernel()(coordinates)
+    np.testing.assert_allclose(distance, scalar_distances(coordinates), rtol=1e-12)
+    assert np.isnan(distance[2])
+
+    expected = distance_type_column(pd.Series(distance))
+    assert codes.dtype == np.int8
+    assert codes.tolist() == expected.cat.codes.tolist()
+    assert list(expected.cat.categories) == DISTANCE_TYPES
+
+
+def test_buffers_are_reused_and_grown():
+    kernel = GeoKernel()
+    expected = kernel.distances(coordinates)
+    work = kernel._work
+    kernel.distances(coordinates[:2])
+    assert kernel._work is work
+    np.testing.assert_array_equal(kernel.distances(coordinates), expected)
+
+    doubled = np.vstack([coordinates, coordinates])
+    np.testing.assert_array_equal(kernel.distances(doubled), np.tile(expected, 2))
+    assert kernel._work is not work
+
+
+def test_columns_and_output_arrays():
+    kernel = GeoKernel()
+    out, codes = np.empty(len(coordinates)), np.empty(len(coordinates), dtype=np.int8)
+    distance, binned = kernel(list(coordinates.T), out=out, codes=codes)
+    assert distance is out and binned is codes
+    np.testing.assert_array_equal(distance, kernel.distances(coordinates))
+
+
+def test_float32_mode_is_close():
+    distance, codes = get_kernel(np.float32)(coordinates)
+    assert distance.dtype == np.float32
+    # the float32 coordinates themselves are only exact to about a metre
+    np.testing.assert_allclose(distance, scalar_distances(coordinates), atol=1e-3)
+    assert codes.tolist() == get_kernel()(coordinates)[1].tolist()
+
+
+@pytest.mark.parametrize("records", [[], [
+    dict(zip(['Restaurant_latitude', 'Restaurant_longitude', 'Delivery_location_latitude',
+              'Delivery_location_longitude'], row)) for row in coordinates
+]])
+def test_record_distances(records):
+    np.testing.assert_array_equal(record_distances(records),
+                                  get_kernel().distances(coordinates[:len(records)]))
+
+
+def test_clean_record_uses_a_given_distance():
+    record = {
+        "ID": "0x4607 ", "Delivery_person_ID": "INDORES13DEL02 ", "Delivery_person_Age": "37",
+        "Delivery_person_Ratings": "4.9", "Restaurant_latitude": 22.745049,
+        "Restaurant_longitude": 75.892471, "Delivery_location_latitude": 22.765049,
+        "Delivery_location_longitude": 75.912471, "Order_Date": "19-03-2022",
+        "Time_Orderd": "11:30:00", "Time_Order_picked": "11:45:00",
+        "Weatherconditions": "conditions Sunny", "Road_traffic_density": "High ",
+        "Vehicle_condition": 2, "Type_of_order": "Snack ", "Type_of_vehicle": "motorcycle ",
+        "multiple_deliveries": "0", "Festival": "No ", "City": "Urban ",
+    }
+    row = clean_record(record, distance=record_distances([record])[0])
+    assert row['distance'] == clean_record(record)['distance']
+    assert row['distance_type'] == 'short'
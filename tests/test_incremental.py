@@ -0,0 +1,106 @@
+import filecmp
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / 'src'))
+
+from data_cleaning import incremental
+from data_cleaning.artifacts import read_artifact, to_table
+from data_cleaning.pipeline import clean_csv_incrementally, perform_data_cleaning
+from data_processing.data_processing import hash_test_mask, split_incrementally
+
+record = {
+    "ID": "0x4607 ", "Delivery_person_ID": "INDORES13DEL02 ", "Delivery_person_Age": "37",
+    "Delivery_person_Ratings": "4.9", "Restaurant_latitude": 22.745049,
+    "Restaurant_longitude": 75.892471, "Delivery_location_latitude": 22.765049,
+    "Delivery_location_longitude": 75.912471, "Order_Date": "19-03-2022",
+    "Time_Orderd": "11:30:00", "Time_Order_picked": "11:45:00",
+    "Weatherconditions": "conditions Sunny", "Road_traffic_density": "High ",
+    "Vehicle_condition": 2, "Type_of_order": "Snack ", "Type_of_vehicle": "motorcycle ",
+    "multiple_deliveries": "0", "Festival": "No ", "City": "Urban ", "Time_taken(min)": "(min) 24",
+}
+
+# 23 orders at different times, the underage ones are dropped by the cleaning
+raw_orders = pd.DataFrame([
+    {**record, "Time_Orderd": f"{hour:02d}:30:00", "Time_Order_picked": f"{hour:02d}:45:00",
+     "Delivery_person_Age": "15" if hour % 7 == 3 else str(20 + hour),
+     "Time_taken(min)": f"(min) {10 + hour}"}
+    for hour in range(23)
+])
+PARTITION_ROWS = 5
+
+
+def clean(raw_path, out_dir, rebuild=False):
+    return clean_csv_incrementally(raw_path, out_dir / 'cleaned.parquet',
+                                   out_dir / 'manifest.json', PARTITION_ROWS, rebuild=rebuild)
+
+
+def split(out_dir, rebuild=False):
+    (out_dir / 'interim').mkdir(exist_ok=True)
+    return split_incrementally(out_dir / 'cleaned.parquet',
+                               incremental.load_manifest(out_dir / 'manifest.json'),
+                               out_dir / 'interim', 0.3, 42, rebuild=rebuild)
+
+
+@pytest.fixture
+def grown(tmp_path):
+    """Outputs of an incremental run on 12 orders followed by one on all of them."""
+    raw_path = tmp_path / 'swiggy.csv'
+    raw_orders.head(12).to_csv(raw_path, index=False)
+    (tmp_path / 'grown').mkdir()
+    assert clean(raw_path, tmp_path / 'grown')[1] == 3
+    split(tmp_path / 'grown')
+
+    raw_orders.to_csv(raw_path, index=False)
+    # the last, partial partition is cleaned again with the new orders
+    assert clean(raw_path, tmp_path / 'grown')[1] == 3
+    assert split(tmp_path / 'grown')[2] == 3
+    return raw_path, tmp_path / 'grown'
+
+
+def test_incremental_outputs_are_identical_to_a_rebuild(grown, tmp_path):
+    raw_path, grown_dir = grown
+    full_dir = tmp_path / 'full'
+    full_dir.mkdir()
+    clean(raw_path, full_dir, rebuild=True)
+    split(full_dir, rebuild=True)
+    for name in ['cleaned.parquet', 'manifest.json', 'interim/train_data.parquet',
+                 'interim/test_data.parquet', 'interim/manifest.json']:
+        assert filecmp.cmp(grown_dir / name, full_dir / name, shallow=False)
+
+    cleaned = read_artifact(grown_dir / 'cleaned.parquet')
+    expected = to_table(perform_data_cleaning(pd.read_csv(raw_path), training=True)).to_pandas()
+    pd.testing.assert_frame_equal(cleaned, expected)
+    test = hash_test_mask(cleaned, 0.3, 42)
+    pd.testing.assert_frame_equal(read_artifact(grown_dir / 'interim' / 'test_data.parquet'),
+                                  cleaned[test].reset_index(drop=True))
+
+
+def test_up_to_date_runs_do_nothing(grown):
+    raw_path, grown_dir = grown
+    before = (grown_dir / 'cleaned.parquet').stat().st_mtime_ns
+    assert clean(raw_path, grown_dir) == (len(read_artifact(grown_dir / 'cleaned.parquet')), 0)
+    assert split(grown_dir)[2] == 0
+    assert (grown_dir / 'cleaned.parquet').stat().st_mtime_ns == before
+
+
+def test_changed_partitions_and_settings_are_processed_again(grown):
+    raw_path, grown_dir = grown
+    raw_orders.assign(Festival=['Yes '] + ['No '] * 22).to_csv(raw_path, index=False)
+    assert clean(raw_path, grown_dir)[1] == 5
+    assert read_artifact(grown_dir / 'cleaned.parquet')['festival'][0] == 'yes'
+
+    # other settings do not match the manifest's fingerprint
+    assert clean_csv_incrementally(raw_path, grown_dir / 'cleaned.parquet',
+                                   grown_dir / 'manifest.json', PARTITION_ROWS,
+                                   compression='snappy')[1] == 5
+
+
+def test_reset_manifest_is_not_loaded(tmp_path):
+    incremental.reset_manifest(tmp_path / 'manifest.json')
+    assert incremental.load_manifest(tmp_path / 'manifest.json') is None
+    assert incremental.read_manifest(tmp_path / 'manifest.json', 'abc') == []
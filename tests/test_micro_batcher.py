@@ -0,0 +1,115 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / 'src'))
+
+from serving.micro_batcher import MicroBatcher
+
+
+class RecordingScorer:
+    def __init__(self):
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def __call__(self, records):
+        with self.lock:
+            self.batches.append(list(records))
+        return [{"prediction": record * 10} for record in records]
+
+
+def test_concurrent_requests_share_batches_and_get_their_own_result():
+    scorer = RecordingScorer()
+    batcher = MicroBatcher(scorer, max_batch_size=8, window_ms=50).start()
+    try:
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            results = list(pool.map(lambda r: batcher.submit(r).result(timeout=5), range(64)))
+    finally:
+        batcher.stop()
+
+    assert results == [{"prediction": r * 10} for r in range(64)]
+    assert len(scorer.batches) < 64
+    assert max(len(batch) for batch in scorer.batches) <= 8
+    assert sorted(r for batch in scorer.batches for r in batch) == list(range(64))
+
+
+def test_scoring_errors_are_returned_to_every_caller_in_the_batch():
+    def failing_scorer(records):
+        raise RuntimeError("model unavailable")
+
+    batcher = MicroBatcher(failing_scorer, max_batch_size=4, window_ms=1).start()
+    try:
+        with pytest.raises(RuntimeError, match="model unavailable"):
+            batcher.submit(1).result(timeout=5)
+    finally:
+        batcher.stop()
+
+
+def test_submit_requires_a_running_batcher():
+    with pytest.raises(RuntimeError):
+        MicroBatcher(RecordingScorer()).submit(1)
+
+
+def test_cancelled_requests_do_not_stop_the_batcher():
+    scorer = RecordingScorer()
+    batcher = MicroBatcher(scorer, max_batch_size=8, window_ms=50).start()
+    try:
+        cancelled = batcher.submit(1)
+        assert cancelled.cancel()
+        # batched with the cancelled one, and alone in a later batch
+        assert batcher.submit(2).result(timeout=5) == {"prediction": 20}
+        assert batcher.submit(3).result(timeout=5) == {"prediction": 30}
+    finally:
+        batcher.stop()
+    assert [r for batch in scorer.batches for r in batch] == [2, 3]
+
+
+def test_a_wrong_number_of_results_fails_the_batch_only():
+    results = iter([[], [{"prediction": 1}]])
+    batcher = MicroBatcher(lambda records: next(results), max_batch_size=1, window_ms=1).start()
+    try:
+        with pytest.raises(RuntimeError, match="0 results"):
+            batcher.submit(1).result(timeout=5)
+        assert batcher.submit(2).result(timeout=5) == {"prediction": 1}
+    finally:
+        batcher.stop()
+
+
+def test_records_submitted_while_stopping_are_refused_not_left_hanging():
+    release = threading.Event()
+
+    def slow_score(records):
+        release.wait(5)
+        return [{"prediction": r} for r in records]
+
+    batcher = MicroBatcher(slow_score, max_batch_size=1, window_ms=1).start()
+    scoring = batcher.submit(1)
+    stopping = threading.Thread(target=batcher.stop)
+    stopping.start()
+    while not batcher._closed:
+        time.sleep(0.001)
+    # stop() is still waiting for the batch being scored
+    with pytest.raises(RuntimeError):
+        batcher.submit(2)
+    release.set()
+    stopping.join(5)
+    assert scoring.result(timeout=5) == {"prediction": 1}
+    assert batcher._queue.empty()
+
+
+def test_after_flush_runs_once_the_batch_is_resolved():
+    futures, resolved = [], []
+    batcher = MicroBatcher(RecordingScorer(), max_batch_size=2, window_ms=50,
+                           after_flush=lambda: resolved.append([f.done() for f in futures]))
+    batcher.start()
+    try:
+        futures.extend([batcher.submit(1), batcher.submit(2)])
+        assert [f.result(timeout=5) for f in futures] == [{"prediction": 10}, {"prediction": 20}]
+    finally:
+        batcher.stop()
+    assert resolved == [[True, True]]
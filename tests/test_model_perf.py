@@ -10,6 +10,12 @@ from sklearn.pipeline import Pipeline
 from sklearn.metrics import mean_absolute_error
 from sklearn.preprocessing import PowerTransformer
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'src'))
+
+from data_cleaning.artifacts import read_artifact
+from data_cleaning.dtypes import ORDER_KEY, widen_dtypes
 
 
 load_dotenv(override=True)
@@ -37,7 +43,7 @@ latest_version=latest_versions[0].version
 model_path = f"models:/{model_name}/{latest_version}"
 model = mlflow.pyfunc.load_model(model_path)
 
-data_path=os.path.join(root_path,'data','interim','test_data.csv')
+data_path=os.path.join(root_path,'data','interim','test_data.parquet')
 
 transformer=PowerTransformer()
 
@@ -48,13 +54,13 @@ transformer=PowerTransformer()
 def test_model_performance(model,data_path,threshold_error):
 
     #load data set
-    df=pd.read_csv(data_path)
+    df=widen_dtypes(read_artifact(data_path))
 
     # drop missing values
     df.dropna(inplace=True)
 
-    #split x and y
-    x=df.drop(columns=['time_taken'])
+    #split x and y, dropping the split key
+    x=df.drop(columns=['time_taken',ORDER_KEY])
     y=df['time_taken']
 
     #get predictions
@@ -0,0 +1,58 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / 'src'))
+
+from serving.model_reload import ModelInfoSource, ModelReloader, ServedModel
+
+
+class ConstantModel:
+    def __init__(self, value):
+        self.value = value
+
+    def predict(self, data):
+        return np.full(len(data), self.value)
+
+
+def make_reloader(tmp_path, warm_ok=True):
+    info_path = tmp_path / 'model_info.json'
+    info_path.write_text(json.dumps({'run_id': 'run-1'}))
+    swapped = []
+    reloader = ModelReloader(
+        source=ModelInfoSource(info_path, 'swiggy_time_predictor'),
+        load=lambda version, run_id, uri: ServedModel(version, run_id, uri,
+                                                      model=ConstantModel(len(swapped) + 1)),
+        warm=lambda candidate: warm_ok,
+        swap=swapped.append,
+        current_version='run-1',
+        interval=0,
+    )
+    return reloader, info_path, swapped
+
+
+def test_new_run_id_is_loaded_and_swapped_in(tmp_path):
+    reloader, info_path, swapped = make_reloader(tmp_path)
+    assert not reloader.check()
+
+    info_path.write_text(json.dumps({'run_id': 'run-2'}))
+    assert reloader.check()
+    assert [m.version for m in swapped] == ['run-2']
+    assert swapped[0].uri == 'runs:/run-2/swiggy_time_predictor'
+    assert swapped[0].predict([1, 2]).tolist() == [1, 1]
+    assert not reloader.check()
+
+
+def test_failed_warmup_or_load_keeps_the_current_model(tmp_path):
+    reloader, info_path, swapped = make_reloader(tmp_path, warm_ok=False)
+    info_path.write_text(json.dumps({'run_id': 'run-2'}))
+    assert not reloader.check()
+    assert swapped == [] and reloader.current_version == 'run-1'
+    assert 'Warmup' in reloader.last_error
+
+    info_path.write_text('{not json')
+    assert not reloader.check()
+    assert swapped == [] and reloader.current_version == 'run-1'
@@ -0,0 +1,58 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / 'src'))
+
+from serving.prediction_cache import PredictionCache, row_key
+
+
+def test_row_key_is_canonical_across_python_and_numpy_values():
+    assert row_key([30.0, 4.5, 'Sunny', 1]) == row_key([np.float64(30.0), np.float64(4.5),
+                                                        'Sunny', np.int64(1)])
+    assert row_key([30.0, 4.5, 'Sunny', 1]) != row_key([30.0, 4.6, 'Sunny', 1])
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(max_entries=2, ttl_seconds=60, model_version='v1')
+    cache.put('a', 1.0, 'v1')
+    cache.put('b', 2.0, 'v1')
+    assert cache.get('a') == 1.0
+    cache.put('c', 3.0, 'v1')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1.0 and cache.get('c') == 3.0
+    assert (cache.hits, cache.misses, cache.evictions) == (3, 1, 1)
+
+
+def test_entries_expire_after_ttl():
+    cache = PredictionCache(max_entries=10, ttl_seconds=0.05, model_version='v1')
+    cache.put('a', 1.0, 'v1')
+    assert cache.get('a') == 1.0
+    time.sleep(0.1)
+    assert cache.get('a') is None
+    assert len(cache) == 0 and cache.evictions == 1
+
+
+def test_model_version_change_invalidates_and_rejects_stale_puts():
+    cache = PredictionCache(max_entries=10, ttl_seconds=60, model_version='v1')
+    cache.put('a', 1.0, 'v1')
+    cache.set_model_version('v1')
+    assert cache.get('a') == 1.0
+
+    cache.set_model_version('v2')
+    assert cache.get('a') is None
+    cache.put('a', 1.0, 'v1')  # scored by the old model while the reload happened
+    assert cache.get('a') is None
+    cache.put('a', 2.0, 'v2')
+    assert cache.get('a') == 2.0
+
+
+def test_zero_size_disables_the_cache():
+    cache = PredictionCache(max_entries=0, model_version='v1')
+    assert not cache.enabled
+    cache.put('a', 1.0, 'v1')
+    assert cache.get('a') is None
@@ -0,0 +1,56 @@
+import sys
+import timeit
+from pathlib import Path
+
+import pandas as pd
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path))
+
+from monitoring.prod_logger import ProductionLogger
+
+
+def record(i):
+    return {"ID": f"0x{i:04x} ", "Delivery_person_Age": "30", "City": "Urban "}
+
+
+def test_batches_are_appended_in_order(tmp_path):
+    logger = ProductionLogger(tmp_path / "production_data.csv", batch_size=16,
+                              flush_interval=0.05, max_rows=0)
+    for i in range(100):
+        logger.log(record(i), float(i))
+    assert logger.flush()
+    logger.shutdown()
+
+    logged = pd.read_csv(tmp_path / "production_data.csv")
+    assert list(logged.columns) == ["ID", "Delivery_person_Age", "City", "prediction", "timestamp"]
+    assert logged["prediction"].to_list() == [float(i) for i in range(100)]
+    assert logger.written == 100 and logger.dropped == 0
+
+
+def test_file_is_compacted_to_most_recent_rows(tmp_path):
+    logger = ProductionLogger(tmp_path / "production_data.csv", batch_size=5, max_rows=20)
+    for i in range(103):
+        logger.log(record(i), float(i))
+    logger.shutdown()
+
+    logged = pd.read_csv(tmp_path / "production_data.csv")
+    assert 20 <= len(logged) <= 40
+    assert logged["prediction"].iloc[-1] == 102.0
+    assert logged["prediction"].is_monotonic_increasing
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    logger = ProductionLogger(tmp_path / "production_data.csv", max_queue_size=10)
+    logger._thread = object()  # writer "running" but never draining
+    for i in range(25):
+        logger.log(record(i), float(i))
+    assert logger.dropped == 15
+
+
+def test_logging_cost_is_microseconds(tmp_path):
+    logger = ProductionLogger(tmp_path / "production_data.csv", max_queue_size=200000)
+    rec = record(1)
+    per_call = timeit.timeit(lambda: logger.log(rec, 1.0), number=20000) / 20000
+    logger.shutdown()
+    assert per_call < 50e-6
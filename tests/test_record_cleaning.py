@@ -0,0 +1,98 @@
+import math
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / 'src'))
+
+from data_cleaning.geospatial import record_distances
+from data_cleaning.record_cleaning import CLEANED_COLUMNS, clean_record, is_complete
+
+raw_data_path = root_path / 'data' / 'raw' / 'swiggy.csv'
+coordinate_columns = ['Restaurant_latitude', 'Restaurant_longitude',
+                      'Delivery_location_latitude', 'Delivery_location_longitude']
+
+base_record = {
+    "ID": "0x4607 ", "Delivery_person_ID": "INDORES13DEL02 ", "Delivery_person_Age": "37",
+    "Delivery_person_Ratings": "4.9", "Restaurant_latitude": 22.745049,
+    "Restaurant_longitude": 75.892471, "Delivery_location_latitude": 22.765049,
+    "Delivery_location_longitude": 75.912471, "Order_Date": "19-03-2022",
+    "Time_Orderd": "11:30:00", "Time_Order_picked": "11:45:00",
+    "Weatherconditions": "conditions Sunny", "Road_traffic_density": "High ",
+    "Vehicle_condition": 2, "Type_of_order": "Snack ", "Type_of_vehicle": "motorcycle ",
+    "multiple_deliveries": "0", "Festival": "No ", "City": "Urban ",
+}
+
+edge_records = [
+    base_record,
+    {**base_record, "Time_Orderd": "23:55:00", "Time_Order_picked": "00:10:00"},
+    {**base_record, "Time_Orderd": "NaN ", "Order_Date": "12-03-2022"},
+    {**base_record, "Time_Orderd": "17:05", "Delivery_person_Age": "NaN "},
+    {**base_record, "Weatherconditions": "conditions NaN", "Road_traffic_density": "NaN ",
+     "City": "NaN ", "Festival": "NaN ", "multiple_deliveries": "NaN "},
+    {**base_record, "Restaurant_latitude": -22.745049, "Restaurant_longitude": 0.0},
+    {**base_record, "Delivery_location_latitude": 23.9, "Delivery_location_longitude": 77.1},
+    {**base_record, "Delivery_person_Age": "15"},
+    {**base_record, "Delivery_person_Ratings": "6"},
+]
+
+
+@pytest.fixture(scope='module')
+def perform_data_cleaning():
+    from data_cleaning.pipeline import perform_data_cleaning
+    return perform_data_cleaning
+
+
+def assert_parity(records, perform_data_cleaning):
+    expected = perform_data_cleaning(pd.DataFrame(records))
+    # the binned columns are Categoricals in the pandas pipeline, plain labels per record
+    expected = expected.astype({col: object for col in expected.select_dtypes('category')})
+    rows = {pos: clean_record(record) for pos, record in enumerate(records)}
+    kept = [pos for pos, row in rows.items() if row is not None]
+
+    assert kept == expected.index.to_list()
+    actual = pd.DataFrame([rows[pos] for pos in kept], index=kept, columns=CLEANED_COLUMNS)
+    pd.testing.assert_frame_equal(actual, expected[CLEANED_COLUMNS], check_dtype=False,
+                                  rtol=1e-9)
+    assert list(expected.columns) == CLEANED_COLUMNS
+    assert [is_complete(rows[pos]) for pos in kept] == \
+        expected.notna().all(axis=1).to_list()
+
+
+def test_edge_cases_match_pandas_pipeline(perform_data_cleaning):
+    assert_parity(edge_records, perform_data_cleaning)
+
+
+def test_crossing_midnight_and_filters():
+    assert clean_record(edge_records[1])['pickup_time_in_minutes'] == 15
+    assert math.isnan(clean_record(edge_records[2])['pickup_time_in_minutes'])
+    assert clean_record(edge_records[7]) is None
+    assert clean_record(edge_records[8]) is None
+
+
+def assert_batch_independent(records):
+    distances = record_distances(records).tolist()
+    for record, distance in zip(records, distances):
+        alone, batched = clean_record(record), clean_record(record, distance)
+        if alone is None:
+            assert batched is None
+            continue
+        # compared as strings, so NaN == NaN and float equality is bit for bit
+        assert {k: repr(v) for k, v in alone.items()} == {k: repr(v) for k, v in batched.items()}
+
+
+def test_single_record_and_batched_cleaning_give_identical_rows():
+    assert_batch_independent(edge_records)
+
+
+@pytest.mark.skipif(not raw_data_path.exists(), reason="data/raw/swiggy.csv not available")
+def test_full_dataset_matches_pandas_pipeline(perform_data_cleaning):
+    raw = pd.read_csv(raw_data_path, dtype=str, keep_default_na=False)
+    raw = raw.drop(columns=['Time_taken(min)'], errors='ignore')
+    raw[coordinate_columns] = raw[coordinate_columns].astype(float)
+    raw['Vehicle_condition'] = raw['Vehicle_condition'].astype(int)
+    assert_parity(raw.to_dict('records'), perform_data_cleaning)
+    assert_batch_independent(raw.to_dict('records'))
@@ -0,0 +1,96 @@
+import math
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / 'src'))
+
+from data_cleaning.record_cleaning import CLEANED_COLUMNS, clean_record
+from serving.schema import Data, Order, validate_batch
+
+record = {
+    "ID": "0x4607 ", "Delivery_person_ID": "INDORES13DEL02 ", "Delivery_person_Age": "37",
+    "Delivery_person_Ratings": "4.9", "Restaurant_latitude": 22.745049,
+    "Restaurant_longitude": 75.892471, "Delivery_location_latitude": 22.765049,
+    "Delivery_location_longitude": 75.912471, "Order_Date": "19-03-2022",
+    "Time_Orderd": "11:30:00", "Time_Order_picked": "11:45:00",
+    "Weatherconditions": "conditions Sunny", "Road_traffic_density": "High ",
+    "Vehicle_condition": 2, "Type_of_order": "Snack ", "Type_of_vehicle": "motorcycle ",
+    "multiple_deliveries": "0", "Festival": "No ", "City": "Urban ",
+}
+
+records = [
+    record,
+    {**record, "Time_Orderd": "23:55:00", "Time_Order_picked": "00:10:00"},
+    {**record, "Time_Orderd": "NaN ", "Order_Date": "12-03-2022"},
+    {**record, "Time_Orderd": "17:05", "Delivery_person_Age": "NaN "},
+    {**record, "Weatherconditions": "conditions NaN", "Road_traffic_density": "NaN ",
+     "City": "NaN ", "Festival": "NaN ", "multiple_deliveries": "NaN "},
+    {**record, "Restaurant_latitude": -22.745049, "Restaurant_longitude": 0.0},
+    {**record, "Delivery_person_Age": "15"},
+]
+
+
+def test_typed_records_clean_like_raw_records():
+    orders = validate_batch(records)
+    assert all(isinstance(order, Order) for order in orders)
+    for raw, order in zip(records, orders):
+        assert order.raw == raw
+        expected, actual = clean_record(raw), clean_record(order)
+        if expected is None:
+            assert actual is None
+            continue
+        pd.testing.assert_frame_equal(pd.DataFrame([actual], columns=CLEANED_COLUMNS),
+                                      pd.DataFrame([expected], columns=CLEANED_COLUMNS))
+
+
+def test_values_are_coerced_once():
+    order = validate_batch([records[4]])[0]
+    assert order['Delivery_person_Age'] == 37.0
+    assert order['Order_Date'] == datetime(2022, 3, 19)
+    assert order['Time_Orderd'] == 11 * 3600 + 30 * 60
+    assert math.isnan(order['Road_traffic_density'])
+    assert math.isnan(order['multiple_deliveries'])
+    assert validate_batch([record])[0]['Weatherconditions'] == 'sunny'
+
+
+def test_csv_strings_are_coerced_and_logged_in_the_schema_types():
+    csv_record = {key: str(value) for key, value in record.items()}
+    order = validate_batch([csv_record])[0]
+    assert order['Restaurant_latitude'] == 22.745049 and order['Vehicle_condition'] == 2
+    assert order.raw == record
+
+
+def test_unknown_labels_and_bad_values_are_rejected_per_record():
+    validated = validate_batch([
+        {**record, "Type_of_vehicle": "truck"},
+        {**record, "Vehicle_condition": "two", "Order_Date": "2022-99-99"},
+        {key: value for key, value in record.items() if key != "City"},
+        ["not", "a", "record"],
+        record,
+    ])
+    assert "Type_of_vehicle: Input should be one of" in validated[0]
+    assert "Vehicle_condition" in validated[1] and "Order_Date" in validated[1]
+    assert validated[2] == "Invalid record: City: Field required"
+    assert validated[3] == "Record must be a JSON object"
+    assert isinstance(validated[4], Order)
+
+
+def test_predict_model_validates_with_the_batch_coercers():
+    data = Data(**record)
+    assert isinstance(data.order, Order) and data.order.raw == record
+    assert data.order == validate_batch([record])[0]
+    with pytest.raises(ValidationError, match="Type_of_vehicle: Input should be one of"):
+        Data(**{**record, "Type_of_vehicle": "truck"})
+
+
+def test_predict_contract_has_the_real_types():
+    properties = Data.model_json_schema()['properties']
+    assert properties['Restaurant_latitude']['type'] == 'number'
+    assert properties['Vehicle_condition']['type'] == 'integer'
+    assert {'type': 'number'} in properties['Delivery_person_Age']['anyOf']
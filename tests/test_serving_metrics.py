@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+root_path = Path(__file__).resolve().parent.parent
+
+# each snippet runs in a fresh interpreter, the multiprocess mode is fixed at import time
+WORKER = """
+import sys
+sys.path.append({src!r})
+from serving.metrics import predictions_counter, stage_timer
+predictions_counter.inc({n})
+with stage_timer("cleaning"):
+    pass
+"""
+
+COLLECTOR = """
+import sys
+sys.path.append({src!r})
+from serving.metrics import latest_metrics
+print(latest_metrics()[0].decode())
+"""
+
+
+def run(code, env):
+    return subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                          capture_output=True, text=True).stdout
+
+
+def test_metrics_are_aggregated_across_worker_processes(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    src = str(root_path / "src")
+    run(WORKER.format(src=src, n=3), env)
+    run(WORKER.format(src=src, n=4), env)
+
+    lines = run(COLLECTOR.format(src=src), env).splitlines()
+    assert "serving_predictions_total 7.0" in lines
+    assert 'serving_stage_seconds_count{stage="cleaning"} 2.0' in lines
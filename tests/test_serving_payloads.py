@@ -0,0 +1,69 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / 'src'))
+
+from serving.payloads import (PayloadError, UnsupportedContentType, parse_payload,
+                              validate_records)
+from serving.schema import RAW_COLUMNS
+
+record = {
+    "ID": "0x4607 ", "Delivery_person_ID": "INDORES13DEL02 ", "Delivery_person_Age": "37",
+    "Delivery_person_Ratings": "4.9", "Restaurant_latitude": 22.745049,
+    "Restaurant_longitude": 75.892471, "Delivery_location_latitude": 22.765049,
+    "Delivery_location_longitude": 75.912471, "Order_Date": "19-03-2022",
+    "Time_Orderd": "11:30:00", "Time_Order_picked": "11:45:00",
+    "Weatherconditions": "conditions Sunny", "Road_traffic_density": "High ",
+    "Vehicle_condition": 2, "Type_of_order": "Snack ", "Type_of_vehicle": "motorcycle ",
+    "multiple_deliveries": "0", "Festival": "No ", "City": "Urban ",
+}
+
+
+def csv_line(rec):
+    return ",".join(str(rec[col]) for col in RAW_COLUMNS)
+
+
+def test_single_json_object_is_not_a_batch():
+    records, is_batch = parse_payload(json.dumps(record).encode(), "application/json")
+    assert records == [record]
+    assert not is_batch
+
+
+@pytest.mark.parametrize("content_type, body", [
+    ("application/json", json.dumps([record, record])),
+    ("application/jsonlines", json.dumps(record) + "\n\n" + json.dumps(record) + "\n"),
+    ("text/csv; charset=utf-8", ",".join(RAW_COLUMNS) + "\n" + csv_line(record) + "\n"
+     + csv_line(record)),
+    ("text/csv", csv_line(record) + "\n" + csv_line(record)),
+])
+def test_batch_payloads_decode_to_same_records(content_type, body):
+    records, is_batch = parse_payload(body.encode(), content_type)
+    assert is_batch
+    assert validate_records(records) == validate_records([record, record])
+
+
+def test_invalid_rows_get_errors_in_place():
+    ndjson = "\n".join([json.dumps(record), "{not json", json.dumps({**record, "City": None})])
+    records, _ = parse_payload(ndjson.encode(), "application/x-ndjson")
+    validated = validate_records(records)
+    assert isinstance(validated[0], dict)
+    assert "line 2" in validated[1]
+    assert "City" in validated[2]
+
+
+def test_unsupported_and_malformed_bodies():
+    with pytest.raises(UnsupportedContentType):
+        parse_payload(b"<xml/>", "application/xml")
+    with pytest.raises(PayloadError):
+        parse_payload(b"[1, 2", "application/json")
+
+
+@pytest.mark.parametrize("content_type", ["application/json", "application/x-ndjson", "text/csv"])
+def test_non_utf8_body_is_a_payload_error(content_type):
+    # /invocations answers PayloadError with a 400
+    with pytest.raises(PayloadError, match="UTF-8"):
+        parse_payload(b'\xff\xfe{', content_type)
@@ -0,0 +1,70 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / 'src'))
+
+from serving.model_reload import ServedModel
+from serving.shadow import ShadowScorer
+
+
+class BlockingModel:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def predict(self, data):
+        self.release.wait(5)
+        return np.asarray(data['x'], dtype=float) + 1
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.rows = []
+
+    def log_many(self, records, predictions):
+        self.rows.extend(zip(records, predictions))
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_samples_are_dropped_while_the_pool_is_busy_and_deltas_logged():
+    model = BlockingModel()
+    logger = RecordingLogger()
+    scorer = ShadowScorer(sample_rate=1.0, max_workers=1, shadow_logger=logger)
+    scorer.model = ServedModel('candidate', 'run-2', 'runs:/run-2/m', model=model)
+    data = pd.DataFrame({'x': [10.0, 20.0]})
+    records = [{'ID': 'a'}, {'ID': 'b'}]
+    try:
+        assert scorer.submit(records, data, [10.5, 20.0], 'run-1')
+        assert not scorer.submit(records, data, [10.5, 20.0], 'run-1')  # dropped, not queued
+        model.release.set()
+        assert wait_for(lambda: len(logger.rows) == 2)
+        assert wait_for(lambda: scorer.submit(records, data, [11.0, 21.0], 'run-1'))
+    finally:
+        scorer.shutdown()
+
+    (first, shadow_prediction), (second, _) = logger.rows[:2]
+    assert shadow_prediction == 11.0
+    assert first['delta'] == 0.5 and second['delta'] == 1.0
+    assert first['shadow_version'] == 'candidate' and first['primary_version'] == 'run-1'
+
+
+def test_nothing_is_sampled_before_the_model_is_loaded_or_at_rate_zero():
+    scorer = ShadowScorer(sample_rate=0.0)
+    data = pd.DataFrame({'x': [1.0]})
+    assert not scorer.submit([{}], data, [1.0], 'run-1')
+    scorer.model = ServedModel('candidate', '', 'runs:/run-2/m', model=BlockingModel())
+    assert not scorer.submit([{}], data, [1.0], 'run-1')
+    scorer.shutdown()
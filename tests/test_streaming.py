@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / 'src'))
+
+from serving.payloads import PayloadError
+from serving.streaming import NDJSONDecoder
+
+
+def test_records_split_across_body_chunks_are_reassembled():
+    body = '{"ID": "a", "City": "Metropolitian"}\n\n{"ID": "b"}\nnot json\n{"ID": "ü"}'.encode()
+    decoder = NDJSONDecoder()
+    records = []
+    for i in range(0, len(body), 7):  # splits lines and the two-byte 'ü'
+        records.extend(decoder.feed(body[i:i + 7]))
+    records.extend(decoder.close())
+
+    assert records[:2] == [{"ID": "a", "City": "Metropolitian"}, {"ID": "b"}]
+    assert isinstance(records[2], PayloadError) and "line 4" in str(records[2])
+    assert records[3] == {"ID": "ü"}
+
+
+def test_only_the_unfinished_line_is_buffered():
+    decoder = NDJSONDecoder()
+    assert decoder.feed(b'{"ID": "a"}\n{"ID"') == [{"ID": "a"}]
+    assert decoder.feed(b': "b"}\n') == [{"ID": "b"}]
+    assert decoder.close() == []
+
+
+def test_an_unfinished_line_is_joined_once():
+    decoder = NDJSONDecoder()
+    line = b'{"ID": "' + b"x" * 10_000 + b'"}'
+    for i in range(0, len(line), 10):
+        assert decoder.feed(line[i:i + 10]) == []
+    # the pieces are kept as fed, not re-joined on every chunk
+    assert len(decoder._pending) == len(line) // 10
+    assert decoder.feed(b'\n{"ID"') == [{"ID": "x" * 10_000}]
+    assert decoder._pending == ['{"ID"']
+    [unfinished] = decoder.close()
+    assert isinstance(unfinished, PayloadError) and "line 2" in str(unfinished)
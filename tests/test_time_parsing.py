@@ -0,0 +1,39 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / 'src'))
+
+from data_cleaning.time_parsing import (format_time_column, parse_date_column,
+                                        parse_time_column, pickup_minutes)
+
+order_times = pd.Series(['11:30:00', '23:55:00', np.nan, '17:05', '11:30:00', '9:15:30'])
+picked_times = pd.Series(['11:45:00', '00:10:00', '10:00:00', '17:20', '11:30:00', '10:00:00'])
+dates = pd.Series(['19-03-2022', '01-04-2022', np.nan, '19-03-2022', '13-02-2022', '05-03-2022'])
+
+
+def test_times_match_mixed_format_inference():
+    order_seconds = parse_time_column(order_times)
+    picked_seconds = parse_time_column(picked_times)
+    order_time = pd.to_datetime(order_times, format='mixed')
+    picked_time = pd.to_datetime(picked_times, format='mixed')
+
+    np.testing.assert_array_equal(pickup_minutes(order_seconds, picked_seconds),
+                                  (picked_time - order_time).dt.seconds / 60)
+    np.testing.assert_array_equal(order_seconds // 3600, order_time.dt.hour)
+    assert format_time_column(order_seconds).tolist()[:2] == ['11:30:00', '23:55:00']
+    pd.testing.assert_series_equal(pd.Series(format_time_column(order_seconds)),
+                                   order_time.dt.strftime('%H:%M:%S'), check_dtype=False)
+
+
+def test_dates_match_day_first_parsing():
+    pd.testing.assert_series_equal(parse_date_column(dates), pd.to_datetime(dates, dayfirst=True))
+
+
+def test_other_layouts_fall_back_to_pandas():
+    assert parse_time_column(pd.Series(['11:30 PM', '2022-03-19 08:00:00'])).tolist() == \
+        [23 * 3600 + 30 * 60, 8 * 3600]
+    assert parse_date_column(pd.Series(['19/03/2022'])).iloc[0] == pd.Timestamp(2022, 3, 19)
@@ -0,0 +1,81 @@
+import csv
+import sys
+from pathlib import Path
+
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path / 'src'))
+
+from serving.schema import RAW_COLUMNS
+from serving.warmup import Warmup
+
+sample_row = {
+    "ID": "0x4607 ", "Delivery_person_ID": "INDORES13DEL02 ", "Delivery_person_Age": "37",
+    "Delivery_person_Ratings": "4.9", "Restaurant_latitude": "22.745049",
+    "Restaurant_longitude": "75.892471", "Delivery_location_latitude": "22.765049",
+    "Delivery_location_longitude": "75.912471", "Order_Date": "19-03-2022",
+    "Time_Orderd": "11:30:00", "Time_Order_picked": "11:45:00",
+    "Weatherconditions": "conditions Sunny", "Road_traffic_density": "High ",
+    "Vehicle_condition": "2", "Type_of_order": "Snack ", "Type_of_vehicle": "motorcycle ",
+    "multiple_deliveries": "0", "Festival": "No ", "City": "Urban ", "Time_taken(min)": "(min) 24",
+}
+
+
+def write_sample(path, n_rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RAW_COLUMNS + ["Time_taken(min)"])
+        writer.writeheader()
+        for _ in range(n_rows):
+            writer.writerow(sample_row)
+
+
+def test_warmup_replays_sample_orders_without_logging(tmp_path):
+    write_sample(tmp_path / "sample.csv", 10)
+    calls = []
+
+    def score(records, log=True):
+        calls.append((len(records), log))
+        assert all(isinstance(record, dict) for record in records)
+        return [{"prediction": 1.0} for _ in records]
+
+    warmup = Warmup(score, tmp_path / "sample.csv", n_requests=5, latency_samples=8)
+    warmup.run()
+
+    assert warmup.ready and warmup.status == "ready"
+    assert calls.count((1, False)) == 5 + 8 and (5, False) in calls
+    assert set(warmup.report()["steady_state_latency_ms"]) == {"p50", "p99", "mean"}
+
+
+def test_missing_sample_file_does_not_block_readiness(tmp_path):
+    warmup = Warmup(lambda records, log=True: [], tmp_path / "missing.csv")
+    warmup.run()
+    assert warmup.ready and warmup.status == "skipped"
+
+
+def test_failed_warmup_is_retried_then_reported_without_blocking_readiness(tmp_path):
+    write_sample(tmp_path / "sample.csv", 3)
+    calls = []
+
+    def score(records, log=True):
+        calls.append(len(records))
+        raise RuntimeError("model not loaded")
+
+    warmup = Warmup(score, tmp_path / "sample.csv", retries=2, retry_delay=0)
+    warmup.run()
+    assert warmup.ready and warmup.status == "failed"
+    assert warmup.report()["error"] == "model not loaded"
+    assert len(calls) == 3
+
+
+def test_transient_failure_recovers_on_retry(tmp_path):
+    write_sample(tmp_path / "sample.csv", 3)
+    failures = [RuntimeError("connection reset")]
+
+    def score(records, log=True):
+        if failures:
+            raise failures.pop()
+        return [{"prediction": 1.0} for _ in records]
+
+    warmup = Warmup(score, tmp_path / "sample.csv", n_requests=3, latency_samples=2,
+                    retries=1, retry_delay=0)
+    warmup.run()
+    assert warmup.ready and warmup.status == "ready" and warmup.report()["error"] is None